@@ -0,0 +1,141 @@
+"""
+Benchmark cross-source entity resolution on synthetic merge rows.
+
+Generates projects that appear in one to three sources with name variants
+("Foo", "Foo Protocol", "foo.", a typo), shared domains and handles, then
+reports throughput, how many name comparisons blocking needed compared to
+all pairs, and pairwise precision/recall against the generated truth.
+
+Some records link to the project's app subdomain, and ``--noise`` of them
+link through a shortener or explorer on a host that is not in
+``SHARED_HOSTS``, the way scraped links do. With ``--runs`` the rows are
+resolved in that many batches against one ``EntityIndex``, like successive
+merge runs.
+
+    python benchmarks/entity_resolution_bench.py --rows 100000
+    python benchmarks/entity_resolution_bench.py --rows 20000 --runs 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Keep the benchmark's entity index out of the real state database
+os.environ["LOCAL_STATE_DB"] = os.path.join(tempfile.mkdtemp(), "entity_bench.db")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from entity_resolution import EntityIndex, ResolutionStats, resolve_entities
+
+# Pronounceable syllables ("ka", "zor", ...) so names look real but rarely collide
+SYLLABLES = [c + v + e for c in "bdfgklmnprstvz" for v in "aeiou" for e in ("", "", "n", "r", "x")]
+SUFFIXES = ["", "", "", " Protocol", " Labs", " Finance", " DAO", " Network"]
+SOURCES = ["ETHGlobal", "Devpost", "GitcoinChecker", "Alliance", "Cryptorank"]
+# Link hosts shared by unrelated projects that no static list knows about
+NOISE_HOSTS = ["lnk.to", "hubs.ly", "snip.ly", "scan.example", "launchpad.example"]
+
+
+def base_name(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.choice([2, 3, 3, 4]))).capitalize()
+
+
+def variant(rng, name):
+    roll = rng.random()
+    if roll < 0.4:
+        return name
+    if roll < 0.6:
+        return name + rng.choice(SUFFIXES[3:])
+    if roll < 0.75:
+        return name.lower() + "."
+    if roll < 0.9 and len(name) > 6:
+        i = rng.randrange(1, len(name) - 2)
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name.upper()
+
+
+def generate(rows, seed=7, noise=0.05):
+    """Return (records, truth) where truth[i] is the entity number of records[i]."""
+    rng = random.Random(seed)
+    records, truth = [], []
+    entity = 0
+    while len(records) < rows:
+        name = base_name(rng) + rng.choice(SUFFIXES)
+        slug = name.lower().replace(" ", "")
+        domain = f"https://{slug}.xyz" if rng.random() < 0.5 else ""
+        twitter = f"https://x.com/{slug}" if rng.random() < 0.4 else ""
+        for source in rng.sample(SOURCES, rng.choice([1, 1, 2, 3])):
+            links = [l for l in (domain, twitter) if l and rng.random() < 0.6]
+            if domain in links and rng.random() < 0.3:
+                links[links.index(domain)] = domain.replace("https://", "https://app.")
+            if rng.random() < noise:
+                links.insert(0, f"https://{rng.choice(NOISE_HOSTS)}/{rng.randrange(10 ** 6):x}")
+            listing = f"https://{source.lower()}.example/p/{len(records)}"
+            records.append({
+                "id": f"{source.lower()}_{len(records)}",
+                "name": variant(rng, name),
+                "link": links[0] if links and source != "Devpost" else listing,
+                "links": links,
+            })
+            truth.append(entity)
+            if len(records) >= rows:
+                break
+        entity += 1
+    return records, truth
+
+
+def pairs(labels):
+    """Number of record pairs that share a label."""
+    return sum(n * (n - 1) // 2 for n in Counter(labels).values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--noise", type=float, default=0.05, help="share of records with a noise link")
+    parser.add_argument("--runs", type=int, default=1, help="resolve in this many batches against an index")
+    args = parser.parse_args()
+
+    records, truth = generate(args.rows, args.seed, args.noise)
+    index = EntityIndex() if args.runs > 1 else None
+    batch = -(-len(records) // args.runs)
+    entities, stats = [], ResolutionStats()
+    started = time.perf_counter()
+    for start in range(0, len(records), batch):
+        found, run = resolve_entities(
+            records[start:start + batch],
+            name_of=lambda r: r["name"],
+            urls_of=lambda r: [r["link"]] + r["links"],
+            id_of=lambda r: r["id"],
+            index=index,
+        )
+        entities += found
+        for counter in ("blocks", "skipped_blocks", "shared_keys", "comparisons"):
+            setattr(stats, counter, getattr(stats, counter) + getattr(run, counter))
+    elapsed = time.perf_counter() - started
+
+    predicted = [None] * len(records)
+    position = {id(r): i for i, r in enumerate(records)}
+    for entity_id, members in entities:
+        for r in members:
+            predicted[position[id(r)]] = entity_id
+    both = pairs(list(zip(truth, predicted)))
+    found, actual = pairs(predicted), pairs(truth)
+
+    all_pairs = len(records) * (len(records) - 1) // 2
+    print(f"rows:              {len(records)}")
+    print(f"true entities:     {len(set(truth))}")
+    print(f"resolved entities: {len(set(predicted))}")
+    print(f"time:              {elapsed:.2f}s ({len(records) / elapsed:,.0f} rows/s)")
+    print(f"blocks:            {stats.blocks} ({stats.skipped_blocks} oversized, skipped; "
+          f"{stats.shared_keys} shared links)")
+    print(f"name comparisons:  {stats.comparisons:,} vs {all_pairs:,} all pairs "
+          f"({stats.comparisons / all_pairs:.6%})")
+    print(f"pair precision:    {both / found if found else 1:.4f}")
+    print(f"pair recall:       {both / actual if actual else 1:.4f}")
+
+
+if __name__ == "__main__":
+    main()
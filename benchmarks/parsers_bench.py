@@ -0,0 +1,176 @@
+"""
+Offline benchmark of the page parsers over stored HTML fixtures.
+
+Every parser in ``parsers/`` runs over its fixture page from
+``benchmarks/fixtures`` and over synthetic pages built by repeating the
+fixture's cards up to 10k times. For each case and HTML parser backend the
+suite reports items per second (best of several runs, HTML parsing
+included) and peak memory, and compares them with a saved baseline:
+
+    python benchmarks/parsers_bench.py --save-baseline   # record a baseline
+    python benchmarks/parsers_bench.py                    # compare against it
+    python benchmarks/parsers_bench.py --backends bs4,lxml,selectolax
+
+Baselines are machine specific, so they are kept out of git. The exit
+status is 1 when a case regresses by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup, Comment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from parsers import alliance, cryptorank, devpost, ethglobal, gitcoin
+from parsers.document import available_backends, parse_document, resolve_backend
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "parsers.json")
+
+
+def _items(result):
+    """Parsers return (count, items), a dict or a URL."""
+    if isinstance(result, tuple):
+        return result[1]
+    return [result] if result else []
+
+
+def ethglobal_showcase(html):
+    result = ethglobal.parse_showcase(html)
+    return result.strategy, result.projects
+
+
+# name -> (fixture, parse(html) -> result, selector of the repeated cards or None)
+CASES = {
+    "cryptorank_listing": ("cryptorank_funding_rounds.html",
+                           lambda html: cryptorank.parse_funding_rounds(html), "table tbody tr"),
+    "cryptorank_detail": ("cryptorank_project.html", cryptorank.parse_project_details, None),
+    "gitcoin_projects": ("gitcoin_projects.html", gitcoin.parse_projects, gitcoin.CARD_SELECTOR),
+    "alliance_companies": ("alliance_companies.html", alliance.parse_companies, "a.chakra-linkbox"),
+    "ethglobal_showcase": ("ethglobal_showcase.html", ethglobal_showcase, ethglobal.CARD_SELECTOR),
+    "devpost_listing": ("devpost_hackathons.html", devpost.parse_hackathon_tiles, "div.hackathon-tile"),
+    "devpost_hackathon": ("devpost_hackathon.html",
+                          lambda html: devpost.parse_winners_link(html, "https://chainjam.devpost.com/"), None),
+    "devpost_gallery": ("devpost_gallery.html", devpost.parse_gallery_winners, devpost.CARD_SELECTOR),
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def scale_page(html, card_selector, cards):
+    """Rebuild a fixture page with its cards repeated until there are ``cards`` of them."""
+    soup = BeautifulSoup(html, "html.parser")
+    found = soup.select(card_selector)
+    if not found:
+        raise ValueError(f"'{card_selector}' matches nothing in the fixture")
+    templates = [str(card) for card in found]
+    marker = Comment("cards")
+    found[0].insert_before(marker)
+    for card in found:
+        card.decompose()
+    repeated = "\n".join(templates[i % len(templates)] for i in range(cards))
+    return str(soup).replace("<!--cards-->", repeated, 1)
+
+
+def run_case(parse, html, repeat, min_seconds=0.5):
+    """Time ``parse`` at least ``repeat`` times, and for small pages until ``min_seconds`` have passed."""
+    best, items, runs, total = float("inf"), [], 0, 0.0
+    while runs < repeat or total < min_seconds:
+        started = time.perf_counter()
+        items = _items(parse(html))
+        elapsed = time.perf_counter() - started
+        best, runs, total = min(best, elapsed), runs + 1, total + elapsed
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "items": len(items),
+        "seconds": best,
+        "items_per_sec": len(items) / best if best else 0.0,
+        "peak_mb": peak / 2 ** 20,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return descriptions of the cases that regressed against the baseline."""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        if result["items_per_sec"] < before["items_per_sec"] * (1 - tolerance):
+            regressions.append(f"{key}: {result['items_per_sec']:,.0f} items/s "
+                               f"(baseline {before['items_per_sec']:,.0f})")
+        if result["peak_mb"] > before["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{key}: peak {result['peak_mb']:.1f}MB (baseline {before['peak_mb']:.1f}MB)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", help="comma-separated case names (default: all)")
+    parser.add_argument("--backends", help="comma-separated HTML parser backends "
+                        f"(default: the configured one; installed: {', '.join(available_backends())})")
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="synthetic card counts besides the fixture itself")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="minimum runs per case; small pages repeat for at least half a second")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown or memory growth before a case counts as regressed")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    backends = args.backends.split(",") if args.backends else [resolve_backend()]
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = {}
+    print(f"{'case':<44}{'items':>8}{'ms':>10}{'items/s':>12}{'peak MB':>9}")
+    for name in names:
+        fixture, parse, card_selector = CASES[name]
+        html = load_fixture(fixture)
+        pages = [("fixture", html)]
+        if card_selector:
+            pages += [(str(size), scale_page(html, card_selector, size)) for size in sizes]
+        for backend, (label, page) in ((b, p) for p in pages for b in backends):
+            key = f"{name}@{label}[{backend}]"
+            results[key] = result = run_case(
+                lambda html: parse(parse_document(html, backend)), page, args.repeat
+            )
+            print(f"{key:<44}{result['items']:>8}{result['seconds'] * 1000:>10.2f}"
+                  f"{result['items_per_sec']:>12,.0f}{result['peak_mb']:>9.1f}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Benchmark building and serializing merged project records.
+
+Compares, over the same synthetic sheet rows:
+
+* validated ``Project`` models with a ``datetime.utcnow()`` per row and
+  ``p.dict()`` serialization (the previous merge path);
+* ``Project.model_construct`` with ``model_dump``;
+* slotted ``ProjectRecord`` objects with ``to_row`` (the merge path now).
+
+    python benchmarks/records_bench.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import Project, ProjectRecord
+
+
+def generate(n):
+    return [
+        {
+            "id": f"alliance_project_{i}",
+            "name": f"Project {i}",
+            "link": f"https://project{i}.xyz",
+            "source": "Alliance",
+            "description": "Building onchain infrastructure for " + "x" * (i % 120),
+            "categories": ["DeFi", "Infra"] if i % 3 else [],
+            "score": 5,
+        }
+        for i in range(n)
+    ]
+
+
+def validated(rows):
+    projects = [Project(**row, last_seen=datetime.utcnow()) for row in rows]
+    out = []
+    for p in projects:
+        row = p.dict()
+        row["categories"] = ", ".join(row.get("categories", [])) if isinstance(row.get("categories"), list) else ""
+        row["last_seen"] = row["last_seen"].isoformat()
+        out.append(row)
+    return out
+
+
+def constructed(rows):
+    now = datetime.utcnow()
+    projects = [Project.model_construct(**row, last_seen=now) for row in rows]
+    out = []
+    for p in projects:
+        row = p.model_dump()
+        row["categories"] = ", ".join(row["categories"]) if row["categories"] else ""
+        row["last_seen"] = row["last_seen"].isoformat()
+        out.append(row)
+    return out
+
+
+def records(rows):
+    now = datetime.utcnow()
+    projects = [ProjectRecord(**row, last_seen=now) for row in rows]
+    return [p.to_row() for p in projects]
+
+
+def measure(fn, rows):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn(rows)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # .dict() is deprecated in pydantic 2
+
+    rows = generate(args.rows)
+    baseline = None
+    print(f"{'path':<28}{'time':>10}{'rows/s':>12}{'peak MB':>10}{'speedup':>9}")
+    for name, fn in (("Project + .dict()", validated),
+                     ("model_construct + dump", constructed),
+                     ("ProjectRecord + to_row", records)):
+        elapsed, peak = measure(fn, rows)
+        baseline = baseline or elapsed
+        print(f"{name:<28}{elapsed:>9.2f}s{len(rows) / elapsed:>12,.0f}"
+              f"{peak / 2 ** 20:>10.1f}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
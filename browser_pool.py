@@ -0,0 +1,278 @@
+"""
+Shared headless-Chrome pool used by every scraping flow.
+
+Launching Chrome costs several seconds, so instead of each task creating and
+quitting its own driver, flows borrow a warm driver from a process-wide pool
+and hand it back when they are done. Drivers are recycled after a number of
+navigations or once their process tree grows past a memory limit.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# psutil is optional; without it the pool cannot measure memory and only
+# recycles by navigation count
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from config import BROWSER_POOL
+from concurrency import map_concurrently
+
+logger = logging.getLogger(__name__)
+
+
+def create_chrome_driver():
+    """Create a Chrome WebDriver instance with proper configuration"""
+    # Selenium is imported on first use so flows that never launch Chrome
+    # don't pay for it at startup
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-logging")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--allow-running-insecure-content")
+    chrome_options.add_argument("--window-size=1920,1080")
+
+    # Use direct path to Chrome in GitHub Actions
+    chrome_binary_path = "/usr/bin/google-chrome"
+    if os.path.exists(chrome_binary_path):
+        chrome_options.binary_location = chrome_binary_path
+
+    # Check if we're in GitHub Actions or similar CI environment
+    if os.getenv('GITHUB_ACTIONS') == 'true' or os.path.exists('/usr/local/bin/chromedriver'):
+        # Use system ChromeDriver in CI environments
+        logger.info("Using system ChromeDriver")
+        service = Service('/usr/local/bin/chromedriver')
+    else:
+        # Only use ChromeDriverManager for local development
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+        except ImportError:
+            ChromeDriverManager = None
+        if ChromeDriverManager:
+            logger.info("Using ChromeDriverManager")
+            service = Service(ChromeDriverManager().install())
+        else:
+            # Fallback to default ChromeDriver path
+            logger.info("Using default ChromeDriver path")
+            service = Service()
+
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def default_max_drivers():
+    """Size the pool from available cores and memory."""
+    by_cpu = os.cpu_count() or 1
+    if psutil is None:
+        return max(1, by_cpu)
+    available_mb = psutil.virtual_memory().available / (1024 * 1024)
+    by_memory = int(available_mb // BROWSER_POOL["driver_memory_mb"])
+    return max(1, min(by_cpu, by_memory))
+
+
+class PooledDriver:
+    """
+    Thin proxy around a WebDriver that counts navigations.
+
+    Every attribute other than ``get`` is forwarded to the wrapped driver, so
+    it can be passed to ``WebDriverWait`` and expected conditions unchanged.
+    """
+
+    def __init__(self, driver):
+        self._driver = driver
+        self.navigations = 0
+        self.created_at = time.monotonic()
+
+    def get(self, url):
+        self.navigations += 1
+        return self._driver.get(url)
+
+    def rss_mb(self):
+        """Resident memory of chromedriver plus all Chrome child processes."""
+        if psutil is None:
+            return 0.0
+        try:
+            root = psutil.Process(self._driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+            total = 0
+            for proc in procs:
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def is_alive(self):
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting Chrome driver: {e}")
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class BrowserPool:
+    """Process-wide pool of warm Chrome drivers."""
+
+    def __init__(self, max_drivers=None, max_navigations=None, max_rss_mb=None, factory=create_chrome_driver):
+        self.max_drivers = max_drivers or BROWSER_POOL["max_drivers"] or default_max_drivers()
+        self.max_navigations = max_navigations or BROWSER_POOL["max_navigations"]
+        self.max_rss_mb = max_rss_mb or BROWSER_POOL["max_rss_mb"]
+        self._factory = factory
+        self._idle = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self.launched = 0
+        self.recycled = 0
+
+    def _launch(self):
+        started = time.monotonic()
+        driver = PooledDriver(self._factory())
+        self.launched += 1
+        logger.info(f"🚀 Launched Chrome driver #{self.launched} in {time.monotonic() - started:.1f}s")
+        return driver
+
+    def _should_recycle(self, driver):
+        if driver.navigations >= self.max_navigations:
+            return f"{driver.navigations} navigations"
+        rss = driver.rss_mb()
+        if rss > self.max_rss_mb:
+            return f"RSS {rss:.0f}MB"
+        return None
+
+    def acquire(self, timeout=None):
+        """Borrow a driver, blocking while the pool is at capacity."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        driver = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    driver = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_drivers:
+                    self._in_use += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a Chrome driver")
+                self._cond.wait(remaining)
+
+        # The slot is reserved, so the liveness check (a WebDriver round trip)
+        # runs without holding up other threads; a dead driver's slot is reused
+        if driver is not None:
+            if driver.is_alive():
+                return driver
+            logger.warning("Discarding dead Chrome driver from pool")
+            driver.quit()
+        try:
+            return self._launch()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, driver, discard=False):
+        """Return a driver to the pool, quitting it if it should be recycled."""
+        reason = "discarded" if discard else self._should_recycle(driver)
+        if reason:
+            logger.info(f"♻️ Recycling Chrome driver ({reason})")
+            self.recycled += 1
+            driver.quit()
+        with self._cond:
+            self._in_use -= 1
+            if not reason:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def shutdown(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            driver.quit()
+        if idle:
+            logger.info(f"Closed {len(idle)} pooled Chrome drivers")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the shared pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def acquire_driver(timeout=None):
+    return get_pool().acquire(timeout)
+
+
+def release_driver(driver, discard=False):
+    get_pool().release(driver, discard)
+
+
+
+def map_with_drivers(fn, items, url_of, workers=None, max_per_host=None, retries=0, retry_delay=2.0):
+    """
+    Run ``fn(driver, item)`` for every item across pooled drivers.
+
+    Items are spread over ``workers`` threads, each borrowing its own driver
+    for the duration of one item, with navigations to the same host capped at
+    ``max_per_host``. Failed items are retried as in ``map_concurrently``.
+
+    Returns:
+        list: results in input order; items that failed every attempt hold
+        the last exception raised for them
+    """
+    pool = get_pool()
+
+    def run(item):
+        with pool.driver() as driver:
+            return fn(driver, item)
+
+    return map_concurrently(
+        run,
+        items,
+        workers=workers or pool.max_drivers,
+        url_of=url_of,
+        max_per_host=max_per_host or BROWSER_POOL["max_per_host"],
+        retries=retries,
+        retry_delay=retry_delay,
+    )
@@ -0,0 +1,110 @@
+"""
+Helpers for spreading independent units of scraping work over threads.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Public suffixes with two labels: the site of "foo.co.uk" is "foo.co.uk"
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "com.au", "net.au", "co.jp", "co.kr", "com.br",
+    "co.in", "com.cn", "com.sg", "com.hk", "co.nz", "com.tr", "com.mx",
+}
+
+
+def registrable_domain(host):
+    """The domain a host belongs to: 'ethdenver.devpost.com' -> 'devpost.com'."""
+    labels = host.split(".")
+    keep = 3 if ".".join(labels[-2:]) in MULTI_PART_SUFFIXES else 2
+    return ".".join(labels[-keep:])
+
+
+class HostLimiter:
+    """
+    Caps the number of concurrent requests per site.
+
+    Hosts are grouped by registrable domain, since sites such as Devpost
+    serve every hackathon from its own subdomain behind one rate limit.
+    """
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def limit(self, url):
+        host = registrable_domain(urlparse(url).hostname or "")
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            yield
+
+
+def map_concurrently(fn, items, workers, url_of=None, max_per_host=None, retries=0, retry_delay=2.0, timeout=None):
+    """
+    Run ``fn(item)`` for every item on a thread pool.
+
+    A failed item is re-queued behind the rest of the batch up to ``retries``
+    times, so one slow failure does not hold up the others. When ``url_of``
+    and ``max_per_host`` are given, concurrent calls per host are capped.
+
+    An attempt running longer than ``timeout`` seconds is abandoned and
+    counts as a failure; its thread cannot be interrupted, so ``fn`` should
+    also bound its own I/O (HTTP timeouts, wait profiles).
+
+    Returns:
+        list: results in input order; items that failed every attempt hold
+        the last exception raised for them
+    """
+    limiter = HostLimiter(max_per_host) if url_of and max_per_host else None
+    results = [None] * len(items)
+    started = {}
+
+    def run(index, attempt):
+        if attempt:
+            time.sleep(retry_delay * attempt)
+        started[(index, attempt)] = time.monotonic()
+        item = items[index]
+        if limiter is None:
+            return fn(item)
+        with limiter.limit(url_of(item)):
+            return fn(item)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+
+    def fail(index, attempt, error):
+        if attempt < retries:
+            logger.warning(f"Retrying item {index} after error: {error}")
+            pending[executor.submit(run, index, attempt + 1)] = (index, attempt + 1)
+        else:
+            results[index] = error
+
+    try:
+        for i in range(len(items)):
+            pending[executor.submit(run, i, 0)] = (i, 0)
+        while pending:
+            done, _ = wait(pending, timeout=1.0 if timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, attempt = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    fail(index, attempt, e)
+            if timeout:
+                now = time.monotonic()
+                for future, (index, attempt) in list(pending.items()):
+                    began = started.get((index, attempt))
+                    if began is not None and now - began > timeout and not future.done():
+                        pending.pop(future)
+                        fail(index, attempt, TimeoutError(f"Item {index} timed out after {timeout}s"))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
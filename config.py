@@ -37,3 +37,161 @@ SPREADSHEETS = {
     }
     # Add other flows here
 }
+
+# Shared headless-Chrome pool (see browser_pool.py)
+BROWSER_POOL = {
+    # 0 sizes the pool from available cores and memory
+    "max_drivers": int(os.getenv("BROWSER_POOL_MAX_DRIVERS", "0")),
+    "max_navigations": int(os.getenv("BROWSER_MAX_NAVIGATIONS", "50")),
+    "max_rss_mb": int(os.getenv("BROWSER_MAX_RSS_MB", "1500")),
+    "driver_memory_mb": int(os.getenv("BROWSER_DRIVER_MEMORY_MB", "500")),
+    # Concurrent navigations allowed against a single host
+    "max_per_host": int(os.getenv("BROWSER_MAX_PER_HOST", "4")),
+}
+
+# Cryptorank scraper settings
+CRYPTORANK = {
+    # Pages read in fixed mode
+    "pages": int(os.getenv("CRYPTORANK_PAGES", "3")),
+    # Adaptive mode walks pages until this many consecutive known rounds,
+    # up to max_pages
+    "adaptive": os.getenv("CRYPTORANK_ADAPTIVE", "true").lower() == "true",
+    "known_streak": int(os.getenv("CRYPTORANK_KNOWN_STREAK", "10")),
+    "max_pages": int(os.getenv("CRYPTORANK_MAX_PAGES", "30")),
+    "detail_workers": int(os.getenv("CRYPTORANK_DETAIL_WORKERS", "4")),
+    "detail_retries": int(os.getenv("CRYPTORANK_DETAIL_RETRIES", "2")),
+    # Per-worker pause after each detail page, to stay polite to the host
+    "detail_delay": float(os.getenv("CRYPTORANK_DETAIL_DELAY", "1")),
+}
+
+# Readiness conditions per source and stage (see page_waits.py).
+# Every condition present in a profile must hold before the wait returns.
+WAIT_PROFILES = {
+    "default": {
+        "timeout": float(os.getenv("PAGE_WAIT_TIMEOUT", "15")),
+        "poll": 0.1,
+        "quiet_ms": 300,
+        # Infinite-scroll settings
+        "max_scrolls": 12,
+        "step_timeout": 3.0,
+        "stale_scrolls": 2,
+    },
+    "cryptorank": {
+        "listing": {"selector": "table tbody tr", "items": "table tbody tr", "stable_ms": 300},
+        "detail": {"network_idle_ms": 500, "timeout": 8},
+    },
+    "gitcoin": {
+        "page": {"selector": "div.container.py-3 > div.mb-5.d-flex"},
+    },
+    "devpost": {
+        "listing": {"selector": "a.tile-anchor"},
+        "scroll": {"items": "a.tile-anchor"},
+        "hackathon": {"network_idle_ms": 300, "timeout": 10},
+        "gallery": {"selector": "div.gallery-item", "timeout": 10},
+    },
+    "alliance": {
+        "page": {"selector": "div.chakra-card"},
+        "scroll": {"items": "div.chakra-card", "max_scrolls": 10},
+    },
+    "ethglobal": {
+        "page": {"selector": "a[href*='/showcase/']", "network_idle_ms": 500},
+    },
+}
+
+# Shared keep-alive HTTP client (see http_fetch.py)
+HTTP = {
+    "timeout": float(os.getenv("HTTP_TIMEOUT", "15")),
+    "retries": int(os.getenv("HTTP_RETRIES", "2")),
+    "pool_connections": 10,
+    "pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", "20")),
+}
+
+# HTML parsing backend for the page parsers (see parsers/document.py):
+# "auto" (fastest installed), "selectolax", "lxml" or "bs4"
+HTML_PARSER = {
+    "backend": os.getenv("HTML_PARSER_BACKEND", "auto"),
+}
+
+# Source flow orchestrator; each source runs in its own process (see flows/run_all.py)
+ORCHESTRATOR = {
+    "max_concurrent_flows": int(os.getenv("MAX_CONCURRENT_FLOWS", "3")),
+}
+
+# Local SQLite state (dedup index, watermarks, ...); cached between CI runs
+LOCAL_STATE_DB = os.getenv("LOCAL_STATE_DB", os.path.join("state", "seeds.db"))
+
+# Local dedup index of keys already written to each sheet (see dedup_index.py)
+DEDUP_INDEX = {
+    # Check the index against the sheet's key column at most this often
+    "reconcile_hours": float(os.getenv("DEDUP_RECONCILE_HOURS", "168")),
+}
+
+# Merge flow settings
+MERGE = {
+    # Re-read every source row instead of only rows past the watermark
+    "full_rebuild": os.getenv("MERGE_FULL_REBUILD", "false").lower() == "true",
+}
+
+# Cross-source entity resolution in the merge flow (see entity_resolution.py)
+ENTITY_RESOLUTION = {
+    # Trigram Jaccard similarity needed for two similar names to match
+    "match_threshold": float(os.getenv("ENTITY_MATCH_THRESHOLD", "0.7")),
+    # Keys shared by more records than this are ignored for matching
+    "max_block": int(os.getenv("ENTITY_MAX_BLOCK", "50")),
+    # Edit similarity of the names needed for two records sharing a domain or handle to match
+    "link_name_threshold": float(os.getenv("ENTITY_LINK_NAME_THRESHOLD", "0.6")),
+    # A domain or handle seen with more distinct names than this, over every run, is shared
+    "max_link_names": int(os.getenv("ENTITY_MAX_LINK_NAMES", "3")),
+}
+
+# Devpost scraper settings
+DEVPOST = {
+    # Re-check already harvested hackathons after this many days; 0 never does
+    "recheck_days": float(os.getenv("DEVPOST_RECHECK_DAYS", "0")),
+    # Hackathon -> winners gallery units crawled in parallel
+    "workers": int(os.getenv("DEVPOST_WORKERS", "6")),
+    # Per site: every hackathon's <slug>.devpost.com subdomain counts as devpost.com
+    "max_per_host": int(os.getenv("DEVPOST_MAX_PER_HOST", "4")),
+    "retries": int(os.getenv("DEVPOST_RETRIES", "1")),
+    "unit_timeout": float(os.getenv("DEVPOST_UNIT_TIMEOUT", "90")),
+}
+
+# Slack notification outbox (see tasks/outbox.py)
+OUTBOX = {
+    "workers": int(os.getenv("OUTBOX_WORKERS", "2")),
+    "max_attempts": int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6")),
+    # Seconds before the first retry after a 5xx or network error; doubles per attempt
+    "backoff_base": float(os.getenv("OUTBOX_BACKOFF_BASE", "2")),
+    # In-flight claims older than this are assumed lost and re-queued at startup
+    "claim_timeout": float(os.getenv("OUTBOX_CLAIM_TIMEOUT", "300")),
+    # How long to keep delivering at process exit; the rest waits for the next run
+    "drain_timeout": float(os.getenv("OUTBOX_DRAIN_TIMEOUT", "60")),
+}
+
+# Crunchbase ingestion settings
+CRUNCHBASE = {
+    "page_size": int(os.getenv("CRUNCHBASE_PAGE_SIZE", "100")),
+    # Pages fetched ahead of the store stage
+    "pages_in_flight": int(os.getenv("CRUNCHBASE_PAGES_IN_FLIGHT", "2")),
+    "timeout": float(os.getenv("CRUNCHBASE_TIMEOUT", "30")),
+}
+
+# Daily digest settings (read from the local leaderboard, see leaderboard.py)
+DIGEST = {
+    "top_k": int(os.getenv("DIGEST_TOP_K", "5")),
+    # Only rank projects first merged within this many days; 0 for all time
+    "window_days": float(os.getenv("DIGEST_WINDOW_DAYS", "0")),
+}
+
+# Project scoring weights (see scoring.py)
+SCORING = {
+    # Added for every source beyond the first a project was found in
+    "overlap_bonus": float(os.getenv("SCORE_OVERLAP_BONUS", "2")),
+    # Multiplies the funding round type weight (Seed 1.5, Pre-Seed 1, Grant 0.5, ...)
+    "funding_type": float(os.getenv("SCORE_FUNDING_TYPE", "1")),
+    # Multiplies log(1 + amount in $M)
+    "funding_amount": float(os.getenv("SCORE_FUNDING_AMOUNT", "1")),
+    # Boost for a project seen today, halving every half_life_days
+    "recency": float(os.getenv("SCORE_RECENCY", "3")),
+    "half_life_days": float(os.getenv("SCORE_HALF_LIFE_DAYS", "30")),
+}
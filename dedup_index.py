@@ -0,0 +1,170 @@
+"""
+Local index of keys already written to each source's sheet.
+
+Store tasks used to download the full worksheet on every run just to build a
+set of existing names. Instead, keys are kept in the local SQLite store and
+updated after every successful write, so deduplicating a batch only costs
+lookups for the keys in that batch. The index is checked against the sheet's
+key column now and then, and rebuilt from it if the row counts disagree.
+"""
+
+import logging
+import time
+
+from config import DEDUP_INDEX
+from google_sheets import get_worksheet, range_end_row
+from local_store import chunked, ensure_schema, get_connection
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_keys (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (source, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seen_keys_meta (
+    source TEXT PRIMARY KEY,
+    sheet_rows INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+def normalize_key(value):
+    """Default key normalization used by the source sheets."""
+    return str(value).strip().lower()
+
+
+class SeenKeyIndex:
+    """Persistent set of keys for one source sheet."""
+
+    def __init__(self, source):
+        self.source = source
+        ensure_schema(SCHEMA)
+        self.conn = get_connection()
+
+    def unseen(self, keys):
+        """Return the subset of ``keys`` not yet in the index."""
+        keys = list(set(keys))
+        seen = set()
+        for chunk in chunked(keys):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key FROM seen_keys WHERE source = ? AND key IN ({placeholders})",
+                [self.source, *chunk],
+            )
+            seen.update(row[0] for row in rows)
+        return set(keys) - seen
+
+    def add(self, keys, sheet_rows=None):
+        """Record keys as written; ``sheet_rows`` is the sheet's new last row."""
+        with self.conn:
+            previous = self.sheet_rows()
+            if sheet_rows is not None and previous is not None and sheet_rows <= previous:
+                # An append never shrinks the sheet, so it was cleared or truncated
+                logger.warning(f"{self.source} sheet shrank ({previous} -> {sheet_rows} rows); resetting index")
+                self.conn.execute("DELETE FROM seen_keys WHERE source = ?", (self.source,))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_keys (source, key) VALUES (?, ?)",
+                [(self.source, key) for key in keys],
+            )
+            if sheet_rows is not None:
+                self.conn.execute(
+                    "INSERT INTO seen_keys_meta (source, sheet_rows, checked_at) VALUES (?, ?, 0) "
+                    "ON CONFLICT(source) DO UPDATE SET sheet_rows = excluded.sheet_rows",
+                    (self.source, sheet_rows),
+                )
+
+    def count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM seen_keys WHERE source = ?", (self.source,)
+        ).fetchone()[0]
+
+    def sheet_rows(self):
+        row = self.conn.execute(
+            "SELECT sheet_rows FROM seen_keys_meta WHERE source = ?", (self.source,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def needs_reconcile(self, max_age_hours=None):
+        max_age_hours = DEDUP_INDEX["reconcile_hours"] if max_age_hours is None else max_age_hours
+        row = self.conn.execute(
+            "SELECT checked_at FROM seen_keys_meta WHERE source = ?", (self.source,)
+        ).fetchone()
+        return row is None or time.time() - row[0] > max_age_hours * 3600
+
+    def reconcile(self, column_values, normalize=normalize_key):
+        """
+        Check the index against the sheet's key column (header included).
+
+        When the sheet's row count matches what the index last recorded, the
+        index is trusted as-is; otherwise it is rebuilt from the column.
+        """
+        sheet_rows = len(column_values)
+        with self.conn:
+            if sheet_rows != self.sheet_rows() or (sheet_rows > 1 and not self.count()):
+                logger.info(f"🔁 Rebuilding {self.source} dedup index from {sheet_rows} sheet rows")
+                self.conn.execute("DELETE FROM seen_keys WHERE source = ?", (self.source,))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_keys (source, key) VALUES (?, ?)",
+                    [(self.source, normalize(v)) for v in column_values[1:] if v],
+                )
+            self.conn.execute(
+                "INSERT INTO seen_keys_meta (source, sheet_rows, checked_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET sheet_rows = excluded.sheet_rows, "
+                "checked_at = excluded.checked_at",
+                (self.source, sheet_rows, time.time()),
+            )
+
+
+def reconciled_index(flow_name, key_column, headers, normalize=normalize_key):
+    """
+    Return the flow's SeenKeyIndex, reconciled against the sheet's
+    ``key_column`` first if it is due.
+    """
+    index = SeenKeyIndex(flow_name)
+    if index.needs_reconcile():
+        try:
+            column = get_worksheet(flow_name).col_values(headers.index(key_column) + 1)
+            index.reconcile(column, normalize)
+        except Exception as e:
+            logger.warning(f"Could not reconcile {flow_name} dedup index with sheet: {e}")
+    return index
+
+
+def filter_unseen(flow_name, items, key_of, key_column, headers, normalize=normalize_key):
+    """
+    Drop items whose key is already in the flow's sheet.
+
+    Reconciles the index against the sheet's ``key_column`` first if it is
+    due. Items repeated within the batch are kept only once.
+
+    Args:
+        flow_name: SPREADSHEETS entry the items are written to
+        items: candidate items
+        key_of: callable returning an item's raw key
+        key_column: header of the sheet column holding the key
+        headers: the sheet's header row
+        normalize: key normalization shared by the index and the sheet
+
+    Returns:
+        tuple: (unique new items, SeenKeyIndex for marking them once written)
+    """
+    index = reconciled_index(flow_name, key_column, headers, normalize)
+
+    unseen = index.unseen(normalize(key_of(item)) for item in items)
+    unique = []
+    for item in items:
+        key = normalize(key_of(item))
+        if key not in unseen:
+            logger.info(f"⏩ Skipping duplicate {key_column}: {key_of(item)}")
+            continue
+        unseen.discard(key)
+        unique.append(item)
+    return unique, index
+
+
+def mark_seen(index, items, key_of, written_range=None, normalize=normalize_key):
+    """Add written items to the index, recording the sheet's new last row."""
+    index.add((normalize(key_of(item)) for item in items), range_end_row(written_range))
@@ -0,0 +1,437 @@
+"""
+Cross-source entity resolution for merged projects.
+
+The same project often shows up in several sources (an ETHGlobal winner that
+later raises a Cryptorank seed round) under slightly different names.
+Comparing every pair of records is quadratic, so records are first grouped
+into blocks that share a key, and only records within a block are compared:
+
+* the normalized name. Records sharing it are the same entity.
+* link keys: the registrable domain of the project's own site
+  (app.foo.org is foo.org) and its GitHub/Twitter handles. Records sharing
+  one are matched when their names are at least ``link_name_threshold``
+  similar, so a link shortener or explorer link that slipped past
+  ``SHARED_HOSTS`` cannot join unrelated projects.
+* MinHash LSH bands over the character trigrams of the normalized name.
+  Records sharing a band are candidates and are matched when the Jaccard
+  similarity of their trigrams reaches ``match_threshold``.
+
+A link key seen with more than ``max_link_names`` distinct names, counting
+every earlier run, is treated as shared and not used at all. Blocks larger
+than ``max_block`` records are skipped for the same reason. Matches are
+clustered with union-find.
+
+With an ``EntityIndex`` the keys of every resolved entity are kept in the
+local state store, so records from later runs join the entities they match
+instead of creating new ones.
+"""
+
+import logging
+import random
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import List, Set
+from urllib.parse import urlparse
+
+from concurrency import registrable_domain
+from config import ENTITY_RESOLUTION
+from local_store import chunked, ensure_schema, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Changing these changes every stored band key
+LSH_BANDS = 5
+LSH_ROWS = 4
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(LSH_BANDS * LSH_ROWS)]
+
+# Words that don't tell projects apart ("Foo Protocol" is "Foo")
+NAME_STOPWORDS = {
+    "the", "protocol", "labs", "lab", "finance", "network", "dao", "app",
+    "hq", "inc", "ltd", "llc", "foundation", "official", "io", "xyz",
+}
+
+# Hosts whose links point at a listing or profile rather than the project's own site
+SHARED_HOSTS = {
+    "devpost.com", "ethglobal.com", "cryptorank.io", "gitcoin.co", "alliance.xyz",
+    "github.com", "twitter.com", "x.com", "linkedin.com", "medium.com", "mirror.xyz",
+    "t.me", "discord.gg", "discord.com", "youtube.com", "youtu.be", "linktr.ee",
+    "notion.site", "google.com", "crunchbase.com",
+    # Shorteners, explorers and aggregators
+    "bit.ly", "t.co", "lnkd.in", "goo.gl", "tinyurl.com", "ow.ly", "buff.ly", "rb.gy",
+    "etherscan.io", "polygonscan.com", "bscscan.com", "arbiscan.io", "basescan.org",
+    "optimistic.etherscan.io", "opensea.io", "coingecko.com", "coinmarketcap.com",
+    "dune.com", "defillama.com", "gitbook.com",
+}
+
+# Hosting platforms where every subdomain is a different project's site
+HOSTED_SUFFIXES = {
+    "vercel.app", "netlify.app", "github.io", "gitlab.io", "pages.dev", "herokuapp.com",
+    "web.app", "firebaseapp.com", "gitbook.io", "substack.com", "webflow.io",
+    "framer.website", "framer.ai", "eth.limo", "eth.link", "on.fleek.co", "replit.app",
+}
+
+TWITTER_HOSTS = {"twitter.com", "x.com"}
+TWITTER_RESERVED = {"intent", "share", "home", "i", "hashtag", "search"}
+
+
+def normalize_name(name):
+    """Lowercase, strip accents, punctuation and filler words: 'The Foo Protocol' -> 'foo'."""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode().lower()
+    tokens = re.findall(r"[a-z0-9]+", text)
+    kept = [t for t in tokens if t not in NAME_STOPWORDS] or tokens
+    return "".join(kept)
+
+
+def _host(parsed):
+    host = parsed.netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _is_shared(host):
+    labels = host.split(".")
+    return any(".".join(labels[i:]) in SHARED_HOSTS for i in range(len(labels) - 1))
+
+
+def site_domain(host):
+    """The registrable domain of a host: 'app.uniswap.org' -> 'uniswap.org'."""
+    labels = host.split(".")
+    for i in range(1, len(labels) - 1):
+        if ".".join(labels[i:]) in HOSTED_SUFFIXES:
+            return ".".join(labels[i - 1:])
+    return registrable_domain(host)
+
+
+def is_link_key(key):
+    return not key.startswith("n:")
+
+
+def link_keys(url):
+    """Link keys for a URL: 'd:<domain>' for a project's own site, 'gh:'/'tw:' for handles."""
+    if not url:
+        return []
+    url = str(url).strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = _host(parsed)
+    if not host or "." not in host:
+        return []
+    path = [p for p in parsed.path.split("/") if p]
+    if host == "github.com":
+        return [f"gh:{path[0].lower()}"] if path else []
+    if host in TWITTER_HOSTS:
+        if path and path[0].lower() not in TWITTER_RESERVED:
+            return [f"tw:{path[0].lower().lstrip('@')}"]
+        return []
+    if _is_shared(host):
+        return []
+    return [f"d:{site_domain(host)}"]
+
+
+def shingles(name_key):
+    if len(name_key) <= SHINGLE_SIZE:
+        return {name_key} if name_key else set()
+    return {name_key[i:i + SHINGLE_SIZE] for i in range(len(name_key) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def names_agree(name_a, name_b, threshold):
+    """
+    Loose name check for records that share a link: one name inside the
+    other, or an edit similarity of at least ``threshold``. Unlike trigrams
+    this survives a swapped letter in a short name ("dike" / "diek").
+    """
+    if not name_a or not name_b:
+        return False
+    shorter, longer = sorted((name_a, name_b), key=len)
+    if len(shorter) > SHINGLE_SIZE and shorter in longer:
+        return True
+    return SequenceMatcher(None, name_a, name_b, autojunk=False).ratio() >= threshold
+
+
+def band_keys(grams):
+    """MinHash LSH band keys for a set of shingles."""
+    hashes = [zlib.crc32(g.encode()) for g in grams]
+    signature = [min([(a * h + b) % _PRIME for h in hashes]) for a, b in _PERMUTATIONS]
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        keys.append(f"b{band}:{zlib.crc32(repr(rows).encode()):08x}")
+    return keys
+
+
+@dataclass
+class Signals:
+    """Blocking signals of one record."""
+    name_key: str
+    grams: Set[str]
+    exact_keys: List[str] = field(default_factory=list)
+    band_keys: List[str] = field(default_factory=list)
+
+    @property
+    def keys(self):
+        return self.exact_keys + self.band_keys
+
+
+def extract_signals(name, urls=()):
+    name_key = normalize_name(name)
+    grams = shingles(name_key)
+    exact = [f"n:{name_key}"] if name_key else []
+    for url in urls:
+        for key in link_keys(url):
+            if key not in exact:
+                exact.append(key)
+    # Very short names have too few trigrams to be compared reliably
+    bands = band_keys(grams) if len(name_key) > SHINGLE_SIZE else []
+    return Signals(name_key, grams, exact, bands)
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class EntityIndex:
+    """Persistent mapping from blocking keys to resolved entity ids."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entity_keys (
+        key TEXT PRIMARY KEY,
+        entity_id TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS entity_names (
+        entity_id TEXT PRIMARY KEY,
+        name_key TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS entity_link_names (
+        key TEXT NOT NULL,
+        name_key TEXT NOT NULL,
+        PRIMARY KEY (key, name_key)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self):
+        ensure_schema(self.SCHEMA)
+        self.conn = get_connection()
+
+    def lookup(self, keys):
+        """Return {key: entity_id} for the keys already assigned to an entity."""
+        keys = list(set(keys))
+        found = {}
+        for chunk in chunked(keys):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, entity_id FROM entity_keys WHERE key IN ({placeholders})", chunk
+            )
+            found.update(rows)
+        return found
+
+    def names(self, entity_ids):
+        """Return {entity_id: normalized name} for known entities."""
+        entity_ids = list(set(entity_ids))
+        found = {}
+        for chunk in chunked(entity_ids):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT entity_id, name_key FROM entity_names WHERE entity_id IN ({placeholders})", chunk
+            )
+            found.update(rows)
+        return found
+
+    def link_names(self, keys):
+        """Return {link key: set of normalized names seen with it} over every run."""
+        keys = list(set(keys))
+        found = {}
+        for chunk in chunked(keys):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, name_key FROM entity_link_names WHERE key IN ({placeholders})", chunk
+            )
+            for key, name_key in rows:
+                found.setdefault(key, set()).add(name_key)
+        return found
+
+    def add_link_names(self, pairs):
+        """Record (link key, normalized name) sightings."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO entity_link_names (key, name_key) VALUES (?, ?)", list(pairs)
+            )
+
+    def add(self, entities):
+        """
+        Record resolved entities as (entity_id, name_key, keys) tuples.
+
+        Keys already owned by another entity keep their owner.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO entity_names (entity_id, name_key) VALUES (?, ?)",
+                [(entity_id, name_key) for entity_id, name_key, _ in entities],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO entity_keys (key, entity_id) VALUES (?, ?)",
+                [(key, entity_id) for entity_id, _, keys in entities for key in keys],
+            )
+
+
+@dataclass
+class ResolutionStats:
+    records: int = 0
+    blocks: int = 0
+    skipped_blocks: int = 0
+    shared_keys: int = 0
+    comparisons: int = 0
+    matches: int = 0
+    entities: int = 0
+    known_entities: int = 0
+    # Entity ids from earlier runs that records of this batch joined
+    joined: Set[str] = field(default_factory=set)
+
+
+def resolve_entities(records, name_of, urls_of, id_of, index=None, threshold=None, max_block=None):
+    """
+    Cluster records that describe the same project.
+
+    Args:
+        records: records from any source
+        name_of: record -> name
+        urls_of: record -> iterable of URLs (main link, website, GitHub, Twitter)
+        id_of: record -> id, used as the entity id of a new cluster's first record
+        index: optional ``EntityIndex`` to match against, and extend with,
+            entities resolved in earlier runs
+        threshold: name similarity needed for an LSH candidate to match
+        max_block: blocks with more records than this are not used
+
+    Returns:
+        tuple: ([(entity_id, [records])] in first-seen order, ResolutionStats)
+    """
+    threshold = threshold if threshold is not None else ENTITY_RESOLUTION["match_threshold"]
+    max_block = max_block or ENTITY_RESOLUTION["max_block"]
+    link_threshold = ENTITY_RESOLUTION["link_name_threshold"]
+    max_link_names = ENTITY_RESOLUTION["max_link_names"]
+    stats = ResolutionStats(records=len(records))
+
+    signals = [extract_signals(name_of(r), urls_of(r)) for r in records]
+
+    name_blocks, link_blocks, band_blocks = {}, {}, {}
+    for i, s in enumerate(signals):
+        for key in s.exact_keys:
+            (link_blocks if is_link_key(key) else name_blocks).setdefault(key, []).append(i)
+        for key in s.band_keys:
+            band_blocks.setdefault(key, []).append(i)
+
+    # A domain or handle used under many different names is a shortener,
+    # explorer or organisation link rather than one project's own
+    seen_names = {key: {signals[i].name_key for i in members} for key, members in link_blocks.items()}
+    if index is not None:
+        stored = index.link_names(seen_names)
+        index.add_link_names(
+            (key, name_key) for key, names in seen_names.items()
+            if len(stored.get(key, ())) <= max_link_names
+            for name_key in names - stored.get(key, set()) if name_key
+        )
+        for key, names in stored.items():
+            seen_names[key] |= names
+    shared = {key for key, names in seen_names.items() if len(names) > max_link_names}
+    for key in shared:
+        del link_blocks[key]
+    stats.shared_keys = len(shared)
+
+    # Entities from earlier runs take part as extra nodes after the records
+    known_ids, known_names = [], []
+    if index is not None:
+        assigned = index.lookup(list(name_blocks) + list(link_blocks) + list(band_blocks))
+        known_ids = sorted(set(assigned.values()))
+        stored_names = index.names(known_ids)
+        known_names = [stored_names.get(entity_id, "") for entity_id in known_ids]
+        node_of = {entity_id: len(records) + j for j, entity_id in enumerate(known_ids)}
+        for key, entity_id in assigned.items():
+            for blocks in (name_blocks, link_blocks, band_blocks):
+                if key in blocks:
+                    blocks[key].append(node_of[entity_id])
+                    break
+    known_grams = [shingles(name_key) for name_key in known_names]
+
+    def name_of_node(node):
+        return signals[node].name_key if node < len(records) else known_names[node - len(records)]
+
+    def grams_of(node):
+        return signals[node].grams if node < len(records) else known_grams[node - len(records)]
+
+    def same_link(x, y):
+        return names_agree(name_of_node(x), name_of_node(y), link_threshold)
+
+    def same_name(x, y):
+        return jaccard(grams_of(x), grams_of(y)) >= threshold
+
+    uf = _UnionFind(len(records) + len(known_ids))
+    for blocks, verify in ((name_blocks, None), (link_blocks, same_link), (band_blocks, same_name)):
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            stats.blocks += 1
+            if len(members) > max_block:
+                stats.skipped_blocks += 1
+                continue
+            if verify is None:
+                for other in members[1:]:
+                    uf.union(members[0], other)
+                continue
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    x, y = members[a], members[b]
+                    if uf.find(x) == uf.find(y):
+                        continue
+                    stats.comparisons += 1
+                    if verify(x, y):
+                        stats.matches += 1
+                        uf.union(x, y)
+
+    clusters = {}
+    for i in range(len(records)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    known_of_root = {}
+    for j, entity_id in enumerate(known_ids):
+        known_of_root.setdefault(uf.find(len(records) + j), entity_id)
+
+    entities, indexed = [], []
+    for root, members in clusters.items():
+        entity_id = known_of_root.get(root)
+        if entity_id is not None:
+            stats.known_entities += 1
+            stats.joined.add(entity_id)
+        else:
+            entity_id = id_of(records[members[0]])
+        if index is not None:
+            keys = list(dict.fromkeys(k for i in members for k in signals[i].keys if k not in shared))
+            indexed.append((entity_id, signals[members[0]].name_key, keys))
+        entities.append((entity_id, [records[i] for i in members]))
+    if indexed:
+        index.add(indexed)
+
+    stats.entities = len(entities)
+    return entities, stats
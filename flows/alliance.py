@@ -1,138 +1,67 @@
 import logging
-import time
 from datetime import datetime
-from bs4 import BeautifulSoup
 import sys
 import os
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 from prefect import flow, task
 
-# Only import ChromeDriverManager for local development
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import AllianceCompany
-from google_sheets import get_worksheet, write_rows
+from google_sheets import write_rows
+from dedup_index import filter_unseen, mark_seen
+from browser_pool import acquire_driver, release_driver
+from page_waits import wait_for_page, scroll_until_stable
+from parsers.alliance import COMPANY_CARD, parse_companies
 
 try:
-    from tasks.notify import notify_slack
+    from tasks.notify import notify_slack_digest
 except ImportError:
-    notify_slack = None
+    notify_slack_digest = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_chrome_driver():
-    """Create a Chrome WebDriver instance with proper configuration"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Check if we're in GitHub Actions or similar CI environment
-    if os.getenv('GITHUB_ACTIONS') == 'true' or os.path.exists('/usr/local/bin/chromedriver'):
-        # Use system ChromeDriver in CI environments
-        logger.info("Using system ChromeDriver")
-        service = Service('/usr/local/bin/chromedriver')
-    elif USE_WEBDRIVER_MANAGER:
-        # Use ChromeDriverManager for local development
-        logger.info("Using ChromeDriverManager")
-        service = Service(ChromeDriverManager().install())
-    else:
-        # Fallback to default ChromeDriver path
-        logger.info("Using default ChromeDriver path")
-        service = Service()
-    
-    return webdriver.Chrome(service=service, options=chrome_options)
-
 @task
 def fetch_alliance_companies():
     url = "https://alliance.xyz/companies"
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    driver = create_chrome_driver()
+    driver = acquire_driver()
     companies = []
 
     try:
         logger.info(f"Opening Alliance.xyz URL: {url}")
         driver.get(url)
-        time.sleep(5)
+        wait_for_page(driver, "alliance")
 
         # Scroll to load companies
-        body = driver.find_element(By.TAG_NAME, "body")
-        for _ in range(10):
-            body.send_keys(Keys.PAGE_DOWN)
-            time.sleep(1.5)
+        scroll_until_stable(driver, "alliance")
 
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-theme='dark'][class*='css-1j7l9ft']"))
         )
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        company_cards = soup.select("div.chakra-card")
-        logger.info(f"Found {len(company_cards)} companies on Alliance.xyz")
+        COMPANY_CARD.reset()
+        card_count, parsed_companies = parse_companies(driver.page_source)
+        logger.info(f"Found {card_count} companies on Alliance.xyz")
+        if card_count > len(parsed_companies):
+            logger.warning(f"Could not parse {card_count - len(parsed_companies)} company cards")
 
-        for card in company_cards:
+        for parsed in parsed_companies:
             try:
-                name_element = card.select_one("h2.chakra-heading")
-                if not name_element:
-                    logger.warning("Could not find company name element")
-                    continue
-
-                name = name_element.text.strip()
-
-                # Get link from closest <a> ancestor or inside the card
-                link_element = card.find_parent("a") or card.select_one("a")
-                link = ""
-                if link_element and link_element.has_attr("href"):
-                    href = link_element["href"]
-                    link = href if href.startswith("http") else "https://alliance.xyz" + href
-
-                description_element = card.select_one("p.chakra-text")
-                description = description_element.text.strip() if description_element else ""
-
-                categories = [tag.text.strip() for tag in card.select("span.css-5lhp63")] or None
-
-                company = AllianceCompany(
-                    name=name,
-                    link=link,
-                    description=description,
-                    categories=categories,
-                    fetched_at=datetime.utcnow()
-                )
-                companies.append(company)
-                logger.info(f"✓ Scraped company: {name} {categories if categories else ''}")
-
+                companies.append(AllianceCompany(**parsed, fetched_at=datetime.utcnow()))
+                logger.info(f"✓ Scraped company: {parsed['name']} {parsed['categories'] or ''}")
             except Exception as e:
                 logger.warning(f"Failed to parse company card: {e}")
 
     except Exception as e:
         logger.error(f"Error fetching Alliance companies: {e}")
     finally:
-        driver.quit()
+        release_driver(driver)
 
+    COMPANY_CARD.log_summary(logger)
     logger.info(f"✅ Total Alliance companies scraped: {len(companies)}")
     return companies
 
@@ -144,15 +73,7 @@ def store_alliance_companies(companies):
         return []
 
     headers = ["name", "link", "description", "categories", "fetched_at"]
-    ws = get_worksheet("alliance")
-    existing_names = set(str(row['name']).strip().lower() for row in ws.get_all_records() if row.get('name'))
-
-    unique_companies = []
-    for c in companies:
-        if c.name.strip().lower() in existing_names:
-            logger.info(f"⏩ Skipping duplicate company name: {c.name}")
-            continue
-        unique_companies.append(c)
+    unique_companies, index = filter_unseen("alliance", companies, lambda c: c.name, "name", headers)
 
     rows = []
     for c in unique_companies:
@@ -168,8 +89,9 @@ def store_alliance_companies(companies):
         logger.info("🟡 No new unique Alliance companies to insert.")
         return []
 
-    write_rows("alliance", rows, headers)
-    logger.info(f"✅ {len(rows)} Alliance companies written to Google Sheets.")
+    written_range = write_rows("alliance", rows, headers)
+    mark_seen(index, unique_companies, lambda c: c.name, written_range)
+    logger.info(f"✅ {len(rows)} Alliance companies written to Google Sheets ({written_range}).")
     return unique_companies
 
 
@@ -180,16 +102,18 @@ def notify_slack_if_available(companies):
         logger.info("ℹ️ No new Alliance companies to notify.")
         return
 
-    if not notify_slack:
+    if not notify_slack_digest:
         logger.warning("⚠️ Slack notifier not available.")
         return
 
+    messages = []
     for company in companies:
         message = f":building_construction: New Alliance company: *{company.name}*\n<{company.link}>"
         if company.description:
             message += f"\n_{company.description}_"
-        notify_slack.fn(message)
-        logger.info(f"📨 Notified: {company.name}")
+        messages.append(message)
+
+    notify_slack_digest.fn(f"{len(companies)} new Alliance companies", messages)
 
 
 @flow(name="Alliance Companies Flow")
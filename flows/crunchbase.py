@@ -1,16 +1,18 @@
 import os
+import queue
 import re
 import sys
+import threading
 import requests
 from datetime import datetime
 import logging
-import firebase_admin
-from firebase_admin import credentials, firestore
 from prefect import flow, task
 
 # Add parent directory to path so we can import tasks
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tasks.notify import notify_slack
+from local_store import get_state, set_state, delete_state
+from config import CRUNCHBASE
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -19,100 +21,249 @@ logger = logging.getLogger(__name__)
 # Initialize Firebase - adjust the path as needed for your project structure
 FIREBASE_SERVICE_ACCOUNT_PATH = os.getenv("FIREBASE_SERVICE_ACCOUNT_PATH", "web3identifier-firebase-adminsdk-fbsvc-894c77946c.json")
 
-# Initialize Firebase if not already initialized
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_SERVICE_ACCOUNT_PATH)
-    firebase_admin.initialize_app(cred)
+_db = None
+_db_lock = threading.Lock()
 
-db = firestore.client()
 
-@task
-def fetch_seed_startups():
-    """Fetch seed stage blockchain startups from Crunchbase API"""
-    url = "https://api.crunchbase.com/api/v4/graphql"
-    query = '''
-    query {
-      organizations(filter: {categories: ["blockchain"], stage: ["seed"]}) { 
-        items { 
-          uuid 
-          name 
-          short_description 
-          homepage_url 
-        } 
-      }
+def get_db():
+    """
+    Return the Firestore client, initializing Firebase on first use.
+
+    Done lazily so importing this module (e.g. to list flows) neither loads
+    the Firebase SDK nor reads the service account.
+    """
+    global _db
+    with _db_lock:
+        if _db is None:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+
+            if not firebase_admin._apps:
+                cred = credentials.Certificate(FIREBASE_SERVICE_ACCOUNT_PATH)
+                firebase_admin.initialize_app(cred)
+            _db = firestore.client()
+        return _db
+
+# get_all accepts any number of refs, but smaller chunks keep responses bounded
+FIRESTORE_READ_CHUNK = 300
+# Firestore's limit on writes per batch
+FIRESTORE_WRITE_BATCH = 500
+
+CRUNCHBASE_GRAPHQL_URL = "https://api.crunchbase.com/api/v4/graphql"
+
+SEED_STARTUPS_QUERY = '''
+query($first: Int!, $after: String) {
+  organizations(filter: {categories: ["blockchain"], stage: ["seed"]}, first: $first, after: $after) { 
+    items { 
+      uuid 
+      name 
+      short_description 
+      homepage_url 
+    } 
+    pageInfo {
+      endCursor
+      hasNextPage
     }
-    '''
-    
-    headers = {"X-Cb-User-Key": os.getenv("CRUNCHBASE_API_KEY")}
-    
+  }
+}
+'''
+
+
+def fetch_seed_startups_page(session, after=None):
+    """
+    Fetch one page of seed stage blockchain startups from Crunchbase API.
+
+    Returns:
+        tuple: (organizations, cursor after this page, whether more pages exist)
+    """
+    resp = session.post(
+        CRUNCHBASE_GRAPHQL_URL,
+        json={"query": SEED_STARTUPS_QUERY, "variables": {"first": CRUNCHBASE["page_size"], "after": after}},
+        timeout=CRUNCHBASE["timeout"],
+    )
+    resp.raise_for_status()  # Raise exception for HTTP errors
+
+    organizations = resp.json()["data"]["organizations"]
+    page_info = organizations.get("pageInfo") or {}
+    return organizations["items"], page_info.get("endCursor"), bool(page_info.get("hasNextPage"))
+
+
+def iter_seed_startup_pages(after=None):
+    """
+    Yield (organizations, cursor) page by page, following the API cursor.
+
+    Each page needs the previous page's cursor, so pages cannot be fetched
+    in parallel; instead a background thread fetches ahead while the caller
+    stores the current page, keeping up to ``pages_in_flight`` pages queued.
+    """
+    pages = queue.Queue(maxsize=CRUNCHBASE["pages_in_flight"])
+    stop = threading.Event()
+
+    def produce():
+        session = requests.Session()
+        session.headers["X-Cb-User-Key"] = os.getenv("CRUNCHBASE_API_KEY") or ""
+        cursor = after
+        try:
+            while not stop.is_set():
+                items, cursor, has_next = fetch_seed_startups_page(session, cursor)
+                _put(("page", items, cursor))
+                if not has_next or not items:
+                    break
+        except Exception as e:
+            _put(("error", e, cursor))
+        finally:
+            _put(("done", None, cursor))
+            session.close()
+
+    def _put(entry):
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    producer = threading.Thread(target=produce, name="crunchbase-pages", daemon=True)
+    producer.start()
     try:
-        logger.info("Fetching data from Crunchbase API")
-        resp = requests.post(url, json={"query": query}, headers=headers)
-        resp.raise_for_status()  # Raise exception for HTTP errors
-        
-        data = resp.json()
-        items = data["data"]["organizations"]["items"]
-        logger.info(f"Successfully fetched {len(items)} organizations")
-        return items
+        while True:
+            kind, payload, cursor = pages.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise payload
+            yield payload, cursor
+    finally:
+        stop.set()
+
+
+@task
+def ingest_seed_startups(resume=True):
+    """
+    Stream seed startups from Crunchbase into Firestore page by page.
+
+    The cursor of the last stored page is saved so an interrupted run resumes
+    where it stopped; it is cleared once the last page has been stored.
+
+    Returns:
+        list: organizations that were new in Firestore
+    """
+    cursor = get_state("crunchbase", "cursor") if resume else None
+    if cursor:
+        logger.info(f"Resuming Crunchbase ingestion after cursor {cursor}")
+
+    new_orgs = []
+    fetched = 0
+    try:
+        for items, cursor in iter_seed_startup_pages(cursor):
+            fetched += len(items)
+            logger.info(f"Fetched a page of {len(items)} organizations ({fetched} so far)")
+            new_orgs.extend(store_orgs_in_firestore.fn(items))
+            if cursor:
+                set_state("crunchbase", "cursor", cursor)
     except Exception as e:
         logger.error(f"Error fetching from Crunchbase API: {e}")
-        return []
+        return new_orgs
+
+    delete_state("crunchbase", "cursor")
+    logger.info(f"Successfully fetched {fetched} organizations")
+    return new_orgs
+
+
+def org_document_id(org):
+    """Use UUID as document ID (it's already a safe identifier)"""
+    doc_id = org["uuid"]
+
+    # In case the UUID has invalid characters (shouldn't happen but just to be safe)
+    if not re.match(r'^[a-zA-Z0-9_-]+$', doc_id):
+        doc_id = re.sub(r'[^\w-]', '', doc_id)
+    return doc_id
+
+
+def org_document(org):
+    return {
+        "uuid": org["uuid"],
+        "name": org["name"],
+        "url": org.get("homepage_url", ""),
+        "description": org.get("short_description", ""),
+        "fetched_at": datetime.utcnow()
+    }
+
+
+def store_org_individually(collection_ref, org, doc_id=None):
+    """Write one organization, falling back to an auto-generated ID. Returns True if stored."""
+    try:
+        collection_ref.document(doc_id or org_document_id(org)).set(org_document(org))
+        logger.info(f"Organization '{org['name']}' inserted successfully")
+        return True
+    except Exception as e:
+        logger.error(f"Error storing organization '{org.get('name', 'Unknown')}': {e}")
+        # Try with auto-generated ID if there's an issue
+        try:
+            auto_doc_ref = collection_ref.document()  # Let Firestore generate an ID
+            auto_doc_ref.set(org_document(org))
+            logger.info(f"Organization '{org['name']}' inserted with auto-generated ID")
+            return True
+        except Exception as e2:
+            logger.error(f"Failed to store organization '{org.get('name', 'Unknown')}' with auto-generated ID: {e2}")
+            return False
+
 
 @task
 def store_orgs_in_firestore(items):
-    """Store organizations in Firestore database"""
+    """
+    Store organizations in Firestore database.
+
+    Existence is checked for a whole chunk of documents with one get_all
+    call, and new documents are committed in batched writes. If a batch
+    fails, its organizations are written one by one with the auto-ID
+    fallback. Set FIRESTORE_EMULATOR_HOST to run against the emulator
+    (as tests/test_crunchbase_store.py does).
+    """
     if not items:
         logger.warning("No organizations to store in Firestore")
         return []
     
     new_orgs = []
+    db = get_db()
     collection_ref = db.collection('crunchbase_orgs')
-    
+
+    # Resolve document IDs, keeping the first occurrence of each
+    candidates = {}
     for org in items:
         try:
-            # Use UUID as document ID (it's already a safe identifier)
-            doc_id = org["uuid"]
-            
-            # In case the UUID has invalid characters (shouldn't happen but just to be safe)
-            if not re.match(r'^[a-zA-Z0-9_-]+$', doc_id):
-                doc_id = re.sub(r'[^\w-]', '', doc_id)
-            
-            doc_ref = collection_ref.document(doc_id)
-            
-            # Check if document already exists
-            doc = doc_ref.get()
-            if not doc.exists:
-                org_data = {
-                    "uuid": org["uuid"],
-                    "name": org["name"],
-                    "url": org.get("homepage_url", ""),
-                    "description": org.get("short_description", ""),
-                    "fetched_at": datetime.utcnow()
-                }
-                
-                doc_ref.set(org_data)
-                logger.info(f"Organization '{org['name']}' inserted successfully")
-                new_orgs.append(org)
-            else:
-                logger.info(f"Organization '{org['name']}' already exists")
-                
+            doc_id = org_document_id(org)
         except Exception as e:
-            logger.error(f"Error storing organization '{org.get('name', 'Unknown')}': {e}")
-            # Try with auto-generated ID if there's an issue
-            try:
-                auto_doc_ref = collection_ref.document()  # Let Firestore generate an ID
-                org_data = {
-                    "uuid": org["uuid"],
-                    "name": org["name"],
-                    "url": org.get("homepage_url", ""),
-                    "description": org.get("short_description", ""),
-                    "fetched_at": datetime.utcnow()
-                }
-                auto_doc_ref.set(org_data)
-                logger.info(f"Organization '{org['name']}' inserted with auto-generated ID")
+            logger.error(f"Invalid organization '{org.get('name', 'Unknown')}': {e}")
+            if store_org_individually(collection_ref, org):
                 new_orgs.append(org)
-            except Exception as e2:
-                logger.error(f"Failed to store organization '{org.get('name', 'Unknown')}' with auto-generated ID: {e2}")
+            continue
+        candidates.setdefault(doc_id, org)
+
+    doc_ids = list(candidates)
+    for start in range(0, len(doc_ids), FIRESTORE_READ_CHUNK):
+        chunk = doc_ids[start:start + FIRESTORE_READ_CHUNK]
+        refs = [collection_ref.document(doc_id) for doc_id in chunk]
+
+        # One round trip for the whole chunk instead of a get() per org
+        existing = {snapshot.id for snapshot in db.get_all(refs, field_paths=["uuid"]) if snapshot.exists}
+        to_write = [doc_id for doc_id in chunk if doc_id not in existing]
+        logger.info(f"{len(existing)} of {len(chunk)} organizations already exist")
+
+        for batch_start in range(0, len(to_write), FIRESTORE_WRITE_BATCH):
+            batch_ids = to_write[batch_start:batch_start + FIRESTORE_WRITE_BATCH]
+            batch = db.batch()
+            for doc_id in batch_ids:
+                batch.set(collection_ref.document(doc_id), org_document(candidates[doc_id]))
+            try:
+                batch.commit()
+                new_orgs.extend(candidates[doc_id] for doc_id in batch_ids)
+                logger.info(f"Inserted {len(batch_ids)} organizations in one batch")
+            except Exception as e:
+                logger.error(f"Batch write of {len(batch_ids)} organizations failed: {e}")
+                for doc_id in batch_ids:
+                    if store_org_individually(collection_ref, candidates[doc_id], doc_id):
+                        new_orgs.append(candidates[doc_id])
     
     logger.info(f"Successfully stored {len(new_orgs)} new organizations")
     return new_orgs
@@ -152,8 +303,7 @@ def prepare_slack_notifications(new_orgs):
 @flow(name="Crunchbase Seed Startups")
 def run_flow():
     """Main flow to fetch and store seed stage blockchain startups"""
-    items = fetch_seed_startups()
-    new_orgs = store_orgs_in_firestore(items)
+    new_orgs = ingest_seed_startups()
     
     # Prepare and send Slack notification
     slack_message = prepare_slack_notifications(new_orgs)
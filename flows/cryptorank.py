@@ -3,40 +3,35 @@ import time
 from datetime import datetime
 import sys
 import os
-from bs4 import BeautifulSoup
-import re
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Only import ChromeDriverManager for local development
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-
 from prefect import flow, task
 from dataclasses import dataclass, asdict
 from typing import List, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from google_sheets import get_worksheet, write_rows
+from google_sheets import write_rows
+from dedup_index import filter_unseen, mark_seen, normalize_key, reconciled_index
+from browser_pool import acquire_driver, release_driver, map_with_drivers
+from config import CRYPTORANK
+from page_waits import wait_for_page
+from parsers.cryptorank import FUNDING_ROW, PROJECT_PAGE, parse_funding_rounds, parse_project_details
 
 # Import Slack notifier if available
 try:
-    from tasks.notify import notify_slack
+    from tasks.notify import notify_slack_digest
 except ImportError:
-    notify_slack = None
+    notify_slack_digest = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HEADERS = ["name", "link", "funding_amount", "funding_type", "backers",
+           "funding_date", "description", "website", "twitter", "linkedin", "fetched_at"]
+
 
 @dataclass
 class CryptorankProject:
@@ -62,51 +57,37 @@ class CryptorankProject:
         return result
 
 
-def create_chrome_driver():
-    """Create a Chrome WebDriver instance with proper configuration"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Check if we're in GitHub Actions or similar CI environment
-    if os.getenv('GITHUB_ACTIONS') == 'true' or os.path.exists('/usr/local/bin/chromedriver'):
-        # Use system ChromeDriver in CI environments
-        logger.info("Using system ChromeDriver")
-        service = Service('/usr/local/bin/chromedriver')
-    elif USE_WEBDRIVER_MANAGER:
-        # Use ChromeDriverManager for local development
-        logger.info("Using ChromeDriverManager")
-        service = Service(ChromeDriverManager().install())
-    else:
-        # Fallback to default ChromeDriver path
-        logger.info("Using default ChromeDriver path")
-        service = Service()
-    
-    return webdriver.Chrome(service=service, options=chrome_options)
-
-
 @task
-def fetch_cryptorank_funding_rounds(pages=3):
-    """Fetch funding rounds from Cryptorank"""
+def fetch_cryptorank_funding_rounds(pages=None, adaptive=None):
+    """
+    Fetch funding rounds from Cryptorank.
+
+    In adaptive mode pages are walked until ``known_streak`` consecutive
+    target rounds are already in the dedup index, with ``pages`` (default
+    ``max_pages``) as a hard cap. Otherwise exactly ``pages`` pages are read.
+    Rounds already in the index are dropped in both modes.
+    """
     base_url = "https://cryptorank.io/funding-rounds?page={}&rows=50"
     projects = []
     target_rounds = ["Seed", "Grant", "Pre-Seed", "Angel", "Extended Seed"]
+
+    if adaptive is None:
+        adaptive = CRYPTORANK["adaptive"]
+    max_pages = pages or (CRYPTORANK["max_pages"] if adaptive else CRYPTORANK["pages"])
+    # The adaptive walk stops on known rounds, so the index must match the sheet
+    index = reconciled_index("cryptorank", "name", HEADERS)
+    FUNDING_ROW.reset()
+    known_streak = 0
+    pages_visited = 0
     
-    driver = create_chrome_driver()
+    driver = acquire_driver()
 
     try:
-        for page in range(1, pages + 1):
+        for page in range(1, max_pages + 1):
             url = base_url.format(page)
             logger.info(f"Opening Cryptorank URL: {url}")
             driver.get(url)
-            time.sleep(5)  # Wait for the page to load
+            wait_for_page(driver, "cryptorank", "listing")
 
             # Find all rows in the table
             WebDriverWait(driver, 10).until(
@@ -114,71 +95,29 @@ def fetch_cryptorank_funding_rounds(pages=3):
             )
             
             # Extract the table content
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            rows = soup.select("#root-container > div > div > section > div.sc-8b95f51a-0.sc-e739bd4e-0.hOzXIj.bxDZvl > div.sc-7216fc15-0.lbdGOI > div > div.sc-a3162eff-0.glHxUG > table > tbody > tr")
+            row_count, rounds = parse_funding_rounds(driver.page_source, target_rounds)
             
-            logger.info(f"Found {len(rows)} rows on page {page}")
-            
-            for row in rows:
-                try:
-                    # Check if the funding type is one of our targets
-                    funding_type_cell = row.select_one("td:nth-child(3) p")
-                    if not funding_type_cell:
-                        continue
-                        
-                    funding_type = funding_type_cell.text.strip()
-                    
-                    if funding_type not in target_rounds:
-                        continue
-                    
-                    # Extract project name and link
-                    link_element = row.select_one("td:first-child a.sc-bc80ddda-6")
-                    if not link_element:
-                        continue
-                        
-                    project_link = link_element.get("href", "")
-                    if not project_link:
-                        continue
-                        
-                    project_name = link_element.select_one(".name").text.strip() if link_element.select_one(".name") else ""
-                    
-                    # Extract funding amount
-                    funding_amount = row.select_one("td:nth-child(2) p").text.strip() if row.select_one("td:nth-child(2) p") else ""
-                    
-                    # Extract funding date
-                    funding_date = row.select_one("td:nth-child(5) p").text.strip() if row.select_one("td:nth-child(5) p") else ""
-                    
-                    # Extract backers
-                    backers_cell = row.select_one("td:nth-child(4)")
-                    backers = []
-                    if backers_cell:
-                        backer_links = backers_cell.select("a")
-                        for backer_link in backer_links:
-                            backer_name = backer_link.select_one("span")
-                            if backer_name:
-                                backers.append(backer_name.text.strip())
-                    
-                    # Construct the detail page URL (replace 'ico' with 'price')
-                    detail_url = "https://cryptorank.io" + project_link.replace("/ico/", "/price/")
-                    
-                    logger.info(f"Found {funding_type} project: {project_name} ({detail_url})")
-                    
-                    # Add basic project info to our list
-                    project = CryptorankProject(
-                        name=project_name,
-                        link=detail_url,
-                        funding_amount=funding_amount,
-                        funding_type=funding_type,
-                        backers=backers,
-                        funding_date=funding_date,
-                        fetched_at=datetime.utcnow()
-                    )
-                    
+            logger.info(f"Found {row_count} rows on page {page}")
+            pages_visited = page
+            if not row_count:
+                break
+
+            page_projects = []
+            for parsed in rounds:
+                logger.info(f"Found {parsed['funding_type']} project: {parsed['name']} ({parsed['link']})")
+                page_projects.append(CryptorankProject(**parsed, fetched_at=datetime.utcnow()))
+
+            # Rounds already stored end the walk once enough appear in a row
+            unseen = index.unseen(normalize_key(p.name) for p in page_projects)
+            for project in page_projects:
+                if normalize_key(project.name) in unseen:
                     projects.append(project)
-                
-                except Exception as e:
-                    logger.warning(f"Error processing row: {e}")
-                    continue
+                    known_streak = 0
+                else:
+                    known_streak += 1
+            if adaptive and known_streak >= CRYPTORANK["known_streak"]:
+                logger.info(f"Stopping after page {page}: {known_streak} consecutive known rounds")
+                break
             
             # Sleep before moving to the next page to avoid rate limiting
             time.sleep(2)
@@ -187,77 +126,61 @@ def fetch_cryptorank_funding_rounds(pages=3):
         logger.error(f"Error fetching funding rounds: {e}")
     
     finally:
-        driver.quit()
+        release_driver(driver)
     
-    logger.info(f"Found {len(projects)} projects with target funding rounds")
+    FUNDING_ROW.log_summary(logger)
+    logger.info(f"Visited {pages_visited} of up to {max_pages} pages "
+                f"({'adaptive' if adaptive else 'fixed'} mode)")
+    logger.info(f"Found {len(projects)} new projects with target funding rounds")
     return projects
 
 
+def enrich_project(driver, project):
+    """Load a project's detail page and fill in description, links and backers"""
+    logger.info(f"Fetching details for {project.name} from {project.link}")
+    driver.get(project.link)
+    wait_for_page(driver, "cryptorank", "detail")
+
+    details = parse_project_details(driver.page_source)
+    for attr in ("description", "website", "twitter", "linkedin"):
+        if details[attr]:
+            setattr(project, attr, details[attr])
+
+    # Get additional backers if they weren't all visible in the table
+    for backer_name in details["backers"]:
+        if backer_name not in project.backers:
+            project.backers.append(backer_name)
+
+    # Sleep to avoid rate limiting
+    time.sleep(CRYPTORANK["detail_delay"])
+    logger.info(f"✅ Successfully fetched details for {project.name}")
+    return project
+
+
 @task
-def fetch_project_details(projects):
-    """Fetch additional details for each project"""
-    driver = create_chrome_driver()
-    enriched_projects = []
+def fetch_project_details(projects, workers=None):
+    """Fetch additional details for each project using parallel browser workers"""
+    if not projects:
+        return []
 
-    try:
-        for project in projects:
-            try:
-                logger.info(f"Fetching details for {project.name} from {project.link}")
-                driver.get(project.link)
-                time.sleep(3)  # Wait for the page to load
-                
-                # Get the page source
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                
-                # Extract description
-                description_div = soup.select_one("div.sc-933dbf49-0 div.sc-933dbf49-2 p")
-                if description_div:
-                    project.description = description_div.text.strip()
-                
-                # Extract links (website, Twitter, LinkedIn)
-                links_div = soup.select_one("div.links")
-                if links_div:
-                    links = links_div.select("a.styles_coin_social_link_item__SAH_3")
-                    for link in links:
-                        href = link.get("href", "")
-                        span_text = link.select_one("span")
-                        if span_text:
-                            link_type = span_text.text.strip().lower()
-                            
-                            if "website" in link_type and href:
-                                project.website = href
-                            elif any(x in link_type for x in ["x", "twitter"]) and href:
-                                project.twitter = href
-                            elif "linkedin" in link_type and href:
-                                project.linkedin = href
-                
-                # Get additional backers if they weren't all visible in the table
-                funds_div = soup.select_one("div.investors")
-                if funds_div:
-                    backer_links = funds_div.select("a")
-                    for backer_link in backer_links:
-                        backer_name_elem = backer_link.select_one("p")
-                        if backer_name_elem:
-                            backer_name = backer_name_elem.text.strip()
-                            if backer_name and backer_name not in project.backers:
-                                project.backers.append(backer_name)
-                
-                enriched_projects.append(project)
-                logger.info(f"✅ Successfully fetched details for {project.name}")
-                
-            except Exception as e:
-                logger.warning(f"Error fetching details for {project.name}: {e}")
-                enriched_projects.append(project)  # Add the project even if we couldn't get details
-            
-            # Sleep to avoid rate limiting
-            time.sleep(1)
-    
-    except Exception as e:
-        logger.error(f"Error in fetch_project_details: {e}")
-    
-    finally:
-        driver.quit()
-    
+    PROJECT_PAGE.reset()
+    results = map_with_drivers(
+        enrich_project,
+        projects,
+        url_of=lambda project: project.link,
+        workers=workers or CRYPTORANK["detail_workers"],
+        retries=CRYPTORANK["detail_retries"],
+    )
+
+    enriched_projects = []
+    for project, result in zip(projects, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error fetching details for {project.name}: {result}")
+            enriched_projects.append(project)  # Add the project even if we couldn't get details
+        else:
+            enriched_projects.append(result)
+
+    PROJECT_PAGE.log_summary(logger)
     return enriched_projects
 
 
@@ -268,24 +191,7 @@ def store_cryptorank_projects(projects):
         logger.info("No Cryptorank projects to store.")
         return []
 
-    headers = ["name", "link", "funding_amount", "funding_type", "backers", 
-              "funding_date", "description", "website", "twitter", "linkedin", "fetched_at"]
-    
-    ws = get_worksheet("cryptorank")
-    existing_names = set()
-    
-    try:
-        existing_records = ws.get_all_records()
-        existing_names = set(row['name'].strip().lower() for row in existing_records if row.get('name'))
-    except Exception as e:
-        logger.warning(f"Could not get existing records: {e}")
-    
-    unique_projects = []
-    for p in projects:
-        if p.name.strip().lower() in existing_names:
-            logger.info(f"⏩ Skipping duplicate project: {p.name}")
-            continue
-        unique_projects.append(p)
+    unique_projects, index = filter_unseen("cryptorank", projects, lambda p: p.name, "name", HEADERS)
 
     rows = [p.dict() for p in unique_projects]
 
@@ -293,8 +199,9 @@ def store_cryptorank_projects(projects):
         logger.info("🟡 No new unique Cryptorank projects to insert.")
         return []
 
-    write_rows("cryptorank", rows, headers)
-    logger.info(f"✅ {len(rows)} unique Cryptorank projects written to Google Sheets.")
+    written_range = write_rows("cryptorank", rows, HEADERS)
+    mark_seen(index, unique_projects, lambda p: p.name, written_range)
+    logger.info(f"✅ {len(rows)} unique Cryptorank projects written to Google Sheets ({written_range}).")
     return unique_projects
 
 
@@ -305,22 +212,24 @@ def notify_slack_if_available(projects):
         logger.info("ℹ️ No new projects to notify.")
         return
 
-    if not notify_slack:
+    if not notify_slack_digest:
         logger.warning("⚠️ Slack notifier not available.")
         return
 
+    messages = []
     for project in projects:
         message = (f":money_with_wings: New {project.funding_type} round: *{project.name}* - {project.funding_amount}\n"
                   f"Backers: {', '.join(project.backers) if project.backers else 'N/A'}\n"
                   f"<{project.link}>")
-        notify_slack.fn(message)
-        logger.info(f"📨 Notified: {project.name}")
+        messages.append(message)
+
+    notify_slack_digest.fn(f"{len(projects)} new Cryptorank funding rounds", messages)
 
 
 @flow(name="Cryptorank Funding Flow")
-def run_cryptorank_flow(pages=3):
+def run_cryptorank_flow(pages=None, adaptive=None):
     """Main flow to run the Cryptorank scraper"""
-    projects = fetch_cryptorank_funding_rounds(pages)
+    projects = fetch_cryptorank_funding_rounds(pages, adaptive)
     enriched_projects = fetch_project_details(projects)
     stored = store_cryptorank_projects(enriched_projects)
     notify_slack_if_available(stored)
@@ -1,51 +1,44 @@
-from datetime import datetime, timedelta
 import logging
 import sys
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore
 from prefect import flow, task
 
 # Add parent directory to path so we can import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tasks.notify import notify_slack
-from config import FIREBASE_SERVICE_ACCOUNT_PATH
+from leaderboard import top_projects
+from config import DIGEST
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Firebase if not already initialized
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_SERVICE_ACCOUNT_PATH)
-    firebase_admin.initialize_app(cred)
-db = firestore.client()
-
 @task
-def get_top5():
+def get_top_projects(k=None, window_days=None):
     """
-    Get the top 5 projects by score from the projects collection.
+    Get the top projects by score from the local leaderboard kept by the merge flow.
+    
+    Args:
+        k (int): Number of projects (defaults to DIGEST_TOP_K)
+        window_days (float): Only projects first merged within this many days
     
     Returns:
         list: A list of formatted strings describing the top projects
     """
-    logger.info("Fetching top 5 projects by score")
+    k = k or DIGEST["top_k"]
+    window_days = window_days if window_days is not None else DIGEST["window_days"]
+    logger.info(f"Fetching top {k} projects by score")
     
-    # Query Firestore for top 5 projects ordered by score descending
-    projects_ref = db.collection('projects')
-    query = projects_ref.order_by('score', direction=firestore.Query.DESCENDING).limit(5)
-    
-    top_projects = []
-    for doc in query.stream():
-        project = doc.to_dict()
-        project_str = f"{project.get('name', 'Unnamed')} ({project.get('source', 'Unknown')}) – {project.get('score', 0)}"
-        top_projects.append(project_str)
+    top = []
+    for project in top_projects(k, window_days):
+        project_str = f"{project.get('name', 'Unnamed')} ({project.get('source', 'Unknown')}) – {project.get('score', 0):g}"
+        top.append(project_str)
         logger.info(f"Found top project: {project_str}")
     
-    return top_projects
+    return top
 
 @task
-def format_message(items):
+def format_message(items, k=None, window_days=None):
     """
     Format a list of project strings into a message for Slack.
     
@@ -55,25 +48,32 @@ def format_message(items):
     Returns:
         str: A formatted message for Slack
     """
+    k = k or DIGEST["top_k"]
+    window_days = window_days if window_days is not None else DIGEST["window_days"]
+    title = f"🔔 *Daily Top {k} Projects"
+    if window_days:
+        title += f" (last {window_days:g} days)"
+    title += ":*"
+
     if not items:
-        return "🔔 *Daily Top 5 Projects:*\nNo projects found today."
+        return f"{title}\nNo projects found today."
     
-    message = "🔔 *Daily Top 5 Projects:*\n" + "\n".join(f"- {i}" for i in items)
+    message = f"{title}\n" + "\n".join(f"- {i}" for i in items)
     logger.info(f"Formatted message: {message}")
     return message
 
 @flow(name="Daily Digest")
-def run_daily_digest():
+def run_daily_digest(k=None, window_days=None):
     """
     Main flow to send daily digest of top projects.
     """
     logger.info("Starting daily digest flow")
     
-    # Get top 5 projects
-    top_projects = get_top5()
+    # Get top projects
+    top = get_top_projects(k, window_days)
     
     # Format the message
-    message = format_message(top_projects)
+    message = format_message(top, k, window_days)
     
     # Send notification
     notify_slack.fn(message)
@@ -82,4 +82,4 @@ def run_daily_digest():
 
 if __name__ == "__main__":
     # For local testing, run the flow directly
-    run_daily_digest()
\ No newline at end of file
+    run_daily_digest()
@@ -3,147 +3,135 @@ import time
 from datetime import datetime
 import sys
 import os
-from bs4 import BeautifulSoup
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 from prefect import flow, task
 
-# Only import ChromeDriverManager for local development
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import DevpostWinner
-from google_sheets import get_worksheet, write_rows
+from google_sheets import write_rows
+from dedup_index import filter_unseen, mark_seen
+from browser_pool import acquire_driver, release_driver
+from page_waits import wait_for_page, scroll_until_stable
+from http_fetch import fetch_html
+from parsers.devpost import (
+    CARD_SELECTOR, GALLERY_ITEM, HACKATHON_TILE, find_winners_link, parse_gallery_winners,
+    parse_hackathon_tiles, parse_winners_link,
+)
+from concurrency import map_concurrently
+from local_store import get_state, set_state
+from config import DEVPOST
 
 # Import Slack notifier if available
 try:
-    from tasks.notify import notify_slack
+    from tasks.notify import notify_slack_digest
 except ImportError:
-    notify_slack = None
+    notify_slack_digest = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_chrome_driver():
-    """Create a Chrome WebDriver instance with proper configuration"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Check if we're in GitHub Actions or similar CI environment
-    if os.getenv('GITHUB_ACTIONS') == 'true' or os.path.exists('/usr/local/bin/chromedriver'):
-        # Use system ChromeDriver in CI environments
-        logger.info("Using system ChromeDriver")
-        service = Service('/usr/local/bin/chromedriver')
-    elif USE_WEBDRIVER_MANAGER:
-        # Use ChromeDriverManager for local development
-        logger.info("Using ChromeDriverManager")
-        service = Service(ChromeDriverManager().install())
-    else:
-        # Fallback to default ChromeDriver path
-        logger.info("Using default ChromeDriver path")
-        service = Service()
-    
-    return webdriver.Chrome(service=service, options=chrome_options)
+
+def hackathon_is_processed(hackathon_url):
+    """True if the hackathon's winners were already harvested and are not due for a re-check"""
+    entry = get_state("devpost_hackathons", hackathon_url)
+    if not entry:
+        return False
+    recheck_days = DEVPOST["recheck_days"]
+    return not recheck_days or time.time() - entry["processed_at"] < recheck_days * 86400
+
+
+def harvest_hackathon(hackathon):
+    """
+    Scrape one hackathon: its page, then its "View the winners" gallery.
+
+    Returns:
+        list: DevpostWinner items, or None if the winners are not published
+        or the gallery had no items to parse
+    """
+    hackathon_name, hackathon_url = hackathon
+    logger.info(f"Opening hackathon: {hackathon_name}")
+    page = fetch_html(hackathon_url, find_winners_link, "devpost", "hackathon")
+    project_gallery_url = parse_winners_link(page.document, hackathon_url)
+    if not project_gallery_url:
+        logger.warning(f"No 'View the winners' button in: {hackathon_name}")
+        return None
+
+    # Galleries are server-rendered, so try plain HTTP first
+    gallery = fetch_html(project_gallery_url, CARD_SELECTOR, "devpost", "gallery")
+    item_count, parsed_winners = parse_gallery_winners(gallery.document)
+    logger.info(f"{hackathon_name}: Found {item_count} gallery items")
+    if item_count == 0:
+        logger.warning(f"Empty winners gallery for {hackathon_name}: {project_gallery_url}")
+        return None
+
+    winners = []
+    for parsed in parsed_winners:
+        winners.append(DevpostWinner(**parsed, hackathon=hackathon_name, fetched_at=datetime.utcnow()))
+        logger.info(f"🏆 {parsed['title']}")
+    return winners
+
 
 @task
 def fetch_devpost_blockchain_winners():
     url = "https://devpost.com/hackathons?search=blockchain&status[]=ended"
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    driver = create_chrome_driver()
+    driver = acquire_driver()
     winners = []
+    harvested = []
+    hackathon_links = []
+    HACKATHON_TILE.reset()
+    GALLERY_ITEM.reset()
 
     try:
         logger.info(f"Opening Devpost URL: {url}")
         driver.get(url)
-        time.sleep(3)
-
-        body = driver.find_element(By.TAG_NAME, "body")
-        for _ in range(12):
-            body.send_keys(Keys.PAGE_DOWN)
-            time.sleep(1.2)
+        wait_for_page(driver, "devpost", "listing")
+        scroll_until_stable(driver, "devpost")
 
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.hackathons-container"))
         )
-        container = driver.find_element(By.CSS_SELECTOR, "div.hackathons-container")
-        tiles = container.find_elements(By.CSS_SELECTOR, "a.tile-anchor")
-        logger.info(f"Found {len(tiles)} hackathons.")
-
-        hackathon_links = []
-        for tile in tiles:
-            try:
-                if "View winners" in tile.text:
-                    href = tile.get_attribute("href")
-                    name = tile.find_element(By.CSS_SELECTOR, "h3").text.strip()
-                    hackathon_links.append((name, href))
-                    logger.info(f"✓ Hackathon with winners: {name}")
-            except Exception as e:
-                logger.warning(f"Tile parsing failed: {e}")
-
-        for hackathon_name, hackathon_url in hackathon_links:
-            try:
-                logger.info(f"Opening hackathon: {hackathon_name}")
-                driver.get(hackathon_url)
-                time.sleep(3)
-
-                try:
-                    winner_button = driver.find_element(By.XPATH, "//a[contains(text(), 'View the winners')]")
-                    project_gallery_url = winner_button.get_attribute("href")
-                except:
-                    logger.warning(f"No 'View the winners' button in: {hackathon_name}")
-                    continue
-
-                driver.get(project_gallery_url)
-                time.sleep(3)
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                items = soup.select("div.gallery-item")
-                logger.info(f"{hackathon_name}: Found {len(items)} gallery items")
-
-                for item in items:
-                    if item.select_one("aside.entry-badge img.winner"):
-                        title_el = item.select_one("h5")
-                        link_el = item.select_one("a.block-wrapper-link")
-                        if title_el and link_el:
-                            title = title_el.text.strip()
-                            link = link_el["href"]
-                            winners.append(DevpostWinner(
-                                title=title,
-                                link=link,
-                                hackathon=hackathon_name,
-                                fetched_at=datetime.utcnow()
-                            ))
-                            logger.info(f"🏆 {title}")
-            except Exception as e:
-                logger.warning(f"Failed scraping {hackathon_name}: {e}")
+        # One page_source read instead of several WebDriver calls per tile
+        tile_count, hackathon_links = parse_hackathon_tiles(driver.page_source, url)
+        logger.info(f"Found {tile_count} hackathons.")
+        for name, _ in hackathon_links:
+            logger.info(f"✓ Hackathon with winners: {name}")
     finally:
-        driver.quit()
+        release_driver(driver)
+
+    # Winners of an ended hackathon never change, so skip ones already harvested
+    pending_links = [(name, href) for name, href in hackathon_links if not hackathon_is_processed(href)]
+    logger.info(f"{len(hackathon_links) - len(pending_links)} hackathons already processed, "
+                f"{len(pending_links)} to scrape.")
+
+    # Each hackathon -> gallery chain is an independent unit of work
+    results = map_concurrently(
+        harvest_hackathon,
+        pending_links,
+        workers=DEVPOST["workers"],
+        url_of=lambda hackathon: hackathon[1],
+        max_per_host=DEVPOST["max_per_host"],
+        retries=DEVPOST["retries"],
+        timeout=DEVPOST["unit_timeout"],
+    )
+    for (hackathon_name, hackathon_url), result in zip(pending_links, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed scraping {hackathon_name}: {result}")
+            continue
+        # Only hackathons with parsed winners go to the ledger, so an empty
+        # or unparsable gallery is tried again on the next run
+        if not result:
+            continue
+        winners.extend(result)
+        harvested.append((hackathon_name, hackathon_url, len(result)))
 
+    HACKATHON_TILE.log_summary(logger)
+    GALLERY_ITEM.log_summary(logger)
     logger.info(f"✅ Total winners scraped: {len(winners)}")
-    return winners
+    return winners, harvested
 
 
 @task
@@ -153,15 +141,7 @@ def store_devpost_winners(winners):
         return []
 
     headers = ["title", "link", "hackathon", "fetched_at"]
-    ws = get_worksheet("devpost")
-    existing_titles = set(row['title'].strip().lower() for row in ws.get_all_records() if row.get('title'))
-
-    unique_winners = []
-    for w in winners:
-        if w.title.strip().lower() in existing_titles:
-            logger.info(f"⏩ Skipping duplicate title: {w.title}")
-            continue
-        unique_winners.append(w)
+    unique_winners, index = filter_unseen("devpost", winners, lambda w: w.title, "title", headers)
 
     rows = []
     for w in unique_winners:
@@ -173,8 +153,9 @@ def store_devpost_winners(winners):
         logger.info("🟡 No new unique Devpost winners to insert.")
         return []
 
-    write_rows("devpost", rows, headers)
-    logger.info(f"✅ {len(rows)} unique Devpost winners written to Google Sheets.")
+    written_range = write_rows("devpost", rows, headers)
+    mark_seen(index, unique_winners, lambda w: w.title, written_range)
+    logger.info(f"✅ {len(rows)} unique Devpost winners written to Google Sheets ({written_range}).")
     return unique_winners
 
 
@@ -184,20 +165,35 @@ def notify_slack_if_available(projects):
         logger.info("ℹ️ No new winners to notify.")
         return
 
-    if not notify_slack:
+    if not notify_slack_digest:
         logger.warning("⚠️ Slack notifier not available.")
         return
 
+    messages = []
     for project in projects:
         message = f":trophy: New Devpost winner: *{project.title}* from *{project.hackathon}*\n<{project.link}>"
-        notify_slack.fn(message)
-        logger.info(f"📨 Notified: {project.title}")
+        messages.append(message)
+
+    notify_slack_digest.fn(f"{len(projects)} new Devpost winners", messages)
+
+
+@task
+def record_processed_hackathons(harvested):
+    """Add harvested hackathons to the ledger once their winners are stored"""
+    for hackathon_name, hackathon_url, winner_count in harvested:
+        set_state("devpost_hackathons", hackathon_url, {
+            "name": hackathon_name,
+            "winners": winner_count,
+            "processed_at": time.time(),
+        })
+    logger.info(f"📒 {len(harvested)} hackathons added to the processed ledger.")
 
 
 @flow(name="Devpost Winners Flow")
 def run_devpost_flow():
-    winners = fetch_devpost_blockchain_winners()
+    winners, harvested = fetch_devpost_blockchain_winners()
     stored = store_devpost_winners(winners)
+    record_processed_hackathons(harvested)
     notify_slack_if_available(stored)
     logger.info(f"🎯 Flow complete. {len(stored)} winners processed.")
 
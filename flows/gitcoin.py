@@ -1,142 +1,49 @@
 import logging
-import time
 from datetime import datetime
-from bs4 import BeautifulSoup
 import sys
 import os
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-
 from prefect import flow, task
 
-# Only import ChromeDriverManager for local development
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import GitcoinCheckerProject
-from google_sheets import get_worksheet, write_rows
+from google_sheets import write_rows
+from dedup_index import filter_unseen, mark_seen
+from http_fetch import fetch_html
+from parsers.gitcoin import CARD_SELECTOR, PROJECT_CARD, parse_projects
 
 
 try:
-    from tasks.notify import notify_slack
+    from tasks.notify import notify_slack_digest
 except ImportError:
-    notify_slack = None
+    notify_slack_digest = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_chrome_driver():
-    """Create a Chrome WebDriver instance with proper configuration"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Check if we're in GitHub Actions or similar CI environment
-    if os.getenv('GITHUB_ACTIONS') == 'true' or os.path.exists('/usr/local/bin/chromedriver'):
-        # Use system ChromeDriver in CI environments
-        logger.info("Using system ChromeDriver")
-        service = Service('/usr/local/bin/chromedriver')
-    elif USE_WEBDRIVER_MANAGER:
-        # Use ChromeDriverManager for local development
-        logger.info("Using ChromeDriverManager")
-        service = Service(ChromeDriverManager().install())
-    else:
-        # Fallback to default ChromeDriver path
-        logger.info("Using default ChromeDriver path")
-        service = Service()
-    
-    return webdriver.Chrome(service=service, options=chrome_options)
-
 @task
 def fetch_gitcoin_checker_projects():
     url = "https://checker.gitcoin.co/public/projects/list"
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    driver = create_chrome_driver()
     projects = []
+    PROJECT_CARD.reset()
 
     try:
         logger.info(f"Opening Gitcoin Checker URL: {url}")
-        driver.get(url)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.container.py-3"))
-        )
-        time.sleep(3)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        project_cards = soup.select("div.container.py-3 > div.mb-5.d-flex")
-        logger.info(f"Found {len(project_cards)} project cards.")
+        page = fetch_html(url, CARD_SELECTOR, "gitcoin")
+        card_count, parsed_projects = parse_projects(page.document)
+        logger.info(f"Found {card_count} project cards via {page.path}.")
 
-        for card in project_cards:
+        for parsed in parsed_projects:
             try:
-                name_element = card.select_one('a.text-primary')
-                name = name_element.text.strip() if name_element else "Unknown Project"
-                project_url = name_element['href'] if name_element and name_element.has_attr('href') else ""
-                if project_url and not project_url.startswith("http"):
-                    project_url = "https://checker.gitcoin.co" + project_url
-
-                description = card.select_one('div.text-xs')
-                description = description.text.strip() if description else ""
-
-                img_element = card.select_one('img')
-                image_url = img_element['src'] if img_element and img_element.has_attr('src') else ""
-
-                website, twitter, github = "", "", ""
-                for link_element in card.select('div.small.d-flex a[target="_blank"]'):
-                    href = link_element['href']
-                    svg = str(link_element.select_one('svg'))
-                    if 'bi-globe' in svg:
-                        website = href
-                    elif 'bi-twitter' in svg:
-                        twitter = href
-                    elif 'bi-github' in svg:
-                        github = href
-
-                created_at_element = card.select_one('div.text-muted.font-italic.small')
-                created_at_text = created_at_element.text.strip() if created_at_element else ""
-
-                project = GitcoinCheckerProject(
-                    name=name,
-                    description=description,
-                    project_url=project_url,
-                    website=website,
-                    twitter=twitter,
-                    github=github,
-                    image_url=image_url,
-                    created_at_text=created_at_text,
-                    fetched_at=datetime.utcnow()
-                )
-                projects.append(project)
-                logger.info(f"✓ Scraped project: {name}")
-
+                projects.append(GitcoinCheckerProject(**parsed, fetched_at=datetime.utcnow()))
+                logger.info(f"✓ Scraped project: {parsed['name']}")
             except Exception as e:
                 logger.warning(f"Failed to parse a project card: {e}")
 
     except Exception as e:
         logger.error(f"Error fetching projects: {e}")
-    finally:
-        driver.quit()
 
+    PROJECT_CARD.log_summary(logger)
     logger.info(f"✅ Total projects scraped: {len(projects)}")
     return projects
 
@@ -151,15 +58,7 @@ def store_gitcoin_checker_projects(projects):
         "github", "image_url", "created_at_text", "fetched_at"
     ]
 
-    ws = get_worksheet("gitcoin")
-    existing_names = set(row['name'].strip().lower() for row in ws.get_all_records() if row.get('name'))
-
-    unique_projects = []
-    for p in projects:
-        if p.name.strip().lower() in existing_names:
-            logger.info(f"⏩ Skipping duplicate project name: {p.name}")
-            continue
-        unique_projects.append(p)
+    unique_projects, index = filter_unseen("gitcoin", projects, lambda p: p.name, "name", headers)
 
     rows = []
     for p in unique_projects:
@@ -171,8 +70,9 @@ def store_gitcoin_checker_projects(projects):
         logger.info("🟡 No new unique Gitcoin Checker projects to insert.")
         return []
 
-    write_rows("gitcoin", rows, headers)
-    logger.info(f"✅ {len(rows)} Gitcoin Checker projects written to Google Sheets.")
+    written_range = write_rows("gitcoin", rows, headers)
+    mark_seen(index, unique_projects, lambda p: p.name, written_range)
+    logger.info(f"✅ {len(rows)} Gitcoin Checker projects written to Google Sheets ({written_range}).")
     return unique_projects
 
 @task
@@ -181,10 +81,11 @@ def notify_new_gitcoin_checker_projects(projects):
         logger.info("ℹ️ No new projects to notify.")
         return
 
-    if not notify_slack:
+    if not notify_slack_digest:
         logger.warning("⚠️ Slack notifier not available.")
         return
 
+    messages = []
     for project in projects:
         message = f":large_green_circle: New Gitcoin Checker project: *{project.name}*\n<{project.project_url}>"
         if project.description:
@@ -195,9 +96,9 @@ def notify_new_gitcoin_checker_projects(projects):
             message += f"\n:bird: {project.twitter}"
         if project.github:
             message += f"\n:octocat: {project.github}"
+        messages.append(message)
 
-        notify_slack.fn(message)
-        logger.info(f"📨 Notified: {project.name}")
+    notify_slack_digest.fn(f"{len(projects)} new Gitcoin Checker projects", messages)
 
 
 @flow(name="Gitcoin Checker Projects Flow")
@@ -6,21 +6,19 @@ import re
 from prefect import flow, task
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models import Project
+from models import ProjectRecord
+from gspread.utils import rowcol_to_a1
 from google_sheets import get_worksheet, write_rows
+from dedup_index import filter_unseen, mark_seen
+from local_store import get_state, set_state
+from leaderboard import update_leaderboard
+from entity_resolution import EntityIndex, resolve_entities
+from scoring import SOURCE_SCORE, ScoringEngine
+from config import MERGE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-SOURCE_SCORE = {
-    'ETHGlobal': 3,
-    'Devpost': 2,
-    'GitcoinChecker': 4,
-    'AllianceDAO': 3,
-    'Alliance': 5,
-    'Cryptorank': 5
-}
-
 def sanitize_document_id(text):
     if not text:
         return f"doc_{int(datetime.utcnow().timestamp() * 1000)}"
@@ -33,165 +31,268 @@ def sanitize_document_id(text):
     return sanitized or f"doc_{int(datetime.utcnow().timestamp() * 1000)}"
 
 
+def read_new_records(flow_name, full_rebuild=False):
+    """
+    Read the rows of a source sheet added since the last merge.
+
+    The watermark is the last sheet row already merged (row 1 is the header).
+    Data ends at the last row recorded by ``write_rows``; sheets not written
+    since that was recorded are read up to their allocated ``row_count``.
+    With ``full_rebuild`` every row is read again.
+
+    Returns:
+        tuple: (records as dicts keyed by header, last row read)
+    """
+    watermark = 1 if full_rebuild else get_state("merge_watermarks", flow_name, 1)
+    ws = get_worksheet(flow_name)
+    end_row = get_state("sheet_end_rows", flow_name) or ws.row_count
+    if watermark >= end_row:
+        logger.info(f"📥 {flow_name}: no rows since row {watermark}")
+        return [], watermark
+    headers = ws.row_values(1)
+    # Open-ended ranges past the grid (e.g. "A2:ZZ" on a 26-column sheet) are rejected
+    values = ws.get_values(f"A{watermark + 1}:{rowcol_to_a1(end_row, ws.col_count)}")
+    records = [dict(zip(headers, row + [""] * (len(headers) - len(row)))) for row in values]
+    logger.info(f"📥 {flow_name}: {len(records)} rows since row {watermark}")
+    return records, watermark + len(values)
+
+
 @task
-def merge_devpost():
-    ws = get_worksheet("devpost")
-    data = ws.get_all_records()
+def merge_devpost(full_rebuild=False):
+    data, watermark = read_new_records("devpost", full_rebuild)
     projects = []
+    now = datetime.utcnow()
     for row in data:
         title = row.get("title")
         if not title:
             continue
-        try:
-            project = Project(
-                id="devpost_" + sanitize_document_id(str(title).lower()),
-                name=str(title),
-                link=row.get('link', ''),
-                source="Devpost",
-                hackathon=row.get('hackathon', ''),
-                score=SOURCE_SCORE['Devpost'],
-                last_seen=datetime.utcnow()
-            )
-            projects.append(project)
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping Devpost row: {e} | row: {row}")
-    return projects
+        project = ProjectRecord(
+            id="devpost_" + sanitize_document_id(str(title).lower()),
+            name=str(title),
+            link=row.get('link', ''),
+            source="Devpost",
+            hackathon=row.get('hackathon', ''),
+            score=SOURCE_SCORE['Devpost'],
+            last_seen=now
+        )
+        projects.append(project)
+    return projects, watermark
 
 
 @task
-def merge_gitcoin():
-    ws = get_worksheet("gitcoin")
-    data = ws.get_all_records()
+def merge_gitcoin(full_rebuild=False):
+    data, watermark = read_new_records("gitcoin", full_rebuild)
     projects = []
+    now = datetime.utcnow()
     for row in data:
         name = row.get("name")
         if not name:
             continue
-        try:
-            project = Project(
-                id="gitcoinchecker_" + sanitize_document_id(str(name).lower()),
-                name=str(name),
-                link=row.get('website') or row.get('github') or row.get('project_url', ''),
-                source="GitcoinChecker",
-                description=row.get('description', ''),
-                score=SOURCE_SCORE['GitcoinChecker'],
-                last_seen=datetime.utcnow()
-            )
-            projects.append(project)
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping Gitcoin row: {e} | row: {row}")
-    return projects
+        project = ProjectRecord(
+            id="gitcoinchecker_" + sanitize_document_id(str(name).lower()),
+            name=str(name),
+            link=row.get('website') or row.get('github') or row.get('project_url', ''),
+            source="GitcoinChecker",
+            description=row.get('description', ''),
+            links=[v for v in (row.get('website'), row.get('twitter'), row.get('github')) if v],
+            score=SOURCE_SCORE['GitcoinChecker'],
+            last_seen=now
+        )
+        projects.append(project)
+    return projects, watermark
 
 
 @task
-def merge_ethglobal():
-    ws = get_worksheet("ethglobal")
-    data = ws.get_all_records()
+def merge_ethglobal(full_rebuild=False):
+    data, watermark = read_new_records("ethglobal", full_rebuild)
     projects = []
+    now = datetime.utcnow()
     for row in data:
         title = row.get("title")
         if not title:
             continue
-        try:
-            project = Project(
-                id="ethglobal_" + sanitize_document_id(str(title).lower()),
-                name=str(title),
-                link=row.get('link', ''),
-                source="ETHGlobal",
-                description=row.get('description', ''),
-                score=SOURCE_SCORE['ETHGlobal'],
-                last_seen=datetime.utcnow()
-            )
-            projects.append(project)
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping ETHGlobal row: {e} | row: {row}")
-    return projects
+        project = ProjectRecord(
+            id="ethglobal_" + sanitize_document_id(str(title).lower()),
+            name=str(title),
+            link=row.get('link', ''),
+            source="ETHGlobal",
+            description=row.get('description', ''),
+            score=SOURCE_SCORE['ETHGlobal'],
+            last_seen=now
+        )
+        projects.append(project)
+    return projects, watermark
 
 
 @task
-def merge_alliance():
-    ws = get_worksheet("alliance")
-    data = ws.get_all_records()
+def merge_alliance(full_rebuild=False):
+    data, watermark = read_new_records("alliance", full_rebuild)
     projects = []
+    now = datetime.utcnow()
     for row in data:
         name = row.get("name")
         if not name:
             continue
-        try:
-            project = Project(
-                id="alliance_" + sanitize_document_id(str(name).lower()),
-                name=str(name),
-                link=row.get('link', ''),
-                source="Alliance",
-                description=row.get('description', ''),
-                categories=row.get('categories', '').split(", ") if row.get('categories') else [],
-                score=SOURCE_SCORE['Alliance'],
-                last_seen=datetime.utcnow()
-            )
-            projects.append(project)
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping Alliance row: {e} | row: {row}")
-    return projects
+        project = ProjectRecord(
+            id="alliance_" + sanitize_document_id(str(name).lower()),
+            name=str(name),
+            link=row.get('link', ''),
+            source="Alliance",
+            description=row.get('description', ''),
+            categories=row.get('categories', '').split(", ") if row.get('categories') else [],
+            score=SOURCE_SCORE['Alliance'],
+            last_seen=now
+        )
+        projects.append(project)
+    return projects, watermark
+
+
+def combine_projects(entity_id, members):
+    """Fold the records of one entity into a single canonical project"""
+    lead = max(members, key=lambda p: p.score)
+    categories = []
+    for p in members:
+        categories.extend(c for c in (p.categories or []) if c not in categories)
+    links = []
+    for p in members:
+        links.extend(l for l in [p.link] + (p.links or []) if l and l != lead.link and l not in links)
+    return ProjectRecord(
+        id=entity_id,
+        name=lead.name,
+        link=lead.link,
+        source=", ".join(dict.fromkeys(p.source for p in members)),
+        description=max((p.description or "" for p in members), key=len),
+        categories=categories or None,
+        hackathon=next((p.hackathon for p in members if p.hackathon), None),
+        links=links or None,
+        funding_type=next((p.funding_type for p in members if p.funding_type), None),
+        funding_amount=next((p.funding_amount for p in members if p.funding_amount), None),
+        score=lead.score,
+        last_seen=max(p.last_seen for p in members),
+    )
+
+
+@task
+def resolve_project_entities(projects):
+    """Collapse records of the same project from different sources into one canonical project"""
+    if not projects:
+        return []
+    entities, stats = resolve_entities(
+        projects,
+        name_of=lambda p: p.name,
+        urls_of=lambda p: [p.link] + (p.links or []),
+        id_of=lambda p: p.id,
+        index=EntityIndex(),
+    )
+    logger.info(f"🧩 Resolved {stats.records} records into {stats.entities} projects "
+                f"({stats.known_entities} already known, {stats.comparisons} name comparisons, "
+                f"{stats.skipped_blocks} oversized blocks skipped, {stats.shared_keys} shared links ignored)")
+    for entity_id, members in entities:
+        if entity_id in stats.joined:
+            for p in members:
+                if p.id != entity_id:
+                    logger.info(f"🔗 '{p.name}' ({p.source}) joined existing project {entity_id}")
+    return [combine_projects(entity_id, members) for entity_id, members in entities]
+
+
+@task
+def score_projects(projects):
+    """
+    Rescore the merged projects, taking earlier merges of the same projects into account.
+
+    Returns:
+        tuple: (projects, the ScoringEngine they were scored with, or None)
+    """
+    if not projects:
+        return projects, None
+    engine = ScoringEngine.load()
+    for project, score in zip(projects, engine.update(projects)):
+        project.score = round(float(score), 2)
+        project.source = engine.sources_of(project.id) or project.source
+    logger.info(f"📈 Scored {len(projects)} projects ({len(engine)} known)")
+    return projects, engine
 
 
 @task
 def store_merged_projects(projects):
     headers = ["id", "name", "link", "source", "description", "categories", "hackathon", "score", "last_seen"]
-    ws = get_worksheet("merge")
-    existing_ids = set(row['id'] for row in ws.get_all_records())
+    new_projects, index = filter_unseen("merge", projects, lambda p: p.id, "id", headers, normalize=str)
 
-    new_rows = []
-    for p in projects:
-        if p.id in existing_ids:
-            logger.info(f"⏩ Skipping duplicate ID: {p.id}")
-            continue
-        row = p.dict()
-        row["categories"] = ", ".join(row.get("categories", [])) if isinstance(row.get("categories"), list) else ""
-        row["last_seen"] = row["last_seen"].isoformat()
-        new_rows.append(row)
+    if len(new_projects) < len(projects):
+        logger.info(f"⏭️ {len(projects) - len(new_projects)} merged projects are already in the sheet")
+    new_rows = [p.to_row() for p in new_projects]
 
     if new_rows:
-        write_rows("merge", new_rows, headers)
+        written_range = write_rows("merge", new_rows, headers)
+        mark_seen(index, new_projects, lambda p: p.id, written_range, normalize=str)
     logger.info(f"✅ {len(new_rows)} new projects merged.")
     return len(new_rows)
 
 
 @task
-def merge_cryptorank():
-    ws = get_worksheet("cryptorank")
-    data = ws.get_all_records()
+def merge_cryptorank(full_rebuild=False):
+    data, watermark = read_new_records("cryptorank", full_rebuild)
     projects = []
+    now = datetime.utcnow()
     for row in data:
         name = row.get("name")
         if not name:
             continue
-        try:
-            project = Project(
-                id="cryptorank_" + sanitize_document_id(str(name).lower()),
-                name=name,
-                link=row.get("link", ""),
-                source="Cryptorank",
-                description=row.get("description", ""),
-                score=SOURCE_SCORE["Cryptorank"],
-                last_seen=datetime.utcnow()
-            )
-            projects.append(project)
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping Cryptorank row: {e} | row: {row}")
-    return projects
+        project = ProjectRecord(
+            id="cryptorank_" + sanitize_document_id(str(name).lower()),
+            name=str(name),
+            link=row.get("link", ""),
+            source="Cryptorank",
+            description=row.get("description", ""),
+            links=[v for v in (row.get("website"), row.get("twitter"), row.get("linkedin")) if v],
+            funding_type=row.get("funding_type") or None,
+            funding_amount=row.get("funding_amount") or None,
+            score=SOURCE_SCORE["Cryptorank"],
+            last_seen=now
+        )
+        projects.append(project)
+    return projects, watermark
+
+@task
+def save_watermarks(watermarks):
+    """Advance the per-source watermarks once the merged rows are stored"""
+    for flow_name, watermark in watermarks.items():
+        set_state("merge_watermarks", flow_name, watermark)
+    logger.info(f"🔖 Merge watermarks: {watermarks}")
+
+@task
+def update_top_projects(projects, engine):
+    """Keep the local leaderboard read by the daily digest up to date"""
+    if not projects:
+        return 0
+    return update_leaderboard(projects, engine)
+
 
 @flow(name="Merge All Sources Flow")
-def run_merge_flow():
-    devpost = merge_devpost()
-    gitcoin = merge_gitcoin()
-    ethglobal = merge_ethglobal()
-    alliance = merge_alliance()
-    cryptorank = merge_cryptorank()
-
-    all_projects = devpost + gitcoin + ethglobal + alliance + cryptorank
+def run_merge_flow(full_rebuild=None):
+    """Merge rows added to the source sheets since the last run; full_rebuild re-reads everything"""
+    if full_rebuild is None:
+        full_rebuild = MERGE["full_rebuild"]
+
+    devpost, devpost_wm = merge_devpost(full_rebuild)
+    gitcoin, gitcoin_wm = merge_gitcoin(full_rebuild)
+    ethglobal, ethglobal_wm = merge_ethglobal(full_rebuild)
+    alliance, alliance_wm = merge_alliance(full_rebuild)
+    cryptorank, cryptorank_wm = merge_cryptorank(full_rebuild)
+
+    all_projects = resolve_project_entities(devpost + gitcoin + ethglobal + alliance + cryptorank)
+    all_projects, engine = score_projects(all_projects)
     count = store_merged_projects(all_projects)
+    update_top_projects(all_projects, engine)
+    save_watermarks({
+        "devpost": devpost_wm,
+        "gitcoin": gitcoin_wm,
+        "ethglobal": ethglobal_wm,
+        "alliance": alliance_wm,
+        "cryptorank": cryptorank_wm,
+    })
     logger.info(f"🎯 Merge complete: {count} new projects stored.")
 
 
 if __name__ == "__main__":
-    run_merge_flow()
+    run_merge_flow(full_rebuild="--full" in sys.argv)
@@ -0,0 +1,211 @@
+"""
+Run the source flows concurrently, then the merge flow.
+
+Each source flow runs in its own Python process. Prefect 2 flows called from
+several threads of one process race to start the ephemeral API when
+PREFECT_API_URL is not set (as in CI) and can hang or crash, so the threads
+here only wait on child processes. The ephemeral API's database is migrated
+once in this process before the children start, so they never migrate it
+concurrently.
+
+    python -m flows.run_all cryptorank,devpost
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import subprocess
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from config import BROWSER_POOL, ORCHESTRATOR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# Prefect lowers the root logger to WARNING when a flow module is imported
+logger.setLevel(logging.INFO)
+
+# Independent source flows, as (module, flow function)
+SOURCE_FLOWS = {
+    "cryptorank": ("flows.cryptorank", "run_cryptorank_flow"),
+    "ethglobal": ("flows.ethglobal", "run_ethglobal_flow"),
+    "alliance": ("flows.alliance", "run_alliance_flow"),
+    "gitcoin": ("flows.gitcoin", "run_gitcoin_checker_flow"),
+    "devpost": ("flows.devpost", "run_devpost_flow"),
+}
+
+# Runs once every selected source has finished
+MERGE_FLOW = ("flows.merge", "run_merge_flow")
+
+# Run only when asked for by name, one after another, after the merge
+STANDALONE_FLOWS = {
+    "crunchbase": ("flows.crunchbase", "run_flow"),
+    "digest": ("flows.daily_digest", "run_daily_digest"),
+}
+
+# Seconds spent importing each flow module, for startup reporting
+IMPORT_TIMES = {}
+
+
+def load_flow(module_name, function_name):
+    if module_name not in sys.modules:
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        IMPORT_TIMES[module_name] = time.perf_counter() - started
+    else:
+        module = sys.modules[module_name]
+    return getattr(module, function_name)
+
+
+def prepare_prefect_api():
+    """
+    Start Prefect's ephemeral API once, on this thread, so its database is
+    migrated before any flow runs. Nothing to do when a server is configured.
+    """
+    from prefect.client.orchestration import get_client
+    from prefect.settings import PREFECT_API_URL
+
+    if PREFECT_API_URL.value():
+        return
+
+    async def hello():
+        async with get_client() as client:
+            await client.hello()
+
+    started = time.monotonic()
+    asyncio.run(hello())
+    logger.info(f"Prefect ephemeral API ready in {time.monotonic() - started:.1f}s")
+
+
+def child_environment(concurrency):
+    """Environment for source processes, splitting the browser budget between them."""
+    env = dict(os.environ)
+    if not BROWSER_POOL["max_drivers"]:
+        from browser_pool import default_max_drivers
+        env["BROWSER_POOL_MAX_DRIVERS"] = str(max(1, default_max_drivers() // concurrency))
+    return env
+
+
+def source_command(flow_spec):
+    """Command line of the child process that runs one (module, flow function)."""
+    return [sys.executable, "-m", "flows.run_all", "--flow", ":".join(flow_spec)]
+
+
+def run_source(name, flow_spec, env=None):
+    """Run one source flow in a child process, returning (name, seconds, error)."""
+    started = time.monotonic()
+    try:
+        returncode = subprocess.run(source_command(flow_spec), cwd=ROOT, env=env).returncode
+        error = RuntimeError(f"exited with status {returncode}") if returncode else None
+    except Exception as e:
+        error = e
+    return name, time.monotonic() - started, error
+
+
+def run_all(sources=None, max_concurrency=None, merge=True, registry=None):
+    """
+    Run the source flows concurrently, each in its own process, then the
+    merge flow in this one.
+
+    Args:
+        sources: source names to run (None for all of ``registry``)
+        max_concurrency: how many source flows may run at once
+        merge: run the merge flow after the sources finish
+        registry: source name -> (module, flow function); SOURCE_FLOWS by default
+
+    Returns:
+        dict: seconds taken per flow, and the names of flows that failed
+    """
+    registry = SOURCE_FLOWS if registry is None else registry
+    sources = list(registry if sources is None else sources)
+    unknown = [s for s in sources if s not in registry]
+    if unknown:
+        raise ValueError(f"Unknown source flows: {', '.join(unknown)}")
+
+    max_concurrency = max_concurrency or ORCHESTRATOR["max_concurrent_flows"]
+    started = time.monotonic()
+    timings, failed = {}, []
+
+    if sources or merge:
+        prepare_prefect_api()
+
+    logger.info(f"🚦 Running {len(sources)} source flows, up to {max_concurrency} at a time")
+    env = child_environment(min(max_concurrency, len(sources)) or 1) if sources else None
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(run_source, name, registry[name], env) for name in sources]
+        for future in as_completed(futures):
+            name, seconds, error = future.result()
+            timings[name] = seconds
+            if error:
+                failed.append(name)
+                logger.error(f"❌ {name} failed after {seconds:.1f}s: {error}")
+            else:
+                logger.info(f"✅ {name} finished in {seconds:.1f}s")
+
+    if merge:
+        merge_started = time.monotonic()
+        try:
+            load_flow(*MERGE_FLOW)()
+        except Exception as e:
+            failed.append("merge")
+            logger.error(f"❌ merge failed: {e}")
+        timings["merge"] = time.monotonic() - merge_started
+
+    deliver_pending_notifications()
+
+    total = time.monotonic() - started
+    slowest = max((timings[s] for s in sources), default=0.0)
+    logger.info(f"🎯 All flows complete in {total:.1f}s (slowest source {slowest:.1f}s, "
+                f"sum of sources {sum(timings[s] for s in sources):.1f}s)")
+    log_fetch_summaries()
+
+    return {"timings": timings, "failed": failed}
+
+
+def deliver_pending_notifications():
+    """Send Slack messages still in the outbox, including ones left by earlier runs."""
+    try:
+        from tasks.outbox import deliver_pending
+        deliver_pending()
+    except Exception as e:
+        logger.error(f"❌ Could not deliver pending notifications: {e}")
+
+
+def log_fetch_summaries():
+    if "page_waits" in sys.modules:
+        logger.info(f"Wait summary: {sys.modules['page_waits'].wait_summary()}")
+    if "http_fetch" in sys.modules:
+        logger.info(f"Fetch paths: {sys.modules['http_fetch'].fetch_summary()}")
+
+
+def run_single_flow(flow_spec):
+    """Entry point of a source process: run 'module:function' and report how it went."""
+    module_name, function_name = flow_spec.split(":")
+    try:
+        flow_function = load_flow(module_name, function_name)
+        # The parent never imports the source modules, so their cost is reported here
+        if module_name in IMPORT_TIMES:
+            logger.info(f"⏱️ {module_name} imported in {IMPORT_TIMES[module_name] * 1000:.0f}ms")
+        flow_function()
+        return 0
+    except Exception as e:
+        logger.error(f"❌ {module_name}.{function_name} failed: {e}")
+        return 1
+    finally:
+        log_fetch_summaries()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the source flows, then the merge flow.")
+    parser.add_argument("sources", nargs="?", help="comma-separated source flows (default: all)")
+    parser.add_argument("--flow", help="run a single 'module:function' flow in this process")
+    args = parser.parse_args()
+    if args.flow:
+        sys.exit(run_single_flow(args.flow))
+    result = run_all(args.sources.split(",") if args.sources else None)
+    sys.exit(1 if result["failed"] else 0)
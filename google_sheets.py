@@ -1,32 +1,103 @@
 import gspread
+import re
+import threading
 from oauth2client.service_account import ServiceAccountCredentials
 from typing import List, Dict, Any
 from config import GOOGLE_SHEETS_CREDENTIALS_PATH, SPREADSHEETS
+from local_store import delete_state, set_state
 from datetime import datetime
 
 scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 
+# Process-wide cache: one authorized client, plus spreadsheets and
+# worksheets keyed by sheet id / (sheet id, worksheet name)
+_cache_lock = threading.RLock()
+_client = None
+_spreadsheets = {}
+_worksheets = {}
+# Header row last seen per (sheet id, worksheet name)
+_headers = {}
+
+
 def get_client():
-    creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_SHEETS_CREDENTIALS_PATH, scope)
-    return gspread.authorize(creds)
+    """
+    Return the shared authorized client.
+
+    gspread converts the service account credentials to google-auth ones,
+    whose session refreshes the access token itself when it expires.
+    """
+    global _client
+    with _cache_lock:
+        if _client is None:
+            creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_SHEETS_CREDENTIALS_PATH, scope)
+            _client = gspread.authorize(creds)
+        return _client
+
+
+def get_spreadsheet(sheet_id: str):
+    with _cache_lock:
+        client = get_client()
+        if sheet_id not in _spreadsheets:
+            _spreadsheets[sheet_id] = client.open_by_key(sheet_id)
+        return _spreadsheets[sheet_id]
+
 
 def get_worksheet(flow_name: str):
     config = SPREADSHEETS[flow_name]
-    client = get_client()
-    sheet = client.open_by_key(config["sheet_id"])
-    return sheet.worksheet(config["worksheet_name"])
+    key = (config["sheet_id"], config["worksheet_name"])
+    with _cache_lock:
+        sheet = get_spreadsheet(config["sheet_id"])
+        if key not in _worksheets:
+            _worksheets[key] = sheet.worksheet(config["worksheet_name"])
+        return _worksheets[key]
+
+
+def _worksheet_key(flow_name: str):
+    config = SPREADSHEETS[flow_name]
+    return (config["sheet_id"], config["worksheet_name"])
+
+
+def ensure_headers(flow_name: str, headers: List[str]):
+    """
+    Make sure row 1 of the worksheet matches ``headers``.
+
+    The header row is read at most once per process; afterwards the cached
+    schema is trusted. A mismatching sheet is cleared and re-headed, as before,
+    and its merge watermark and last data row are reset.
+    """
+    key = _worksheet_key(flow_name)
+    with _cache_lock:
+        if _headers.get(key) == headers:
+            return
+        ws = get_worksheet(flow_name)
+        existing_headers = ws.row_values(1)
+        if existing_headers != headers:
+            ws.clear()
+            ws.append_row(headers)
+            # The merge flow reads this sheet from a row watermark; start it over
+            delete_state("merge_watermarks", flow_name)
+            set_state("sheet_end_rows", flow_name, 1)
+        _headers[key] = list(headers)
+
+
+def range_end_row(updated_range: str):
+    """Row number at the end of an A1 range such as 'Sheet1!A101:K110'."""
+    match = re.search(r"(\d+)$", updated_range or "")
+    return int(match.group(1)) if match else None
+
 
 def write_rows(flow_name: str, rows: List[Dict[str, Any]], headers: List[str]):
-    ws = get_worksheet(flow_name)
+    """
+    Append rows to a worksheet without reading its existing data.
 
-    # Read existing headers
-    existing_headers = ws.row_values(1)
-    if existing_headers != headers:
-        ws.clear()
-        ws.append_row(headers)
+    The last row written is kept in the local store so the merge flow knows
+    where the data ends; the sheet's ``row_count`` also counts empty rows.
 
-    existing_data = ws.get_all_values()
-    current_row_count = len(existing_data)
+    Returns:
+        str: the A1 range that was written (e.g. 'Sheet1!A101:K110'),
+        or None if there was nothing to write
+    """
+    ensure_headers(flow_name, headers)
 
     # Serialize datetimes to strings and align row order with headers
     def serialize(row):
@@ -34,8 +105,13 @@ def write_rows(flow_name: str, rows: List[Dict[str, Any]], headers: List[str]):
                 else row[h].isoformat() for h in headers]
 
     values = [serialize(row) for row in rows]
+    if not values:
+        return None
 
-    # Write values after current data
-    if values:
-        ws.append_rows(values)
-
+    # Sheets appends after the last row of the existing table
+    response = get_worksheet(flow_name).append_rows(values)
+    updated_range = (response or {}).get("updates", {}).get("updatedRange")
+    end_row = range_end_row(updated_range)
+    if end_row is not None:
+        set_state("sheet_end_rows", flow_name, end_row)
+    return updated_range
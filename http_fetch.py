@@ -0,0 +1,150 @@
+"""
+HTTP-first page fetching with Selenium as fallback.
+
+Server-rendered pages are fetched with a pooled keep-alive ``requests``
+session. Only when the raw HTML lacks the content a source needs (checked
+with a CSS selector) does the fetch escalate to a pooled headless browser.
+Every fetch records which path it took.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HTTP
+from parsers.document import Node, parse_document
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+@dataclass
+class FetchResult:
+    """HTML for a URL plus how it was obtained."""
+    url: str
+    html: str
+    document: Node
+    path: str  # "http" or "browser"
+    seconds: float
+    status: Optional[int] = None
+
+
+_session = None
+_session_lock = threading.Lock()
+_fetch_log = []
+_fetch_log_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(
+                total=HTTP["retries"],
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP["pool_connections"],
+                pool_maxsize=HTTP["pool_maxsize"],
+                max_retries=retry,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def _record(result):
+    with _fetch_log_lock:
+        _fetch_log.append((result.url, result.path, result.seconds))
+    logger.info(f"{'🌐' if result.path == 'http' else '🧭'} {result.path} {result.url} ({result.seconds:.2f}s)")
+    return result
+
+
+def fetch_http(url, timeout=None):
+    """Fetch a URL over the shared session. Returns (status, html)."""
+    response = get_session().get(url, timeout=timeout or HTTP["timeout"])
+    response.raise_for_status()
+    return response.status_code, response.text
+
+
+def fetch_with_browser(url, source, stage="page"):
+    """Load a URL in a pooled browser and return the rendered HTML."""
+    # Imported lazily so HTTP-only callers never pay for Selenium
+    from browser_pool import get_pool
+    from page_waits import wait_for_page
+
+    with get_pool().driver() as driver:
+        driver.get(url)
+        wait_for_page(driver, source, stage)
+        return driver.page_source
+
+
+def fetch_html(url, required_selector, source, stage="page", allow_browser=True):
+    """
+    Fetch a page over plain HTTP, escalating to the browser only if needed.
+
+    Args:
+        url: page to fetch
+        required_selector: CSS selector that must match in the HTML for the
+            HTTP response to be accepted, or a function of the parsed
+            document that returns something truthy when the content is there
+        source: source name, used for the browser wait profile
+        stage: wait profile stage used if the browser is needed
+        allow_browser: set False to never escalate
+
+    Returns:
+        FetchResult: the HTML, its parsed document and the path used
+    """
+    required = getattr(required_selector, "__name__", required_selector)
+    if callable(required_selector):
+        has_content = required_selector
+    else:
+        def has_content(document):
+            return document.select_one(required_selector)
+
+    started = time.monotonic()
+    try:
+        status, html = fetch_http(url)
+        document = parse_document(html)
+        if has_content(document):
+            return _record(FetchResult(url, html, document, "http", time.monotonic() - started, status))
+        logger.info(f"Required content '{required}' missing from raw HTML of {url}")
+    except Exception as e:
+        logger.info(f"HTTP fetch failed for {url}: {e}")
+
+    if not allow_browser:
+        raise LookupError(f"'{required}' not found in {url}")
+
+    html = fetch_with_browser(url, source, stage)
+    document = parse_document(html)
+    return _record(FetchResult(url, html, document, "browser", time.monotonic() - started))
+
+
+def fetch_summary():
+    """Count fetches per path, e.g. {"http": 12, "browser": 1}."""
+    with _fetch_log_lock:
+        summary = {}
+        for _, path, _ in _fetch_log:
+            summary[path] = summary.get(path, 0) + 1
+        return summary
@@ -0,0 +1,107 @@
+"""
+Local leaderboard of merged projects.
+
+The merge flow upserts every project it processes, and the daily digest
+reads the top K, optionally limited to a recent time window, without any
+remote query.
+
+``score`` holds the project's base score from the scoring engine, which only
+changes when the project is merged again. Recency is added when the
+leaderboard is read: rows are scanned in ``score`` order through the index
+and the scan stops once no remaining row could beat the K-th best even with
+the full recency boost.
+"""
+
+import heapq
+import logging
+import time
+
+from config import SCORING
+from local_store import ensure_schema, get_connection
+from scoring import recency_boost
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    link TEXT,
+    score REAL NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_score ON leaderboard (score DESC, first_seen DESC);
+"""
+
+COLUMNS = ["id", "name", "source", "link", "score", "first_seen", "last_seen"]
+
+
+def update_leaderboard(projects, engine):
+    """
+    Upsert merged projects into the leaderboard.
+
+    Base scores, first_seen and last_seen are taken from the scoring engine
+    the projects were just scored with.
+    """
+    ensure_schema(SCHEMA)
+    conn = get_connection()
+    rows = [(p.id, p.name, p.source, p.link, *engine.features_of(p.id)) for p in projects]
+    with conn:
+        conn.executemany(
+            "INSERT INTO leaderboard (id, name, source, link, score, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, source = excluded.source, "
+            "link = excluded.link, score = excluded.score, first_seen = excluded.first_seen, "
+            "last_seen = excluded.last_seen",
+            rows,
+        )
+    logger.info(f"🏅 Leaderboard updated with {len(rows)} projects")
+    return len(rows)
+
+
+def top_projects(k=5, window_days=None, now=None):
+    """
+    Return the top ``k`` projects by current score (base plus recency) as dicts.
+
+    Args:
+        k: number of projects
+        window_days: only include projects first seen within this many
+            days (e.g. 7 for "top this week"); None for all time
+    """
+    ensure_schema(SCHEMA)
+    if k <= 0:
+        return []
+    now = time.time() if now is None else now
+    query = f"SELECT {', '.join(COLUMNS)} FROM leaderboard"
+    params = []
+    if window_days:
+        query += " WHERE first_seen >= ?"
+        params.append(now - window_days * 86400)
+    cursor = get_connection().execute(query + " ORDER BY score DESC", params)
+
+    best = []  # min-heap of (current score, -position, row)
+    position = 0
+    while True:
+        rows = cursor.fetchmany(max(k, 64))
+        if not rows:
+            break
+        for row in rows:
+            base, last_seen = row[4], row[6]
+            if len(best) == k and base + SCORING["recency"] <= best[0][0]:
+                return _ranked(best)
+            entry = (base + float(recency_boost(last_seen, now)), -position, row)
+            position += 1
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+    return _ranked(best)
+
+
+def _ranked(best):
+    top = []
+    for score, _, row in sorted(best, reverse=True):
+        top.append(dict(zip(COLUMNS, row), score=round(score, 2)))
+    return top
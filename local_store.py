@@ -0,0 +1,91 @@
+"""
+Local SQLite state shared by the flows.
+
+Holds small pieces of state that would otherwise have to be re-derived from
+Google Sheets on every run. Each module that keeps state here declares its
+own tables and calls ``ensure_schema`` before using them.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from config import LOCAL_STATE_DB
+
+_local = threading.local()
+_schemas = set()
+_schema_lock = threading.Lock()
+
+
+def get_connection():
+    """Return this thread's connection to the local state database."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(LOCAL_STATE_DB)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(LOCAL_STATE_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
+
+def ensure_schema(schema: str):
+    """Create the tables in ``schema`` once per process."""
+    with _schema_lock:
+        if schema in _schemas:
+            return
+        conn = get_connection()
+        with conn:
+            conn.executescript(schema)
+        _schemas.add(schema)
+
+
+def chunked(items, size=500):
+    """Split a list into chunks, e.g. to stay under SQLite's variable limit."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+"""
+
+
+def get_state(namespace: str, key: str, default=None):
+    """Read a JSON value from the key/value state table."""
+    ensure_schema(STATE_SCHEMA)
+    row = get_connection().execute(
+        "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+    ).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def set_state(namespace: str, key: str, value):
+    """Write a JSON value to the key/value state table."""
+    ensure_schema(STATE_SCHEMA)
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value",
+            (namespace, key, json.dumps(value)),
+        )
+
+
+def delete_state(namespace: str, key: str = None):
+    """Remove one key, or a whole namespace when ``key`` is None."""
+    ensure_schema(STATE_SCHEMA)
+    conn = get_connection()
+    with conn:
+        if key is None:
+            conn.execute("DELETE FROM state WHERE namespace = ?", (namespace,))
+        else:
+            conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
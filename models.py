@@ -7,6 +7,7 @@ These models help with type checking and data validation, even though
 we're using Firebase/Firestore as our database.
 """
 
+from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
@@ -69,9 +70,48 @@ class Project(BaseModel):
     description: Optional[str] = None
     categories: Optional[List[str]] = None
     hackathon: Optional[str] = None
-    score: int = 0
+    links: Optional[List[str]] = None  # Other known URLs: website, GitHub, Twitter
+    funding_type: Optional[str] = None  # Cryptorank round type, e.g. Seed
+    funding_amount: Optional[str] = None
+    score: float = 0
     last_seen: datetime = Field(default_factory=datetime.utcnow)
 
+
+@dataclass(slots=True)
+class ProjectRecord:
+    """
+    Unvalidated, slotted counterpart of ``Project`` for trusted bulk data.
+
+    The merge flow reads rows we wrote ourselves, so it builds these instead
+    of validating every row.
+    """
+    id: str
+    name: str
+    link: str
+    source: str
+    description: Optional[str] = None
+    categories: Optional[List[str]] = None
+    hackathon: Optional[str] = None
+    links: Optional[List[str]] = None
+    funding_type: Optional[str] = None
+    funding_amount: Optional[str] = None
+    score: float = 0
+    last_seen: datetime = field(default_factory=datetime.utcnow)
+
+    def to_row(self):
+        """Sheet-ready dict: categories joined, last_seen as ISO text."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "link": self.link,
+            "source": self.source,
+            "description": self.description,
+            "categories": ", ".join(self.categories) if self.categories else "",
+            "hackathon": self.hackathon,
+            "score": self.score,
+            "last_seen": self.last_seen.isoformat(),
+        }
+
 class CryptorankProject:
     """Data model for Cryptorank project"""
     name: str
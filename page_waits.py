@@ -0,0 +1,209 @@
+"""
+Readiness-driven page waits.
+
+Replaces fixed ``time.sleep`` calls after navigation with a poll loop that
+returns as soon as the page is ready. What "ready" means is configured per
+source and stage in ``config.WAIT_PROFILES``; every configured condition must
+hold before the wait finishes:
+
+- ``selector``: at least one element matches this CSS selector
+- ``quiet_ms``: the DOM has not mutated for this long
+- ``network_idle_ms``: the document is loaded and no new resources have been
+  requested for this long
+- ``items`` + ``stable_ms``: the number of elements matching ``items`` is
+  non-zero and has not changed for this long
+
+Each poll is a single ``execute_script`` round trip. Every wait records how
+long it actually took so runs can be compared with the old fixed sleeps.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from config import WAIT_PROFILES
+
+logger = logging.getLogger(__name__)
+
+READINESS_JS = """
+const selector = arguments[0];
+const items = arguments[1];
+if (!window.__seedsObserver) {
+    window.__seedsLastMutation = performance.now();
+    window.__seedsObserver = new MutationObserver(() => {
+        window.__seedsLastMutation = performance.now();
+    });
+    window.__seedsObserver.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return {
+    found: selector ? document.querySelectorAll(selector).length : 0,
+    items: items ? document.querySelectorAll(items).length : 0,
+    quiet: performance.now() - window.__seedsLastMutation,
+    ready: document.readyState,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight);"
+
+
+@dataclass
+class WaitResult:
+    """Outcome of a single wait."""
+    source: str
+    stage: str
+    seconds: float
+    timed_out: bool
+    items: int = 0
+
+
+_wait_log = []
+_wait_log_lock = threading.Lock()
+
+
+def get_profile(source, stage="page", **overrides):
+    """Resolve the wait profile for a source/stage, applying overrides."""
+    profile = dict(WAIT_PROFILES["default"])
+    profile.update(WAIT_PROFILES.get(source, {}).get(stage, {}))
+    profile.update({k: v for k, v in overrides.items() if v is not None})
+    return profile
+
+
+def _record(result):
+    with _wait_log_lock:
+        _wait_log.append(result)
+    status = "timed out" if result.timed_out else "ready"
+    logger.info(f"⏱️ {result.source}/{result.stage} {status} after {result.seconds:.2f}s")
+    return result
+
+
+def _poll(driver, profile):
+    return driver.execute_script(READINESS_JS, profile.get("selector"), profile.get("items"))
+
+
+def _safe_poll(driver, profile):
+    """Poll readiness state, or {} while the page cannot answer (e.g. mid-navigation)."""
+    try:
+        return _poll(driver, profile) or {}
+    except Exception as e:
+        logger.debug(f"Readiness poll failed: {e}")
+        return {}
+
+
+def wait_for_page(driver, source, stage="page", **overrides):
+    """
+    Block until the current page satisfies the source's readiness profile.
+
+    Never raises on timeout; callers keep their own hard checks (for example
+    ``WebDriverWait``) where a missing element must abort the task.
+
+    Returns:
+        WaitResult: how long the wait took and whether it timed out
+    """
+    profile = get_profile(source, stage, **overrides)
+    started = time.monotonic()
+    deadline = started + profile["timeout"]
+
+    last_resources = None
+    resources_changed_at = started
+    last_items = None
+    items_changed_at = started
+    state = {}
+
+    while True:
+        now = time.monotonic()
+        state = _safe_poll(driver, profile)
+
+        if state.get("resources") != last_resources:
+            last_resources = state.get("resources")
+            resources_changed_at = now
+        if state.get("items") != last_items:
+            last_items = state.get("items")
+            items_changed_at = now
+
+        ready = bool(state)
+        if ready and profile.get("selector"):
+            ready = state["found"] > 0
+        if ready and profile.get("quiet_ms"):
+            ready = state["quiet"] >= profile["quiet_ms"]
+        if ready and profile.get("network_idle_ms"):
+            ready = (state["ready"] == "complete"
+                     and (now - resources_changed_at) * 1000 >= profile["network_idle_ms"])
+        if ready and profile.get("items") and profile.get("stable_ms"):
+            ready = state["items"] > 0 and (now - items_changed_at) * 1000 >= profile["stable_ms"]
+
+        if ready or now >= deadline:
+            return _record(WaitResult(
+                source=source,
+                stage=stage,
+                seconds=now - started,
+                timed_out=not ready,
+                items=state.get("items", 0),
+            ))
+        time.sleep(profile["poll"])
+
+
+def scroll_until_stable(driver, source, stage="scroll", **overrides):
+    """
+    Scroll an infinite-scroll listing until its item count stops growing.
+
+    After each scroll to the bottom, waits up to ``step_timeout`` for the
+    count of ``items`` to grow. Stops after ``max_scrolls`` or once
+    ``stale_scrolls`` consecutive scrolls load nothing new.
+
+    Returns:
+        WaitResult: total time spent scrolling and the final item count
+    """
+    profile = get_profile(source, stage, **overrides)
+    started = time.monotonic()
+    count = _safe_poll(driver, profile).get("items", 0)
+    stale = 0
+
+    for _ in range(profile["max_scrolls"]):
+        try:
+            driver.execute_script(SCROLL_JS)
+        except Exception as e:
+            logger.debug(f"Scroll failed: {e}")
+        step_deadline = time.monotonic() + profile["step_timeout"]
+        grown = False
+        while time.monotonic() < step_deadline:
+            time.sleep(profile["poll"])
+            current = _safe_poll(driver, profile).get("items", 0)
+            if current > count:
+                count = current
+                grown = True
+                break
+        if grown:
+            stale = 0
+            continue
+        stale += 1
+        if stale >= profile["stale_scrolls"]:
+            break
+
+    return _record(WaitResult(
+        source=source,
+        stage=stage,
+        seconds=time.monotonic() - started,
+        timed_out=False,
+        items=count,
+    ))
+
+
+def wait_summary(source: Optional[str] = None):
+    """Aggregate recorded waits by source/stage: count, total, mean, max and timeouts."""
+    with _wait_log_lock:
+        results = [r for r in _wait_log if source is None or r.source == source]
+    summary = {}
+    for r in results:
+        entry = summary.setdefault(f"{r.source}/{r.stage}", {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+        entry["count"] += 1
+        entry["total"] += r.seconds
+        entry["max"] = max(entry["max"], r.seconds)
+        entry["timeouts"] += int(r.timed_out)
+    for entry in summary.values():
+        entry["mean"] = entry["total"] / entry["count"]
+    return summary
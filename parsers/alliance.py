@@ -0,0 +1,50 @@
+"""
+Parser for the Alliance.xyz companies page.
+"""
+
+from parsers.document import parse_document
+from parsers.schema import Field, Schema
+
+CARD_SELECTOR = "div.chakra-card"
+BASE_URL = "https://alliance.xyz"
+
+
+def company_link(card):
+    # The link is the card's closest <a> ancestor, or one inside the card
+    link_element = card.closest("a") or card.select_one("a")
+    href = link_element.get("href") if link_element else None
+    if href is None:
+        return ""
+    return href if href.startswith("http") else BASE_URL + href
+
+
+COMPANY_CARD = Schema("alliance_company", [
+    Field("name", "h2.chakra-heading", required=True),
+    Field("link", extract=company_link),
+    Field("description", "p.chakra-text"),
+    Field("categories", "span.css-5lhp63", many=True, default=None),
+])
+
+
+def parse_company_card(card):
+    """Parse one company card into a dict of AllianceCompany fields, or None without a name."""
+    return COMPANY_CARD.extract(card)
+
+
+def parse_companies(markup):
+    """
+    Parse the companies page.
+
+    Returns:
+        tuple: (number of cards, company dicts)
+    """
+    cards = parse_document(markup).select(CARD_SELECTOR)
+    companies = []
+    for card in cards:
+        try:
+            company = parse_company_card(card)
+        except Exception:
+            continue
+        if company:
+            companies.append(company)
+    return len(cards), companies
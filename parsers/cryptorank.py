@@ -0,0 +1,99 @@
+"""
+Parsers for Cryptorank funding-round listings and project pages.
+"""
+
+from parsers.document import parse_document, text_of
+from parsers.schema import Field, Schema
+
+ROW_SELECTOR = (
+    "#root-container > div > div > section > div.sc-8b95f51a-0.sc-e739bd4e-0.hOzXIj.bxDZvl"
+    " > div.sc-7216fc15-0.lbdGOI > div > div.sc-a3162eff-0.glHxUG > table > tbody > tr"
+)
+CARD_SELECTOR = "table tbody tr"
+
+
+def detail_page_url(path):
+    # The detail page lives under /price/ rather than /ico/
+    return "https://cryptorank.io" + path.replace("/ico/", "/price/")
+
+
+def first_span_text(link):
+    return text_of(link.select_one("span"))
+
+
+FUNDING_ROW = Schema("cryptorank_round", [
+    Field("name", "td:first-child a.sc-bc80ddda-6 .name"),
+    Field("link", "td:first-child a.sc-bc80ddda-6", attribute="href", transform=detail_page_url, required=True),
+    Field("funding_amount", "td:nth-child(2) p"),
+    Field("funding_type", "td:nth-child(3) p", required=True),
+    Field("backers", "td:nth-child(4) a", extract=first_span_text, many=True),
+    Field("funding_date", "td:nth-child(5) p"),
+])
+
+
+def parse_funding_row(row, funding_types=None):
+    """
+    Parse one funding-rounds table row.
+
+    Returns:
+        dict: name, link (detail page), funding_amount, funding_type,
+        backers and funding_date; None if the row is not a project of one
+        of ``funding_types``
+    """
+    where = {"funding_type": lambda t: t in funding_types} if funding_types is not None else None
+    return FUNDING_ROW.extract(row, where)
+
+
+def parse_funding_rounds(markup, funding_types=None):
+    """
+    Parse a funding-rounds listing page.
+
+    Returns:
+        tuple: (number of table rows, round dicts for ``funding_types``);
+        rows that fail to parse are skipped
+    """
+    rows = parse_document(markup).select(ROW_SELECTOR)
+    rounds = []
+    for row in rows:
+        try:
+            parsed = parse_funding_row(row, funding_types)
+        except Exception:
+            continue
+        if parsed:
+            rounds.append(parsed)
+    return len(rows), rounds
+
+
+def social_link(link):
+    """(label, href) of a social link on a project page."""
+    label = text_of(link.select_one("span")).lower()
+    href = link.get("href", "")
+    return (label, href) if label and href else None
+
+
+PROJECT_PAGE = Schema("cryptorank_project", [
+    Field("description", "div.sc-933dbf49-0 div.sc-933dbf49-2 p", default=None),
+    Field("links", "div.links a.styles_coin_social_link_item__SAH_3", extract=social_link, many=True),
+    Field("backers", "div.investors a", extract=lambda link: text_of(link.select_one("p")), many=True),
+])
+
+
+def parse_project_details(markup):
+    """
+    Parse a project's detail page.
+
+    Returns:
+        dict: description, website, twitter, linkedin (None when absent)
+        and backers listed on the page
+    """
+    page = PROJECT_PAGE.extract(parse_document(markup))
+    details = {"description": page["description"], "website": None, "twitter": None, "linkedin": None,
+               "backers": page["backers"]}
+    for label, href in page["links"]:
+        if "website" in label:
+            details["website"] = href
+        elif any(x in label for x in ["x", "twitter"]):
+            details["twitter"] = href
+        elif "linkedin" in label:
+            details["linkedin"] = href
+    return details
@@ -0,0 +1,79 @@
+"""
+Parsers for Devpost hackathon listings, hackathon pages and winner galleries.
+"""
+
+from urllib.parse import urljoin
+
+from parsers.document import parse_document
+from parsers.schema import Field, Schema
+
+CARD_SELECTOR = "div.gallery-item"
+WINNER_BADGE_SELECTOR = "aside.entry-badge img.winner"
+TILE_SELECTOR = "div.hackathons-container a.tile-anchor"
+WINNERS_LINK_TEXT = "View the winners"
+
+
+HACKATHON_TILE = Schema("devpost_hackathon", [
+    Field("winners", extract=lambda tile: "View winners" in tile.text),
+    Field("name", "h3", required=True),
+    Field("href", attribute="href", required=True),
+])
+
+GALLERY_ITEM = Schema("devpost_project", [
+    # Read from the item itself so a non-winner is False, not a missing field
+    Field("winner", extract=lambda item: item.select_one(WINNER_BADGE_SELECTOR) is not None),
+    Field("title", "h5", required=True),
+    Field("link", "a.block-wrapper-link", attribute="href", required=True),
+])
+
+# Listings and galleries mix in entries without published winners; those
+# are counted as filtered, not as missing fields
+ONLY_WINNERS = {"winners": bool, "winner": bool}
+
+
+def parse_hackathon_tiles(markup, base_url="https://devpost.com"):
+    """
+    Parse the hackathon listing.
+
+    Returns:
+        tuple: (number of tiles, (name, url) of hackathons with published winners)
+    """
+    tiles = parse_document(markup).select(TILE_SELECTOR)
+    hackathons = []
+    for tile in tiles:
+        hackathon = HACKATHON_TILE.extract(tile, ONLY_WINNERS)
+        if hackathon:
+            hackathons.append((hackathon["name"], urljoin(base_url, hackathon["href"])))
+    return len(tiles), hackathons
+
+
+def find_winners_link(markup):
+    """The hackathon page's "View the winners" link element, or None."""
+    for link in parse_document(markup).select("a"):
+        if WINNERS_LINK_TEXT in link.text:
+            return link
+    return None
+
+
+def parse_winners_link(markup, hackathon_url):
+    """Absolute URL of a hackathon's "View the winners" gallery, or None."""
+    button = find_winners_link(markup)
+    if not button or not button.get("href"):
+        return None
+    return urljoin(hackathon_url, button.get("href"))
+
+
+def parse_gallery_winners(markup):
+    """
+    Parse a project gallery.
+
+    Returns:
+        tuple: (number of gallery items, dicts with title and link of winners)
+    """
+    items = parse_document(markup).select(CARD_SELECTOR)
+    winners = []
+    for item in items:
+        winner = GALLERY_ITEM.extract(item, ONLY_WINNERS)
+        if winner:
+            winners.append({"title": winner["title"], "link": winner["link"]})
+    return len(items), winners
@@ -0,0 +1,245 @@
+"""
+Parsed HTML documents for the parsers, behind swappable backends.
+
+The parsers only use the small node interface below (``select``,
+``select_one``, ``text``, ``get``, ``get_text`` and ``closest``), so the same
+extraction code runs on any of:
+
+* ``bs4``: BeautifulSoup with the pure-Python ``html.parser``;
+* ``lxml``: lxml's C parser with compiled cssselect selectors;
+* ``selectolax``: the lexbor engine, usually the fastest.
+
+``HTML_PARSER["backend"]`` picks one; ``auto`` uses the fastest installed.
+``tests/test_parser_compat.py`` checks that every installed backend extracts
+the same records from the fixture pages.
+"""
+
+import logging
+from functools import lru_cache
+
+from bs4 import BeautifulSoup
+
+from config import HTML_PARSER
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator
+except ImportError:  # optional backend
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional backend
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+# Fastest first; "auto" takes the first one installed
+PREFERENCE = ["selectolax", "lxml", "bs4"]
+
+
+def _join_text(pieces, separator, strip):
+    if strip:
+        pieces = [piece.strip() for piece in pieces]
+        pieces = [piece for piece in pieces if piece]
+    return separator.join(pieces)
+
+
+class Node:
+    """An element (or the whole document) of a parsed page."""
+
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select(self, css):
+        """Descendants matching a CSS selector, in document order."""
+        raise NotImplementedError
+
+    def select_one(self, css):
+        """First descendant matching a CSS selector, or None."""
+        found = self.select(css)
+        return found[0] if found else None
+
+    def get(self, name, default=None):
+        """Attribute value as a string ('' for valueless attributes)."""
+        raise NotImplementedError
+
+    def get_text(self, separator="", strip=False):
+        """Text of the subtree; with ``strip``, blank pieces are dropped."""
+        raise NotImplementedError
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    def closest(self, tag):
+        """Nearest ancestor with the given tag name, or None."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.el!r:.60}>"
+
+
+class SoupNode(Node):
+    __slots__ = ()
+
+    def select(self, css):
+        return [SoupNode(el) for el in self.el.select(css)]
+
+    def select_one(self, css):
+        el = self.el.select_one(css)
+        return SoupNode(el) if el is not None else None
+
+    def get(self, name, default=None):
+        value = self.el.get(name)
+        if value is None:
+            return default
+        # Multi-valued attributes such as class come back as lists
+        return " ".join(value) if isinstance(value, list) else value
+
+    def get_text(self, separator="", strip=False):
+        return self.el.get_text(separator, strip=strip)
+
+    def closest(self, tag):
+        el = self.el.find_parent(tag)
+        return SoupNode(el) if el is not None else None
+
+
+@lru_cache(maxsize=512)
+def _xpath(css):
+    """Compile a CSS selector once; it matches descendants only, like soupsieve."""
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::"))
+
+
+class LxmlNode(Node):
+    __slots__ = ()
+
+    def select(self, css):
+        return [LxmlNode(el) for el in _xpath(css)(self.el)]
+
+    def get(self, name, default=None):
+        return self.el.get(name, default)
+
+    def get_text(self, separator="", strip=False):
+        el = self.el.getroot() if isinstance(self.el, etree._ElementTree) else self.el
+        return _join_text(list(el.itertext()), separator, strip)
+
+    def closest(self, tag):
+        el = next(self.el.iterancestors(tag), None)
+        return LxmlNode(el) if el is not None else None
+
+
+# Text nodes are joined with this, then split again to strip them one by one
+_PIECE = "\x1f"
+
+
+class LexborNode(Node):
+    __slots__ = ()
+
+    def select(self, css):
+        # lexbor matches the node itself too; soupsieve only its descendants
+        own_id = self.el.mem_id
+        return [LexborNode(el) for el in self.el.css(css) if el.mem_id != own_id]
+
+    def select_one(self, css):
+        el = self.el.css_first(css)
+        if el is not None and el.mem_id == self.el.mem_id:
+            return super().select_one(css)
+        return LexborNode(el) if el is not None else None
+
+    def get(self, name, default=None):
+        attributes = self.el.attributes
+        if name not in attributes:
+            return default
+        return attributes[name] or ""
+
+    def get_text(self, separator="", strip=False):
+        if not strip:
+            return self.el.text(deep=True, separator=separator)
+        return _join_text(self.el.text(deep=True, separator=_PIECE).split(_PIECE), separator, strip)
+
+    def closest(self, tag):
+        el = self.el.parent
+        while el is not None and el.tag != tag:
+            el = el.parent
+        return LexborNode(el) if el is not None else None
+
+
+class LexborDocument(LexborNode):
+    """The lexbor parser itself stands for the document."""
+
+    __slots__ = ()
+
+    def select(self, css):
+        return [LexborNode(el) for el in self.el.css(css)]
+
+    def select_one(self, css):
+        el = self.el.css_first(css)
+        return LexborNode(el) if el is not None else None
+
+    def get(self, name, default=None):
+        return default
+
+    def closest(self, tag):
+        return None
+
+
+def _parse_bs4(markup):
+    return SoupNode(BeautifulSoup(markup, "html.parser"))
+
+
+def _parse_lxml(markup):
+    if isinstance(markup, str) and markup.lstrip().startswith("<?xml"):
+        # lxml refuses str input that declares its own encoding
+        markup = markup.encode("utf-8")
+    try:
+        root = lxml.html.document_fromstring(markup)
+    except etree.ParserError:  # empty document
+        root = lxml.html.document_fromstring("<html></html>")
+    return LxmlNode(root.getroottree())
+
+
+def _parse_selectolax(markup):
+    return LexborDocument(LexborHTMLParser(markup))
+
+
+BACKENDS = {"bs4": _parse_bs4}
+if lxml is not None:
+    BACKENDS["lxml"] = _parse_lxml
+if LexborHTMLParser is not None:
+    BACKENDS["selectolax"] = _parse_selectolax
+
+
+def available_backends():
+    """Installed backends, fastest first."""
+    return [name for name in PREFERENCE if name in BACKENDS]
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name=None):
+    """Backend to use for ``name`` (default: the configured one)."""
+    name = name or HTML_PARSER["backend"]
+    if name == "auto":
+        return available_backends()[0]
+    if name not in BACKENDS:
+        fallback = available_backends()[0]
+        logger.warning(f"HTML parser backend '{name}' is not installed, using {fallback}")
+        return fallback
+    return name
+
+
+def parse_document(markup, backend=None):
+    """Parse HTML, or pass through a document that was already parsed."""
+    if isinstance(markup, Node):
+        return markup
+    if isinstance(markup, BeautifulSoup):
+        return SoupNode(markup)
+    return BACKENDS[resolve_backend(backend)](markup)
+
+
+def text_of(element):
+    """Stripped text of an element, or '' if it is missing."""
+    return element.text.strip() if element else ""
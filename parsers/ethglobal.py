@@ -0,0 +1,147 @@
+"""
+Parser for the ETHGlobal showcase.
+
+The showcase markup has changed several times, so a few card selectors are
+candidates. The page is parsed once and every candidate is scored against
+that one tree by the number of distinct projects it yields. When the caller
+passes the strategy that won last time, it is tried first and the others are
+only scored if it no longer yields anything.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from parsers.document import parse_document
+from parsers.schema import Field, Schema
+
+BASE_URL = "https://ethglobal.com"
+
+# Candidate card selectors; ties go to the earlier one
+CARD_SELECTORS = [
+    "div[class*='ProjectCard']",
+    "div[class*='project-card']",
+    "div.showcase-grid > div",
+    "div.showcase > div",
+    "a[href*='/showcase/']",
+    "div[class*='grid'] > div",
+]
+CARD_SELECTOR = CARD_SELECTORS[0]
+FALLBACK_SELECTOR = "a[href*='/showcase/']"
+# Strategy name for reading every showcase link's text
+FALLBACK = "fallback"
+
+
+def split_title(text):
+    """The first line of a card's text is the title, the rest the description."""
+    parts = text.split('\n', 1)
+    return parts[0].strip(), parts[1].strip() if len(parts) > 1 else ""
+
+
+def absolute_url(href):
+    return href if href.startswith("http") else BASE_URL + href
+
+
+SHOWCASE_CARD = Schema("ethglobal_project", [
+    Field("title", ("h3", "[class*='title']", "div[class*='Title']", "strong"), required=True),
+    Field("link", "a[href]", attribute="href", transform=absolute_url, required=True),
+])
+
+
+def parse_card(card, counted=True):
+    """Parse one showcase card into a dict with title, description and link, or None."""
+    project = SHOWCASE_CARD.extract(card, counted=counted)
+    if not project:
+        return None
+    title, description = split_title(project["title"])
+    return {"title": title, "description": description, "link": project["link"]}
+
+
+def parse_cards(cards, counted=True):
+    projects = []
+    for card in cards:
+        try:
+            project = parse_card(card, counted)
+        except Exception:
+            continue
+        if project:
+            projects.append(project)
+    return projects
+
+
+def parse_links(document):
+    """The fallback: every showcase link's text, first line as the title."""
+    projects = []
+    for link in document.select(FALLBACK_SELECTOR):
+        href = link.get("href", "")
+        text = link.get_text("\n", strip=True)
+        if "/showcase/" in href and text:
+            title, description = split_title(text)
+            projects.append({"title": title, "description": description, "link": absolute_url(href)})
+    return projects
+
+
+def run_strategy(document, strategy, counted=True):
+    if strategy == FALLBACK:
+        return parse_links(document)
+    return parse_cards(document.select(strategy), counted)
+
+
+def score(projects):
+    return len({project["link"] for project in projects})
+
+
+@dataclass
+class ShowcaseResult:
+    """Projects read from the showcase and how they were found."""
+    strategy: str
+    projects: List[dict]
+    # Distinct projects per strategy tried
+    scores: Dict[str, int] = field(default_factory=dict)
+    # True when the preferred strategy was used without scoring the others
+    preferred_used: bool = False
+    parse_seconds: float = 0.0
+    extract_seconds: float = 0.0
+
+
+def parse_showcase(markup, preferred=None, selectors=None):
+    """
+    Parse the showcase page once and pick the card selector that yields the
+    most projects, falling back to every showcase link's text.
+
+    Args:
+        markup: page HTML or a parsed document
+        preferred: strategy to try first, e.g. the winner of the last run
+        selectors: candidate card selectors (default ``CARD_SELECTORS``)
+
+    Returns:
+        ShowcaseResult
+    """
+    started = time.perf_counter()
+    document = parse_document(markup)
+    parsed = time.perf_counter()
+    candidates = list(selectors or CARD_SELECTORS)
+
+    result = None
+    if preferred and (preferred in candidates or preferred == FALLBACK):
+        projects = run_strategy(document, preferred)
+        if projects:
+            result = ShowcaseResult(preferred, projects, {preferred: score(projects)}, preferred_used=True)
+
+    if result is None:
+        scores, best = {}, None
+        for selector in candidates:
+            # Trial reads stay out of the field counters; the winner is re-read below
+            scores[selector] = score(run_strategy(document, selector, counted=False))
+            if scores[selector] and (best is None or scores[selector] > scores[best]):
+                best = selector
+        if best is None:
+            projects = parse_links(document)
+            scores[FALLBACK] = score(projects)
+            result = ShowcaseResult(FALLBACK, projects, scores)
+        else:
+            result = ShowcaseResult(best, run_strategy(document, best), scores)
+
+    result.parse_seconds = parsed - started
+    result.extract_seconds = time.perf_counter() - parsed
+    return result
@@ -0,0 +1,70 @@
+"""
+Parser for the Gitcoin Checker public project list.
+"""
+
+from parsers.document import parse_document
+from parsers.schema import Field, Schema
+
+CARD_SELECTOR = "div.container.py-3 > div.mb-5.d-flex"
+BASE_URL = "https://checker.gitcoin.co"
+
+
+ICON_FIELDS = {"bi-globe": "website", "bi-twitter": "twitter", "bi-github": "github"}
+
+
+def absolute_url(href):
+    return href if href.startswith("http") else BASE_URL + href
+
+
+def icon_link(link):
+    """(field, href) of a profile link, told apart by its bootstrap icon class."""
+    icon = link.select_one("svg")
+    icon_class = icon.get("class", "") if icon else ""
+    for icon_name, field in ICON_FIELDS.items():
+        if icon_name in icon_class:
+            return field, link.get("href", "")
+    return None
+
+
+PROJECT_CARD = Schema("gitcoin_project", [
+    Field("name", "a.text-primary", default="Unknown Project"),
+    Field("project_url", "a.text-primary", attribute="href", transform=absolute_url),
+    Field("description", "div.text-xs"),
+    Field("links", 'div.small.d-flex a[target="_blank"]', extract=icon_link, many=True),
+    Field("image_url", "img", attribute="src"),
+    Field("created_at_text", "div.text-muted.font-italic.small"),
+])
+
+
+def parse_project_card(card):
+    """Parse one project card into a dict of GitcoinCheckerProject fields."""
+    project = PROJECT_CARD.extract(card)
+    links = dict(project["links"])
+    return {
+        "name": project["name"],
+        "description": project["description"],
+        "project_url": project["project_url"],
+        "website": links.get("website", ""),
+        "twitter": links.get("twitter", ""),
+        "github": links.get("github", ""),
+        "image_url": project["image_url"],
+        "created_at_text": project["created_at_text"],
+    }
+
+
+def parse_projects(markup):
+    """
+    Parse the project list page.
+
+    Returns:
+        tuple: (number of cards, project dicts); cards that fail to parse
+        are skipped
+    """
+    cards = parse_document(markup).select(CARD_SELECTOR)
+    projects = []
+    for card in cards:
+        try:
+            projects.append(parse_project_card(card))
+        except Exception:
+            continue
+    return len(cards), projects
@@ -0,0 +1,211 @@
+"""
+Declarative extraction schemas for the page parsers.
+
+A source describes each field of its cards once:
+
+    CARD = Schema("gitcoin_project", [
+        Field("name", "a.text-primary", default="Unknown Project"),
+        Field("project_url", "a.text-primary", attribute="href", transform=absolute_url),
+    ])
+    record = CARD.extract(card)
+
+The schema is compiled when it is defined. Each card is then read in one
+pass:
+- fields that share a selector share a single lookup;
+- required fields are read first, so an incomplete card is dropped early;
+- every field is counted as matched or missing.
+
+A selector that stops matching therefore shows up in ``CARD.summary()``
+instead of as silently empty cells.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One value read from a card.
+
+    Args:
+        name: key in the extracted record
+        selector: CSS selector relative to the card, a tuple of selectors
+            tried in order, or None for the card itself
+        attribute: attribute to read; None reads the stripped text
+        extract: function of the matched element, used instead of
+            ``attribute`` for values that need more than one read
+        transform: applied to the value when one was found
+        required: drop the card when this field is missing
+        many: read every match into a list (empty values are dropped)
+        default: value when nothing was found ([] for ``many``)
+    """
+    name: str
+    selector: Union[str, Tuple[str, ...], None] = None
+    attribute: Optional[str] = None
+    extract: Optional[Callable] = None
+    transform: Optional[Callable] = None
+    required: bool = False
+    many: bool = False
+    default: Any = ""
+
+    def read(self, element):
+        if self.extract is not None:
+            return self.extract(element)
+        if self.attribute is not None:
+            return element.get(self.attribute)
+        return element.text.strip()
+
+    def value(self, found):
+        if self.many:
+            values = (self.read(element) for element in found)
+            return [value for value in values if value is not None and value != ""]
+        return self.read(found) if found is not None else None
+
+
+def _lookup(card, selector, many):
+    if selector is None:
+        return [card] if many else card
+    if isinstance(selector, tuple):
+        for alternative in selector:
+            found = card.select(alternative) if many else card.select_one(alternative)
+            if found:
+                return found
+        return [] if many else None
+    return card.select(selector) if many else card.select_one(selector)
+
+
+class Schema:
+    """A compiled set of fields with per-field matched/missing counters."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = list(fields)
+        # Required fields first so incomplete cards are dropped after as few lookups as possible
+        self._order = [f for f in self.fields if f.required] + [f for f in self.fields if not f.required]
+        self._where_orders = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.cards = 0
+            self.filtered = 0
+            self.incomplete = 0
+            self.matched = Counter()
+            self.missing = Counter()
+
+    def _fields_for(self, where):
+        """Fields in lookup order; filtered fields go first so filtered-out cards cost one lookup."""
+        if not where:
+            return self._order
+        key = tuple(sorted(where))
+        order = self._where_orders.get(key)
+        if order is None:
+            order = [f for f in self._order if f.name in where] + [f for f in self._order if f.name not in where]
+            self._where_orders[key] = order
+        return order
+
+    def extract(self, card, where=None, counted=True):
+        """
+        Read every field of a card.
+
+        Args:
+            card: parsed element (see parsers/document.py)
+            where: optional {field name: predicate}; a card whose value
+                fails a predicate is counted as filtered. A card without the
+                value is dropped too, but the field counts as missing (the
+                card as incomplete if the field is required), since that
+                means the selector did not resolve
+            counted: set False for trial reads that should not show up in
+                the counters
+
+        Returns:
+            dict: field name -> value, or None if the card was filtered out or a
+            required field is missing
+        """
+        found = {}
+        record = {}
+        matched, missing = [], []
+        outcome = None
+        for field in self._fields_for(where):
+            key = (field.selector, field.many)
+            if key not in found:
+                found[key] = _lookup(card, field.selector, field.many)
+            value = field.value(found[key])
+            # False is a value (e.g. "not a winner"); only unresolved lookups are missing
+            present = value is not None and value != "" and value != []
+            if present and field.transform is not None:
+                value = field.transform(value)
+            if present:
+                if where and field.name in where and not where[field.name](value):
+                    outcome = "filtered"
+                    break
+                matched.append(field.name)
+            else:
+                missing.append(field.name)
+                if field.required:
+                    outcome = "incomplete"
+                    break
+                if where and field.name in where:
+                    outcome = "missing"
+                    break
+                value = field.default
+                if field.many and value is not None:
+                    value = list(value or ())
+            record[field.name] = value
+
+        if counted:
+            self._count(matched, missing, outcome)
+        if outcome is not None:
+            return None
+        return {field.name: record[field.name] for field in self.fields}
+
+    def _count(self, matched, missing, outcome):
+        with self._lock:
+            self.cards += 1
+            self.matched.update(matched)
+            self.missing.update(missing)
+            if outcome == "filtered":
+                self.filtered += 1
+            elif outcome == "incomplete":
+                self.incomplete += 1
+
+    def stats(self):
+        """Counters since the last reset, e.g. for metrics."""
+        with self._lock:
+            return {
+                "cards": self.cards,
+                "filtered": self.filtered,
+                "incomplete": self.incomplete,
+                "matched": dict(self.matched),
+                "missing": dict(self.missing),
+            }
+
+    def summary(self):
+        """One line naming the fields that were missing, for the flow logs."""
+        stats = self.stats()
+        line = f"{self.name}: {stats['cards']} cards"
+        if stats["filtered"] or stats["incomplete"]:
+            line += f" ({stats['filtered']} filtered, {stats['incomplete']} incomplete)"
+        gaps = [
+            f"{field.name} {stats['missing'][field.name]}/"
+            f"{stats['missing'][field.name] + stats['matched'].get(field.name, 0)}"
+            for field in self.fields if stats["missing"].get(field.name)
+        ]
+        return line + (f"; missing {', '.join(gaps)}" if gaps else "; every field matched")
+
+    def log_summary(self, logger):
+        """
+        Log the summary. It is a warning when a required field went missing
+        or a field matched on no card at all, which usually means its selector
+        no longer fits the page.
+        """
+        stats = self.stats()
+        never_matched = [name for name in stats["missing"] if not stats["matched"].get(name)]
+        if stats["incomplete"] or never_matched:
+            logger.warning(f"📐 {self.summary()}")
+        else:
+            logger.info(f"📐 {self.summary()}")
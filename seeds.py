@@ -0,0 +1,100 @@
+"""
+Command line entry point for the flows.
+
+    python -m seeds run cryptorank,merge
+    python -m seeds run                  # every source flow, then the merge
+    python -m seeds list
+
+Flow modules are imported only for the flows selected, and the heavy
+dependencies they use (Prefect, Selenium, gspread, Firebase) only when they
+are needed, so short invocations start quickly. Startup and per-flow import
+times are logged; ``python -X importtime -m seeds ...`` gives a per-module
+breakdown.
+"""
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import logging
+import sys
+
+from flows.run_all import IMPORT_TIMES, SOURCE_FLOWS, STANDALONE_FLOWS, load_flow, run_all
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("seeds")
+# Prefect lowers the root logger to WARNING when a flow module is imported
+logger.setLevel(logging.INFO)
+
+CLI_IMPORT_SECONDS = time.perf_counter() - _STARTED
+
+
+def available_flows():
+    return list(SOURCE_FLOWS) + ["merge"] + list(STANDALONE_FLOWS)
+
+
+def parse_flow_names(value):
+    """Split 'cryptorank,merge' into flow names, rejecting unknown ones."""
+    if not value:
+        return list(SOURCE_FLOWS) + ["merge"]
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available_flows()]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown flows: {', '.join(unknown)} (choose from {', '.join(available_flows())})"
+        )
+    return names
+
+
+def run(names):
+    """
+    Run the selected flows: sources concurrently, then the merge, then any
+    standalone flows in the order given.
+
+    Returns:
+        list: names of the flows that failed
+    """
+    sources = [name for name in names if name in SOURCE_FLOWS]
+    failed = []
+    if sources or "merge" in names:
+        failed += run_all(sources, merge="merge" in names)["failed"]
+
+    for name in (name for name in names if name in STANDALONE_FLOWS):
+        started = time.monotonic()
+        try:
+            load_flow(*STANDALONE_FLOWS[name])()
+            logger.info(f"✅ {name} finished in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            failed.append(name)
+            logger.error(f"❌ {name} failed after {time.monotonic() - started:.1f}s: {e}")
+    return failed
+
+
+def report_import_times():
+    flows = ", ".join(f"{module} {seconds * 1000:.0f}ms" for module, seconds in IMPORT_TIMES.items())
+    logger.info(f"⏱️ CLI startup {CLI_IMPORT_SECONDS * 1000:.0f}ms; flow imports: {flows or 'none'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m seeds", description="Run the seed identifier flows.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run flows, e.g. 'cryptorank,merge'")
+    run_parser.add_argument("flows", nargs="?", type=parse_flow_names, default=parse_flow_names(""),
+                            help=f"comma-separated flows: {', '.join(available_flows())}")
+    commands.add_parser("list", help="list the available flows")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(available_flows()))
+        return 0
+
+    try:
+        failed = run(args.flows)
+    finally:
+        report_import_times()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
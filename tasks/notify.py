@@ -1,29 +1,142 @@
 from prefect import task
 import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-@task
-def notify_slack(message: str):
+# Slack Block Kit limits for incoming webhooks
+MAX_BLOCKS = 50
+MAX_SECTION_CHARS = 3000
+MAX_HEADER_CHARS = 150
+# Stay well under the webhook's overall payload limit
+MAX_PAYLOAD_CHARS = 35000
+
+SLACK_TIMEOUT = float(os.getenv("SLACK_TIMEOUT", "10"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive session used for webhook calls."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return _session
+
+
+def post_to_slack(payload):
     """
-    Send a notification to Slack using a webhook URL from environment variables.
-    
-    Args:
-        message (str): The message to send to Slack
+    POST a payload to the Slack webhook.
+
+    Returns:
+        float: request latency in seconds, or None if the send failed
     """
     url = os.getenv("SLACK_WEBHOOK_URL")
     if not url:
         logger.error("SLACK_WEBHOOK_URL environment variable not set")
-        return
-        
+        return None
+
+    started = time.monotonic()
     try:
-        response = requests.post(url, json={"text": message})
+        response = get_session().post(url, json=payload, timeout=SLACK_TIMEOUT)
+        latency = time.monotonic() - started
         if response.status_code == 200:
-            logger.info(f"Slack notification sent successfully")
-        else:
-            logger.error(f"Failed to send Slack notification: {response.status_code} - {response.text}")
+            logger.info(f"Slack notification sent successfully in {latency * 1000:.0f}ms")
+            return latency
+        logger.error(f"Failed to send Slack notification: {response.status_code} - {response.text}")
     except Exception as e:
-        logger.error(f"Error sending Slack notification: {e}")
\ No newline at end of file
+        logger.error(f"Error sending Slack notification: {e}")
+    return None
+
+
+def build_digest_payloads(title, messages):
+    """
+    Pack item messages into as few Block Kit payloads as Slack allows.
+
+    Messages are joined into section blocks of up to 3000 characters, and
+    sections into payloads of at most 50 blocks. A single message longer
+    than a section is truncated.
+
+    Args:
+        title (str): digest title, shown as each payload's header
+        messages (list): mrkdwn text for each item
+
+    Returns:
+        list: webhook payloads
+    """
+    sections = []
+    current = ""
+    for message in messages:
+        message = message[:MAX_SECTION_CHARS]
+        if current and len(current) + 2 + len(message) > MAX_SECTION_CHARS:
+            sections.append(current)
+            current = ""
+        current = f"{current}\n\n{message}" if current else message
+    if current:
+        sections.append(current)
+
+    payloads = []
+    blocks, size = [], 0
+    for section in sections:
+        if blocks and (len(blocks) + 1 >= MAX_BLOCKS or size + len(section) > MAX_PAYLOAD_CHARS):
+            payloads.append(blocks)
+            blocks, size = [], 0
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": section}})
+        size += len(section)
+    if blocks:
+        payloads.append(blocks)
+
+    result = []
+    for i, blocks in enumerate(payloads, 1):
+        header = title if len(payloads) == 1 else f"{title} ({i}/{len(payloads)})"
+        header = header[:MAX_HEADER_CHARS]
+        result.append({
+            "text": header,
+            "blocks": [{"type": "header", "text": {"type": "plain_text", "text": header}}] + blocks,
+        })
+    return result
+
+
+@task
+def notify_slack(message: str):
+    """
+    Send a notification to Slack using a webhook URL from environment variables.
+
+    Args:
+        message (str): The message to send to Slack
+    """
+    post_to_slack({"text": message})
+
+
+@task
+def notify_slack_digest(title: str, messages: list):
+    """
+    Queue a batch of item messages as one (or a few) Block Kit digests.
+
+    The digests go to the persistent outbox and are delivered by its
+    background dispatcher, so this returns without waiting on Slack.
+
+    Args:
+        title (str): Digest title, e.g. "3 new Devpost winners"
+        messages (list): mrkdwn text for each item
+
+    Returns:
+        int: number of webhook payloads queued
+    """
+    if not messages:
+        return 0
+
+    # Imported here because the outbox builds on this module
+    from tasks.outbox import enqueue_digest
+
+    queued = enqueue_digest(title, messages)
+    logger.info(f"📨 Digest '{title}': {len(messages)} items queued as {queued} webhook calls")
+    return queued
@@ -0,0 +1,297 @@
+"""
+Persistent outbox for Slack notifications.
+
+Flows enqueue webhook payloads into the local state store and return right
+away; a background dispatcher drains the queue concurrently. Slack's 429
+``Retry-After`` pauses every worker, 5xx responses and network errors are
+retried with exponential backoff, and other 4xx responses fail the message
+permanently.
+
+Nothing is queued while ``SLACK_WEBHOOK_URL`` is unset, and messages queued
+before it was unset fail instead of waiting for it.
+
+A message is claimed (``sending``) before it is posted and marked ``sent``
+as soon as Slack accepts it, so it is never posted twice by concurrent
+workers or after a restart. The one exception is a crash between Slack
+accepting a message and the ``sent`` commit: such claims are released after
+``claim_timeout`` seconds and the message is sent again.
+
+The dispatcher starts when a message is enqueued. Messages left pending by
+an earlier run are delivered by ``deliver_pending``, which the orchestrator
+calls at the end of every run even if nothing new was enqueued.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from config import OUTBOX
+from local_store import ensure_schema, get_connection
+from tasks.notify import build_digest_payloads, get_session, SLACK_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def enqueue(payload):
+    """
+    Add one webhook payload to the outbox and make sure it gets dispatched.
+
+    Returns:
+        bool: False if no webhook URL is configured and nothing was queued
+    """
+    if not os.getenv("SLACK_WEBHOOK_URL"):
+        logger.warning("SLACK_WEBHOOK_URL environment variable not set; Slack message dropped")
+        return False
+    ensure_schema(SCHEMA)
+    conn = get_connection()
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT INTO outbox (payload, next_attempt_at, created_at) VALUES (?, ?, ?)",
+            (json.dumps(payload), now, now),
+        )
+    get_dispatcher().wake()
+    return True
+
+
+def enqueue_digest(title, messages):
+    """Enqueue item messages packed into Block Kit digests. Returns the payload count."""
+    payloads = build_digest_payloads(title, messages)
+    return sum(enqueue(payload) for payload in payloads)
+
+
+def outbox_counts():
+    """Number of outbox messages per status."""
+    ensure_schema(SCHEMA)
+    rows = get_connection().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+    return dict(rows.fetchall())
+
+
+class OutboxDispatcher:
+    """Background workers that deliver pending outbox messages."""
+
+    def __init__(self, workers=None, max_attempts=None, backoff_base=None, claim_timeout=None):
+        self.workers = workers or OUTBOX["workers"]
+        self.max_attempts = max_attempts or OUTBOX["max_attempts"]
+        self.backoff_base = backoff_base or OUTBOX["backoff_base"]
+        self.claim_timeout = claim_timeout or OUTBOX["claim_timeout"]
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        ensure_schema(SCHEMA)
+        self._release_stale_claims()
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _release_stale_claims(self):
+        conn = get_connection()
+        with conn:
+            released = conn.execute(
+                "UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND claimed_at < ?",
+                (time.time() - self.claim_timeout,),
+            ).rowcount
+        if released:
+            logger.warning(f"Re-queued {released} outbox messages left in flight by a previous run")
+
+    def _claim(self):
+        """Atomically claim the oldest due message, or return None."""
+        conn = get_connection()
+        now = time.time()
+        with conn:
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute(
+                "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ? AND status = 'pending'",
+                (now, row[0]),
+            ).rowcount
+        return row if claimed else self._claim()
+
+    def _has_pending(self):
+        row = get_connection().execute(
+            "SELECT 1 FROM outbox WHERE status IN ('pending', 'sending') LIMIT 1"
+        ).fetchone()
+        return row is not None
+
+    def _finish(self, message_id, status, attempts, error=None, retry_in=None):
+        conn = get_connection()
+        now = time.time()
+        with conn:
+            if status == "sent":
+                conn.execute(
+                    "UPDATE outbox SET status = 'sent', attempts = ?, sent_at = ? WHERE id = ?",
+                    (attempts, now, message_id),
+                )
+            elif status == "pending":
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, "
+                    "last_error = ? WHERE id = ?",
+                    (attempts, now + retry_in, error, message_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                    (attempts, error, message_id),
+                )
+
+    def _deliver(self, message_id, payload, attempts):
+        url = os.getenv("SLACK_WEBHOOK_URL")
+        if not url:
+            self._finish(message_id, "failed", attempts, "no webhook url")
+            logger.error(f"Slack notification {message_id} failed: SLACK_WEBHOOK_URL environment variable not set")
+            return
+
+        attempts += 1
+        backoff = self.backoff_base * 2 ** (attempts - 1)
+        started = time.monotonic()
+        try:
+            response = get_session().post(url, data=payload, timeout=SLACK_TIMEOUT,
+                                          headers={"Content-Type": "application/json"})
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            latency = time.monotonic() - started
+            if response.status_code == 200:
+                self._finish(message_id, "sent", attempts)
+                logger.info(f"Slack notification {message_id} sent in {latency * 1000:.0f}ms")
+                return
+            error = f"{response.status_code} - {response.text[:200]}"
+            if response.status_code == 429:
+                retry_after = float(response.headers.get("Retry-After", backoff))
+                with self._lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                logger.warning(f"Slack rate limited; pausing dispatch for {retry_after:.0f}s")
+                # Rate limiting is not the message's fault, so it does not use up an attempt
+                self._finish(message_id, "pending", attempts - 1, error, retry_in=retry_after)
+                return
+            if response.status_code < 500:
+                self._finish(message_id, "failed", attempts, error)
+                logger.error(f"Slack notification {message_id} rejected: {error}")
+                return
+
+        if attempts >= self.max_attempts:
+            self._finish(message_id, "failed", attempts, error)
+            logger.error(f"Slack notification {message_id} failed after {attempts} attempts: {error}")
+        else:
+            self._finish(message_id, "pending", attempts, error, retry_in=backoff)
+            logger.warning(f"Slack notification {message_id} failed ({error}); retrying in {backoff:.1f}s")
+
+    def _run(self):
+        while True:
+            message = None
+            try:
+                with self._lock:
+                    pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    time.sleep(pause)
+                    continue
+                message = self._claim()
+                if message is not None:
+                    self._deliver(*message)
+                    continue
+                if self._stopping.is_set() and not self._has_pending():
+                    return
+                self._wakeup.wait(0.2 if self._stopping.is_set() else 1.0)
+                self._wakeup.clear()
+            except Exception as e:
+                # A worker that dies leaves the outbox undrained, so log and keep going
+                logger.exception(f"Outbox worker error: {e}")
+                if message is not None:
+                    self._release(message, f"{type(e).__name__}: {e}")
+                time.sleep(self.backoff_base)
+
+    def _release(self, message, error):
+        """Put a claimed message back in the queue after an unexpected error."""
+        message_id, _, attempts = message
+        attempts += 1
+        try:
+            if attempts >= self.max_attempts:
+                self._finish(message_id, "failed", attempts, error)
+            else:
+                self._finish(message_id, "pending", attempts, error, retry_in=self.backoff_base)
+        except Exception as e:
+            logger.error(f"Could not release outbox message {message_id}: {e}")
+
+    def drain(self, timeout=None):
+        """
+        Deliver until the outbox is empty, waiting at most ``timeout`` seconds.
+
+        Messages not delivered in time stay pending for the next run.
+        """
+        self._stopping.set()
+        self.wake()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        self._threads = [t for t in self._threads if t.is_alive()]
+        logger.info(f"Outbox drained: {outbox_counts()}")
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Return the shared dispatcher, starting it on first use."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = OutboxDispatcher()
+            _dispatcher.start()
+            atexit.register(_dispatcher.drain, OUTBOX["drain_timeout"])
+        return _dispatcher
+
+
+def deliver_pending(timeout=None):
+    """
+    Deliver messages left in the outbox, e.g. by a run that exited before
+    they were sent, waiting at most ``timeout`` seconds (``drain_timeout``
+    by default).
+
+    Returns:
+        int: messages that were pending or in flight
+    """
+    counts = outbox_counts()
+    pending = counts.get("pending", 0) + counts.get("sending", 0)
+    if not pending:
+        return 0
+    logger.info(f"Delivering {pending} outbox messages left from earlier runs")
+    dispatcher = get_dispatcher()
+    # The workers exit once drained, so restart them if this process already drained
+    if not dispatcher._threads:
+        dispatcher.start()
+    dispatcher.drain(OUTBOX["drain_timeout"] if timeout is None else timeout)
+    return pending
@@ -0,0 +1,12 @@
+import pytest
+
+import local_store
+
+
+@pytest.fixture
+def state_db(tmp_path, monkeypatch):
+    """Point the local state store at a fresh database for one test."""
+    monkeypatch.setattr(local_store, "LOCAL_STATE_DB", str(tmp_path / "state.db"))
+    monkeypatch.setattr(local_store, "_schemas", set())
+    monkeypatch.setattr(local_store._local, "conn", None, raising=False)
+    return tmp_path / "state.db"
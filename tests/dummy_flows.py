@@ -0,0 +1,39 @@
+"""
+Trivial flows for the orchestrator tests. Each one records that it ran by
+creating a file named after itself in $DUMMY_FLOW_DIR.
+"""
+
+import os
+
+from prefect import flow, task
+
+
+@task
+def touch(name):
+    with open(os.path.join(os.environ["DUMMY_FLOW_DIR"], name), "w") as f:
+        f.write("done")
+
+
+@flow
+def first_flow():
+    touch("first_flow")
+
+
+@flow
+def second_flow():
+    touch("second_flow")
+
+
+@flow
+def third_flow():
+    touch("third_flow")
+
+
+@flow
+def failing_flow():
+    raise RuntimeError("boom")
+
+
+def plain_flow():
+    """Not a Prefect flow, so it can run in the test process without an API."""
+    touch.fn("plain_flow")
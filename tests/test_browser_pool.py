@@ -0,0 +1,62 @@
+"""BrowserPool capacity and dead-driver handling, with fake drivers instead of Chrome."""
+
+import threading
+import time
+
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        time.sleep(0.01)  # a WebDriver round trip
+        return "about:blank"
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_never_exceeds_max_drivers():
+    pool = BrowserPool(max_drivers=2, max_navigations=100, max_rss_mb=10 ** 6, factory=FakeDriver)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(5):
+            with pool.driver(timeout=10):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.005)
+                with lock:
+                    active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert pool.launched == 2
+
+
+def test_dead_idle_driver_is_replaced():
+    pool = BrowserPool(max_drivers=1, max_navigations=100, max_rss_mb=10 ** 6, factory=FakeDriver)
+    first = pool.acquire()
+    pool.release(first)
+    first._driver.alive = False
+
+    second = pool.acquire(timeout=1)
+    assert second is not first
+    assert first._driver.quit_called
+    assert pool.launched == 2
+    pool.release(second)
@@ -0,0 +1,121 @@
+"""
+Batched Crunchbase writes against the Firestore emulator.
+
+Skipped unless FIRESTORE_EMULATOR_HOST points at a running emulator, e.g.
+
+    gcloud emulators firestore start --host-port=localhost:8080
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m pytest tests/test_crunchbase_store.py
+"""
+
+import os
+
+import pytest
+import requests
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("FIRESTORE_EMULATOR_HOST"), reason="FIRESTORE_EMULATOR_HOST is not set"
+)
+
+PROJECT = "crunchbase-test"
+
+
+class BatchSpy:
+    """Wraps a WriteBatch, recording its size and failing commits on request."""
+
+    def __init__(self, batch, sizes, fail):
+        self.batch, self.sizes, self.fail = batch, sizes, fail
+        self.writes = 0
+
+    def set(self, ref, data):
+        self.writes += 1
+        self.batch.set(ref, data)
+
+    def commit(self):
+        self.sizes.append(self.writes)
+        if self.fail(len(self.sizes)):
+            raise RuntimeError("batch rejected")
+        return self.batch.commit()
+
+
+class ClientSpy:
+    """Firestore client recording get_all chunk sizes and batch sizes."""
+
+    def __init__(self, client, fail_batches=()):
+        self.client = client
+        self.fail_batches = set(fail_batches)
+        self.reads, self.batches = [], []
+
+    def collection(self, name):
+        return self.client.collection(name)
+
+    def get_all(self, refs, **kwargs):
+        self.reads.append(len(refs))
+        return self.client.get_all(refs, **kwargs)
+
+    def batch(self):
+        return BatchSpy(self.client.batch(), self.batches, lambda n: n in self.fail_batches)
+
+
+@pytest.fixture
+def client():
+    firestore = pytest.importorskip("google.cloud.firestore")
+    host = os.environ["FIRESTORE_EMULATOR_HOST"]
+    requests.delete(f"http://{host}/emulator/v1/projects/{PROJECT}/databases/(default)/documents",
+                    timeout=10).raise_for_status()
+    return firestore.Client(project=PROJECT)
+
+
+@pytest.fixture
+def crunchbase():
+    from flows import crunchbase
+    return crunchbase
+
+
+def orgs(start, stop):
+    return [{"uuid": f"org-{i:05d}", "name": f"Org {i}", "homepage_url": f"https://org{i}.example",
+             "short_description": ""} for i in range(start, stop)]
+
+
+def stored_ids(client):
+    return {doc.id for doc in client.collection("crunchbase_orgs").select(["uuid"]).stream()}
+
+
+def test_reads_are_chunked_and_existing_orgs_skipped(client, crunchbase, monkeypatch):
+    for org in orgs(250, 350):  # straddles the first 300-document read chunk
+        client.collection("crunchbase_orgs").document(org["uuid"]).set({"uuid": org["uuid"]})
+    spy = ClientSpy(client)
+    monkeypatch.setattr(crunchbase, "_db", spy)
+
+    items = orgs(0, 700) + orgs(0, 10)  # repeated orgs are stored once
+    new = crunchbase.store_orgs_in_firestore.fn(items)
+
+    assert spy.reads == [300, 300, 100]
+    assert spy.batches == [250, 250, 100]
+    assert [org["uuid"] for org in new] == [org["uuid"] for org in orgs(0, 250) + orgs(350, 700)]
+    assert stored_ids(client) == {org["uuid"] for org in orgs(0, 700)}
+
+
+def test_writes_are_batched_at_the_firestore_limit(client, crunchbase, monkeypatch):
+    spy = ClientSpy(client)
+    monkeypatch.setattr(crunchbase, "_db", spy)
+    monkeypatch.setattr(crunchbase, "FIRESTORE_READ_CHUNK", 1200)
+
+    new = crunchbase.store_orgs_in_firestore.fn(orgs(0, 1100))
+
+    assert spy.reads == [1100]
+    assert spy.batches == [500, 500, 100]
+    assert len(new) == 1100
+    assert len(stored_ids(client)) == 1100
+
+
+def test_failed_batch_falls_back_to_single_writes(client, crunchbase, monkeypatch):
+    spy = ClientSpy(client, fail_batches={2})
+    monkeypatch.setattr(crunchbase, "_db", spy)
+
+    new = crunchbase.store_orgs_in_firestore.fn(orgs(0, 700))
+
+    assert spy.batches == [300, 300, 100]
+    assert len(new) == 700
+    assert stored_ids(client) == {org["uuid"] for org in orgs(0, 700)}
+    # A second run finds every org already stored
+    assert crunchbase.store_orgs_in_firestore.fn(orgs(0, 700)) == []
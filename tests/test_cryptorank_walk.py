@@ -0,0 +1,88 @@
+"""The adaptive Cryptorank walk stops after a streak of rounds already in the index."""
+
+import pytest
+
+from dedup_index import SeenKeyIndex
+from flows import cryptorank
+from flows.cryptorank import fetch_cryptorank_funding_rounds
+
+KNOWN = ["Known 1", "Known 2", "Known 3", "Known 4", "Known 5"]
+
+PAGES = {
+    1: ["New A", "New B"],
+    2: ["Known 1", "Known 2", "New C"],  # the streak is broken by a new round
+    3: ["Known 3", "Known 4", "Known 5"],
+    4: ["New D"],
+}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(int(url.split("page=")[1].split("&")[0]))
+
+    @property
+    def page_source(self):
+        return self.visited[-1]
+
+
+class ReadyWait:
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        return True
+
+
+def fake_parse(page, target_rounds):
+    names = PAGES.get(page, [])
+    rounds = [dict(name=name, link=f"https://cryptorank.io/{name}", funding_amount="$1M",
+                   funding_type="Seed", backers=[], funding_date="") for name in names]
+    return len(rounds), rounds
+
+
+@pytest.fixture
+def driver(state_db, monkeypatch):
+    driver = FakeDriver()
+    index = SeenKeyIndex("cryptorank")
+    index.add(name.lower() for name in KNOWN)
+    monkeypatch.setattr(cryptorank, "reconciled_index", lambda *args: index)
+    monkeypatch.setattr(cryptorank, "acquire_driver", lambda: driver)
+    monkeypatch.setattr(cryptorank, "release_driver", lambda driver: None)
+    monkeypatch.setattr(cryptorank, "wait_for_page", lambda *args: None)
+    monkeypatch.setattr(cryptorank, "WebDriverWait", ReadyWait)
+    monkeypatch.setattr(cryptorank, "parse_funding_rounds", fake_parse)
+    monkeypatch.setattr(cryptorank.time, "sleep", lambda seconds: None)
+    monkeypatch.setitem(cryptorank.CRYPTORANK, "known_streak", 3)
+    return driver
+
+
+def names(projects):
+    return [project.name for project in projects]
+
+
+def test_adaptive_walk_stops_on_a_known_streak(driver):
+    projects = fetch_cryptorank_funding_rounds.fn(pages=10, adaptive=True)
+    assert driver.visited == [1, 2, 3]
+    assert names(projects) == ["New A", "New B", "New C"]
+
+
+def test_adaptive_walk_stops_at_the_page_cap(driver):
+    fetch_cryptorank_funding_rounds.fn(pages=2, adaptive=True)
+    assert driver.visited == [1, 2]
+
+
+def test_adaptive_walk_stops_at_an_empty_page(driver, monkeypatch):
+    monkeypatch.delitem(PAGES, 3)
+    monkeypatch.delitem(PAGES, 4)
+    projects = fetch_cryptorank_funding_rounds.fn(pages=10, adaptive=True)
+    assert driver.visited == [1, 2, 3]
+    assert names(projects) == ["New A", "New B", "New C"]
+
+
+def test_fixed_walk_reads_every_page_and_drops_known_rounds(driver):
+    projects = fetch_cryptorank_funding_rounds.fn(pages=4, adaptive=False)
+    assert driver.visited == [1, 2, 3, 4]
+    assert names(projects) == ["New A", "New B", "New C", "New D"]
@@ -0,0 +1,61 @@
+"""The dedup index filters keys already written and resets when the sheet is cleared."""
+
+import pytest
+
+import dedup_index
+from dedup_index import SeenKeyIndex, filter_unseen, mark_seen, reconciled_index
+
+HEADERS = ["name", "url"]
+
+
+class FakeSheet:
+    def __init__(self, names):
+        self.names = names
+
+    def col_values(self, col):
+        assert col == 1
+        return ["name", *self.names]
+
+
+@pytest.fixture
+def sheet(state_db, monkeypatch):
+    sheet = FakeSheet(["Alpha", "Beta"])
+    monkeypatch.setattr(dedup_index, "get_worksheet", lambda flow_name: sheet)
+    return sheet
+
+
+def name_of(item):
+    return item["name"]
+
+
+def test_known_keys_are_filtered(sheet):
+    items = [{"name": "alpha "}, {"name": "Gamma"}, {"name": "gamma"}]
+    unique, index = filter_unseen("test", items, name_of, "name", HEADERS)
+    assert unique == [{"name": "Gamma"}]
+
+    mark_seen(index, unique, name_of, "test!A4:B4")
+    assert index.sheet_rows() == 4
+    unique, _ = filter_unseen("test", [{"name": "GAMMA"}, {"name": "Delta"}], name_of, "name", HEADERS)
+    assert unique == [{"name": "Delta"}]
+
+
+def test_write_into_a_shrunk_sheet_resets_the_index(sheet):
+    index = reconciled_index("test", "name", HEADERS)
+    index.add(["gamma"], sheet_rows=4)
+    assert index.count() == 3
+
+    # The sheet was cleared and the next append landed on row 2
+    index.add(["delta"], sheet_rows=2)
+    assert index.count() == 1
+    assert index.unseen(["alpha", "delta"]) == {"alpha"}
+
+
+def test_reconcile_rebuilds_when_the_sheet_shrank(sheet):
+    index = reconciled_index("test", "name", HEADERS)
+    assert index.unseen(["alpha", "beta", "gamma"]) == {"gamma"}
+
+    sheet.names = ["Gamma"]
+    index = SeenKeyIndex("test")
+    index.reconcile(sheet.col_values(1))
+    assert index.sheet_rows() == 2
+    assert index.unseen(["alpha", "beta", "gamma"]) == {"alpha", "beta"}
@@ -0,0 +1,100 @@
+"""Hackathons enter the processed ledger only once stored, and leave it when it expires."""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from flows import devpost
+from flows.devpost import hackathon_is_processed, record_processed_hackathons
+from local_store import set_state
+from models import DevpostWinner
+
+DAY = 86400
+
+LINKS = [
+    ("Fresh", "https://fresh.devpost.com/"),
+    ("Expired", "https://expired.devpost.com/"),
+    ("New", "https://new.devpost.com/"),
+]
+
+
+class FakeDriver:
+    page_source = ""
+
+    def get(self, url):
+        pass
+
+
+class ReadyWait:
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        return True
+
+
+def winner(hackathon_name):
+    return DevpostWinner(title=f"{hackathon_name} winner", link="https://devpost.com/software/x",
+                         hackathon=hackathon_name, fetched_at=datetime.utcnow())
+
+
+@pytest.fixture
+def scraped(state_db, monkeypatch):
+    """Fake browser and hackathon harvest; returns the hackathons sent to be scraped."""
+    scraped = []
+
+    def harvest(fn, hackathons, **kwargs):
+        scraped.extend(hackathons)
+        return [[winner(name)] for name, _ in hackathons]
+
+    monkeypatch.setattr(devpost, "acquire_driver", lambda: FakeDriver())
+    monkeypatch.setattr(devpost, "release_driver", lambda driver: None)
+    monkeypatch.setattr(devpost, "wait_for_page", lambda *args: None)
+    monkeypatch.setattr(devpost, "scroll_until_stable", lambda *args: None)
+    monkeypatch.setattr(devpost, "WebDriverWait", ReadyWait)
+    monkeypatch.setattr(devpost, "parse_hackathon_tiles", lambda html, url: (len(LINKS), LINKS))
+    monkeypatch.setattr(devpost, "map_concurrently", harvest)
+    monkeypatch.setitem(devpost.DEVPOST, "recheck_days", 30)
+    return scraped
+
+
+def test_expired_ledger_entries_are_fetched_again(scraped):
+    now = time.time()
+    set_state("devpost_hackathons", LINKS[0][1], {"name": "Fresh", "winners": 1, "processed_at": now - DAY})
+    set_state("devpost_hackathons", LINKS[1][1], {"name": "Expired", "winners": 1,
+                                                  "processed_at": now - 31 * DAY})
+    assert hackathon_is_processed(LINKS[0][1])
+    assert not hackathon_is_processed(LINKS[1][1])
+
+    winners, harvested = devpost.fetch_devpost_blockchain_winners.fn()
+    assert [name for name, _ in scraped] == ["Expired", "New"]
+    assert [name for name, _, _ in harvested] == ["Expired", "New"]
+
+
+def test_entries_never_expire_without_a_recheck_period(scraped, monkeypatch):
+    monkeypatch.setitem(devpost.DEVPOST, "recheck_days", 0)
+    set_state("devpost_hackathons", LINKS[1][1], {"name": "Expired", "winners": 1,
+                                                  "processed_at": time.time() - 365 * DAY})
+    assert hackathon_is_processed(LINKS[1][1])
+
+
+def test_hackathon_whose_store_failed_is_processed_again(scraped, monkeypatch):
+    def failing_store(winners):
+        raise RuntimeError("Sheets API unavailable")
+
+    monkeypatch.setattr(devpost, "fetch_devpost_blockchain_winners", devpost.fetch_devpost_blockchain_winners.fn)
+    monkeypatch.setattr(devpost, "store_devpost_winners", failing_store)
+    monkeypatch.setattr(devpost, "record_processed_hackathons", record_processed_hackathons.fn)
+    monkeypatch.setattr(devpost, "notify_slack_if_available", lambda stored: None)
+
+    with pytest.raises(RuntimeError):
+        devpost.run_devpost_flow.fn()
+    assert not any(hackathon_is_processed(url) for _, url in LINKS)
+
+    # The next run scrapes every hackathon again and records them once stored
+    scraped.clear()
+    monkeypatch.setattr(devpost, "store_devpost_winners", lambda winners: winners)
+    devpost.run_devpost_flow.fn()
+    assert [name for name, _ in scraped] == ["Fresh", "Expired", "New"]
+    assert all(hackathon_is_processed(url) for _, url in LINKS)
@@ -0,0 +1,56 @@
+"""Entity resolution must not merge unrelated projects through a shared link."""
+
+import pytest
+
+from entity_resolution import EntityIndex, link_keys, resolve_entities
+
+
+@pytest.fixture
+def index(state_db):
+    return EntityIndex()
+
+
+def resolve(records, index=None):
+    return resolve_entities(
+        records,
+        name_of=lambda r: r["name"],
+        urls_of=lambda r: r["links"],
+        id_of=lambda r: r["id"],
+        index=index,
+    )
+
+
+def test_subdomains_share_the_site_key():
+    assert link_keys("https://app.uniswap.org/swap") == link_keys("https://uniswap.org")
+    assert link_keys("https://foo.vercel.app") != link_keys("https://bar.vercel.app")
+    assert link_keys("https://bit.ly/3xyz") == []
+
+
+def test_shared_link_does_not_merge_different_names():
+    records = [
+        {"id": "a", "name": "Uniswap", "links": ["https://app.uniswap.org"]},
+        {"id": "b", "name": "Uniswap Labs", "links": ["https://uniswap.org"]},
+        {"id": "c", "name": "Kazorbin", "links": ["https://uniswap.org"]},
+    ]
+    entities, _ = resolve(records)
+    assert sorted(sorted(r["id"] for r in members) for _, members in entities) == [["a", "b"], ["c"]]
+
+
+def test_link_used_by_many_names_across_runs_is_shared(index):
+    names = ["Kazorbin", "Dufexa", "Morvantix", "Pelunor", "Tavrisko"]
+    for i, name in enumerate(names):
+        entities, stats = resolve([{"id": f"r{i}", "name": name, "links": ["https://lnk.to/x"]}], index)
+        assert stats.known_entities == 0
+    assert stats.shared_keys == 1
+    # Even a name close to an earlier one no longer joins it through the link alone
+    entities, stats = resolve([{"id": "new", "name": "Kazor", "links": ["https://lnk.to/x"]}], index)
+    assert stats.known_entities == 0
+    assert [entity_id for entity_id, _ in entities] == ["new"]
+
+
+def test_records_join_known_entities(index):
+    resolve([{"id": "first", "name": "Morvantix", "links": ["https://morvantix.xyz"]}], index)
+    entities, stats = resolve([{"id": "second", "name": "Morvantix Protocol",
+                                "links": ["https://docs.morvantix.xyz"]}], index)
+    assert [entity_id for entity_id, _ in entities] == ["first"]
+    assert stats.joined == {"first"}
@@ -0,0 +1,43 @@
+"""The leaderboard's indexed top-K read must rank exactly like the scoring engine."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from leaderboard import top_projects, update_leaderboard
+from models import ProjectRecord
+from scoring import ScoringEngine
+
+NOW = datetime(2026, 6, 1)
+
+
+def projects(n, seed=3):
+    rng = random.Random(seed)
+    sources = ["Devpost", "ETHGlobal", "GitcoinChecker", "Alliance", "Cryptorank"]
+    return [
+        ProjectRecord(
+            id=f"p{i}",
+            name=f"Project {i}",
+            link=f"https://p{i}.example",
+            source=", ".join(rng.sample(sources, rng.randint(1, 3))),
+            funding_type=rng.choice([None, "Seed", "Grant", "Pre-Seed"]),
+            funding_amount=rng.choice([None, "$1.5M", "$250K", "$12M"]),
+            last_seen=NOW - timedelta(days=rng.uniform(0, 120)),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("k, window_days", [(1, None), (10, None), (25, 30), (500, None)])
+def test_top_projects_match_engine_ranking(state_db, k, window_days):
+    batch = projects(300)
+    engine = ScoringEngine.load()
+    engine.update(batch)
+    update_leaderboard(batch, engine)
+
+    now = NOW.timestamp()
+    since = now - window_days * 86400 if window_days else None
+    expected = [(project_id, round(score, 2)) for project_id, score in engine.top(k, since=since, now=now)]
+    top = top_projects(k, window_days, now=now)
+    assert [(p["id"], p["score"]) for p in top] == expected
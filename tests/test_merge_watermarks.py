@@ -0,0 +1,96 @@
+"""The merge flow reads each source sheet from its watermark to the last row written."""
+
+import re
+
+import pytest
+
+import google_sheets
+from flows import merge
+from flows.merge import read_new_records, save_watermarks
+from google_sheets import write_rows
+from local_store import get_state
+
+HEADERS = ["title", "link"]
+
+
+class FakeWorksheet:
+    """Grid of 1000 allocated rows; only the appended ones hold data."""
+
+    row_count = 1000
+    col_count = 26
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.reads = []
+
+    def row_values(self, row):
+        return self.rows[row - 1] if row <= len(self.rows) else []
+
+    def get_values(self, a1):
+        self.reads.append(a1)
+        first, last = map(int, re.findall(r"(\d+)", a1))
+        return self.rows[first - 1:last]
+
+    def clear(self):
+        self.rows = []
+
+    def append_row(self, row):
+        self.rows.append(list(row))
+
+    def append_rows(self, rows):
+        start = len(self.rows) + 1
+        self.rows.extend(rows)
+        return {"updates": {"updatedRange": f"Sheet1!A{start}:B{len(self.rows)}"}}
+
+
+@pytest.fixture
+def sheet(state_db, monkeypatch):
+    sheet = FakeWorksheet([HEADERS])
+    monkeypatch.setattr(google_sheets, "get_worksheet", lambda flow_name: sheet)
+    monkeypatch.setattr(merge, "get_worksheet", lambda flow_name: sheet)
+    monkeypatch.setattr(google_sheets, "_headers", {})
+    return sheet
+
+
+def rows(*titles):
+    return [{"title": title, "link": f"https://{title}.example"} for title in titles]
+
+
+def merge_once():
+    records, watermark = read_new_records("devpost")
+    save_watermarks.fn({"devpost": watermark})
+    return [record["title"] for record in records]
+
+
+def test_second_merge_reads_only_the_appended_rows(sheet):
+    write_rows("devpost", rows("a", "b"), HEADERS)
+    assert merge_once() == ["a", "b"]
+    assert sheet.reads == ["A2:Z3"]
+
+    write_rows("devpost", rows("c"), HEADERS)
+    assert merge_once() == ["c"]
+    assert sheet.reads[-1] == "A4:Z4"
+
+    # Nothing new: the allocated but empty rows are not read
+    assert merge_once() == []
+    assert len(sheet.reads) == 2
+
+
+def test_cleared_sheet_resets_the_watermark(sheet):
+    write_rows("devpost", rows("a", "b", "c"), HEADERS)
+    assert merge_once() == ["a", "b", "c"]
+    assert get_state("merge_watermarks", "devpost") == 4
+
+    # New headers clear the sheet; the next write starts again at row 2
+    write_rows("devpost", [{"title": "d", "link": "", "hackathon": "x"}], [*HEADERS, "hackathon"])
+    assert get_state("merge_watermarks", "devpost") is None
+    assert merge_once() == ["d"]
+    assert get_state("merge_watermarks", "devpost") == 2
+
+
+def test_sheet_without_a_recorded_end_is_read_to_its_row_count(sheet):
+    sheet.rows += [["a", ""], ["b", ""]]
+    assert merge_once() == ["a", "b"]
+    assert sheet.reads == ["A2:Z1000"]
+    assert get_state("merge_watermarks", "devpost") == 3
+
@@ -0,0 +1,122 @@
+"""Outbox delivery against a local stub of the Slack webhook."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from tasks import outbox
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    """Answers with the queued status codes, then 200; records accepted payloads."""
+
+    responses = []
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        status = self.responses.pop(0) if self.responses else 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0.1")
+        self.end_headers()
+        self.wfile.write(b"ok" if status == 200 else b"error")
+        if status == 200:
+            self.received.append(json.loads(body))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook(state_db, monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), StubWebhook)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubWebhook.responses, StubWebhook.received = [], []
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", f"http://127.0.0.1:{server.server_port}/hook")
+    yield StubWebhook
+    server.shutdown()
+
+
+@pytest.fixture
+def dispatcher(state_db, monkeypatch):
+    dispatcher = outbox.OutboxDispatcher(workers=2, max_attempts=3, backoff_base=0.05, claim_timeout=60)
+    monkeypatch.setattr(outbox, "_dispatcher", dispatcher)
+    dispatcher.start()
+    return dispatcher
+
+
+def test_messages_are_delivered_through_rate_limits_and_errors(webhook, dispatcher):
+    webhook.responses = [429, 500, 503]
+    for i in range(5):
+        assert outbox.enqueue({"text": f"message {i}"})
+    dispatcher.drain(timeout=10)
+
+    assert sorted(p["text"] for p in webhook.received) == [f"message {i}" for i in range(5)]
+    assert outbox.outbox_counts() == {"sent": 5}
+
+
+def test_client_errors_fail_without_retrying(webhook, dispatcher):
+    webhook.responses = [400]
+    outbox.enqueue({"text": "bad"})
+    dispatcher.drain(timeout=10)
+
+    assert webhook.received == []
+    assert outbox.outbox_counts() == {"failed": 1}
+
+
+def test_nothing_is_queued_without_a_webhook_url(state_db, dispatcher, monkeypatch):
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    assert outbox.enqueue({"text": "nowhere"}) is False
+    dispatcher.drain(timeout=10)
+    assert outbox.outbox_counts() == {}
+
+
+def test_a_worker_error_does_not_stop_dispatch(webhook, dispatcher, monkeypatch):
+    deliver = outbox.OutboxDispatcher._deliver
+    calls = []
+
+    def flaky_deliver(self, *message):
+        calls.append(message[0])
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return deliver(self, *message)
+
+    monkeypatch.setattr(outbox.OutboxDispatcher, "_deliver", flaky_deliver)
+    outbox.enqueue({"text": "survives"})
+    dispatcher.drain(timeout=10)
+
+    assert [p["text"] for p in webhook.received] == ["survives"]
+    assert outbox.outbox_counts() == {"sent": 1}
+
+
+def test_messages_left_by_an_earlier_run_are_delivered_without_new_ones(webhook, state_db, monkeypatch):
+    # An earlier run queued messages and exited before its workers sent them
+    stopped = outbox.OutboxDispatcher(workers=2, max_attempts=3, backoff_base=0.05, claim_timeout=60)
+    monkeypatch.setattr(outbox, "_dispatcher", stopped)
+    for i in range(3):
+        outbox.enqueue({"text": f"left {i}"})
+    assert outbox.outbox_counts() == {"pending": 3}
+
+    # The next run enqueues nothing
+    monkeypatch.setattr(outbox, "_dispatcher", None)
+    monkeypatch.setattr(outbox.atexit, "register", lambda *args: None)
+    assert outbox.deliver_pending(timeout=10) == 3
+
+    assert sorted(p["text"] for p in webhook.received) == ["left 0", "left 1", "left 2"]
+    assert outbox.outbox_counts() == {"sent": 3}
+    assert outbox.deliver_pending(timeout=10) == 0
+
+    # A message queued after this process drained restarts its workers
+    outbox.enqueue({"text": "late"})
+    assert outbox.deliver_pending(timeout=10) == 1
+    assert outbox.outbox_counts() == {"sent": 4}
+
+
+def test_no_dispatcher_is_started_for_an_empty_outbox(state_db, monkeypatch):
+    monkeypatch.setattr(outbox, "_dispatcher", None)
+    assert outbox.deliver_pending(timeout=10) == 0
+    assert outbox._dispatcher is None
@@ -0,0 +1,37 @@
+"""Readiness waits must survive polls that fail or return nothing, e.g. mid-navigation."""
+
+from page_waits import READINESS_JS, scroll_until_stable
+
+
+class FakeDriver:
+    """Answers readiness polls from a script of item counts; None and exceptions included."""
+
+    def __init__(self, polls):
+        self.polls = list(polls)
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if script != READINESS_JS:
+            self.scrolls += 1
+            return None
+        answer = self.polls.pop(0) if self.polls else self.last
+        self.last = answer
+        if isinstance(answer, Exception):
+            raise answer
+        return None if answer is None else {"items": answer}
+
+
+def scroll(driver):
+    return scroll_until_stable(driver, "test", items="div.card", poll=0, step_timeout=0.05,
+                               max_scrolls=5, stale_scrolls=2)
+
+
+def test_scroll_counts_items_as_the_page_grows():
+    assert scroll(FakeDriver([10, 20, 30])).items == 30
+
+
+def test_scroll_survives_empty_and_failing_polls():
+    driver = FakeDriver([None, RuntimeError("navigating"), 15, None, 25, RuntimeError("gone")])
+    result = scroll(driver)
+    assert result.items == 25
+    assert not result.timed_out
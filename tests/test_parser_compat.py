@@ -0,0 +1,61 @@
+"""
+Every HTML parser backend must extract the same records as BeautifulSoup.
+
+Each parser runs over its fixture page, and over a page with the fixture's
+cards repeated to cover markup from every card, with each backend. Backends
+whose package is not installed are skipped.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+from parsers.document import BACKENDS, PREFERENCE, parse_document
+from parsers_bench import CASES, load_fixture, scale_page
+
+REFERENCE = "bs4"
+REPEATED_CARDS = 50
+
+
+def first_difference(expected, actual, path="result"):
+    """Describe where two parser results first differ, or return None."""
+    if type(expected) is not type(actual):
+        return f"{path}: {expected!r} != {actual!r}"
+    if isinstance(expected, dict):
+        for key in sorted(set(expected) | set(actual)):
+            difference = first_difference(expected.get(key), actual.get(key), f"{path}[{key!r}]")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, (list, tuple)):
+        if len(expected) != len(actual):
+            return f"{path}: {len(expected)} items != {len(actual)} items"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            difference = first_difference(e, a, f"{path}[{i}]")
+            if difference:
+                return difference
+        return None
+    return None if expected == actual else f"{path}: {expected!r} != {actual!r}"
+
+
+PAGES = [(name, "fixture") for name in CASES]
+PAGES += [(name, "repeated") for name, (_, _, card_selector) in CASES.items() if card_selector]
+
+
+@pytest.mark.parametrize("backend", [backend for backend in PREFERENCE if backend != REFERENCE])
+@pytest.mark.parametrize("case, page", PAGES, ids=[f"{case}-{page}" for case, page in PAGES])
+def test_backend_matches_bs4(backend, case, page):
+    if backend not in BACKENDS:
+        pytest.skip(f"{backend} is not installed")
+    fixture, parse, card_selector = CASES[case]
+    html = load_fixture(fixture)
+    if page == "repeated":
+        html = scale_page(html, card_selector, REPEATED_CARDS)
+
+    expected = parse(parse_document(html, REFERENCE))
+    difference = first_difference(expected, parse(parse_document(html, backend)))
+    assert difference is None, difference
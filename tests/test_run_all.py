@@ -0,0 +1,104 @@
+"""
+Orchestration of the source flows.
+
+The fan-out is tested with in-process stand-ins synchronized by a barrier, so
+the tests do not depend on how fast subprocesses or Prefect start; the child
+process path is tested with a stub command.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flows.run_all as run_all_module
+from flows.run_all import run_all, run_single_flow, run_source
+
+REGISTRY = {
+    "first": ("tests.dummy_flows", "first_flow"),
+    "second": ("tests.dummy_flows", "second_flow"),
+    "third": ("tests.dummy_flows", "third_flow"),
+    "failing": ("tests.dummy_flows", "failing_flow"),
+}
+
+# Stands in for a child process: records its flow, fails for "failing_flow"
+STUB_CHILD = (
+    "import os, sys; spec = sys.argv[1]; "
+    "open(os.path.join(os.environ['DUMMY_FLOW_DIR'], spec.split(':')[1]), 'w').write('done'); "
+    "sys.exit(1 if spec.endswith('failing_flow') else 0)"
+)
+
+
+@pytest.fixture
+def no_prefect(monkeypatch):
+    monkeypatch.setattr(run_all_module, "prepare_prefect_api", lambda: None)
+    monkeypatch.setattr(run_all_module, "deliver_pending_notifications", lambda: None)
+
+
+def test_source_flows_run_concurrently_to_completion(no_prefect, monkeypatch):
+    # Every source must be running at the same time to get past the barrier
+    barrier = threading.Barrier(3, timeout=30)
+    ran = []
+
+    def fake_run_source(name, flow_spec, env=None):
+        barrier.wait()
+        ran.append(flow_spec[1])
+        return name, 0.0, None
+
+    monkeypatch.setattr(run_all_module, "run_source", fake_run_source)
+    result = run_all(["first", "second", "third"], max_concurrency=3, merge=False, registry=REGISTRY)
+
+    assert result["failed"] == []
+    assert set(result["timings"]) == {"first", "second", "third"}
+    assert sorted(ran) == ["first_flow", "second_flow", "third_flow"]
+
+
+def test_failing_source_does_not_stop_the_others(no_prefect, monkeypatch):
+    barrier = threading.Barrier(2, timeout=30)
+
+    def fake_run_source(name, flow_spec, env=None):
+        barrier.wait()
+        error = RuntimeError("exited with status 1") if name == "failing" else None
+        return name, 0.0, error
+
+    monkeypatch.setattr(run_all_module, "run_source", fake_run_source)
+    result = run_all(["first", "failing"], max_concurrency=2, merge=False, registry=REGISTRY)
+
+    assert result["failed"] == ["failing"]
+    assert set(result["timings"]) == {"first", "failing"}
+
+
+def test_run_source_reports_the_child_exit_status(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_all_module, "source_command",
+                        lambda flow_spec: [sys.executable, "-c", STUB_CHILD, ":".join(flow_spec)])
+    env = dict(os.environ, DUMMY_FLOW_DIR=str(tmp_path))
+
+    assert run_source("first", REGISTRY["first"], env)[2] is None
+    name, _, error = run_source("failing", REGISTRY["failing"], env)
+
+    assert name == "failing"
+    assert str(error) == "exited with status 1"
+    assert (tmp_path / "first_flow").read_text() == "done"
+    assert (tmp_path / "failing_flow").read_text() == "done"
+
+
+def test_source_command_runs_the_flow_in_a_child():
+    command = run_all_module.source_command(REGISTRY["first"])
+    assert command == [sys.executable, "-m", "flows.run_all", "--flow", "tests.dummy_flows:first_flow"]
+
+
+def test_single_flow_reports_its_import_time(monkeypatch, tmp_path):
+    monkeypatch.delitem(sys.modules, "tests.dummy_flows", raising=False)
+    monkeypatch.delitem(run_all_module.IMPORT_TIMES, "tests.dummy_flows", raising=False)
+    monkeypatch.setenv("DUMMY_FLOW_DIR", str(tmp_path))
+    # Prefect reconfigures logging on import, so record the orchestrator's messages directly
+    messages = []
+    monkeypatch.setattr(run_all_module.logger, "info", messages.append)
+
+    assert run_single_flow("tests.dummy_flows:plain_flow") == 0
+
+    assert "tests.dummy_flows" in run_all_module.IMPORT_TIMES
+    assert any("tests.dummy_flows imported in" in message for message in messages)
+    assert (tmp_path / "plain_flow").read_text() == "done"
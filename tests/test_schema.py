@@ -0,0 +1,63 @@
+"""Schema counters: filtered cards, missing fields and incomplete cards are told apart."""
+
+from parsers.devpost import GALLERY_ITEM, HACKATHON_TILE, ONLY_WINNERS
+from parsers.document import parse_document
+from parsers.schema import Field, Schema
+
+PAGE = """
+<div class="card"><h5>Alpha</h5><span class="kind">Seed</span></div>
+<div class="card"><h5>Beta</h5><span class="kind">Grant</span></div>
+<div class="card"><h5>Gamma</h5></div>
+<div class="card"><span class="kind">Seed</span></div>
+"""
+
+SEED_ONLY = {"kind": lambda kind: kind == "Seed"}
+
+
+def cards():
+    return parse_document(PAGE, "bs4").select("div.card")
+
+
+def test_missing_filtered_value_counts_as_missing_not_filtered():
+    schema = Schema("test_card", [Field("kind", "span.kind"), Field("title", "h5", required=True)])
+    records = [schema.extract(card, SEED_ONLY) for card in cards()]
+
+    assert records == [{"kind": "Seed", "title": "Alpha"}, None, None, None]
+    stats = schema.stats()
+    assert stats["cards"] == 4
+    assert stats["filtered"] == 1  # Beta: present and not a seed round
+    assert stats["incomplete"] == 1  # the card without a title
+    assert stats["missing"] == {"kind": 1, "title": 1}
+
+
+def test_missing_required_filtered_value_is_incomplete():
+    schema = Schema("test_card", [Field("kind", "span.kind", required=True), Field("title", "h5")])
+    records = [schema.extract(card, SEED_ONLY) for card in cards()]
+
+    assert records == [{"kind": "Seed", "title": "Alpha"}, None, None, {"kind": "Seed", "title": ""}]
+    stats = schema.stats()
+    assert (stats["filtered"], stats["incomplete"]) == (1, 1)
+    assert stats["missing"] == {"kind": 1, "title": 1}
+
+
+def test_non_winners_are_filtered_not_missing():
+    page = parse_document("""
+    <div class="hackathons-container">
+      <a class="tile-anchor" href="/a"><h3>Ended with winners</h3><span>View winners</span></a>
+      <a class="tile-anchor" href="/b"><h3>Still judging</h3></a>
+    </div>
+    <div class="gallery-item"><a class="block-wrapper-link" href="/p/1"><h5>Winner</h5>
+      <aside class="entry-badge"><img class="winner"></aside></a></div>
+    <div class="gallery-item"><a class="block-wrapper-link" href="/p/2"><h5>Entrant</h5></a></div>
+    """, "bs4")
+    HACKATHON_TILE.reset()
+    GALLERY_ITEM.reset()
+    tiles = [HACKATHON_TILE.extract(tile, ONLY_WINNERS) for tile in page.select("a.tile-anchor")]
+    items = [GALLERY_ITEM.extract(item, ONLY_WINNERS) for item in page.select("div.gallery-item")]
+
+    assert [tile and tile["name"] for tile in tiles] == ["Ended with winners", None]
+    assert [item and item["title"] for item in items] == ["Winner", None]
+    for schema in (HACKATHON_TILE, GALLERY_ITEM):
+        stats = schema.stats()
+        assert stats["missing"] == {}
+        assert (stats["filtered"], stats["incomplete"]) == (1, 0)